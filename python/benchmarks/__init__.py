@@ -0,0 +1,5 @@
+"""Benchmarks for the youtube terminal simulator.
+
+Run them from the python/ directory, e.g.:
+    python3 -m benchmarks.sqlite_benchmark
+"""
@@ -0,0 +1,26 @@
+"""Synthetic catalogs for the benchmarks."""
+import random
+
+_WORDS = ("amazing", "cats", "dogs", "funny", "google", "life", "video",
+          "nothing", "another", "music", "cooking", "travel", "news",
+          "gaming", "tutorial", "python", "review", "live", "best", "top")
+_TAGS = tuple(f"#{word}" for word in _WORDS)
+
+
+def write_catalog(path, size, seed=0):
+    """Writes a videos file with size random videos and returns its path.
+
+    Args:
+        path: Where to write the "title | video_id | tag, tag" file.
+        size: The number of videos.
+        seed: Seed for the random titles and tags.
+    """
+    rand = random.Random(seed)
+    with open(path, "w") as video_file:
+        for number in range(size):
+            title = " ".join(rand.choice(_WORDS).capitalize()
+                             for _ in range(rand.randint(2, 5)))
+            tags = " , ".join(rand.sample(_TAGS, rand.randint(0, 3)))
+            video_file.write(f"{title} {number} | video_{number}_id | "
+                             f"{tags}\n")
+    return path
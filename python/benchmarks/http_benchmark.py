@@ -0,0 +1,75 @@
+"""Measures HTTP API throughput with fresh and conditional GET requests."""
+import argparse
+import http.client
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.http_server import VideoServer
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+from .catalog import write_catalog
+
+
+def _client(port, path, requests, conditional, latencies):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {}
+    for _ in range(requests):
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if conditional:
+            headers = {"If-None-Match": response.getheader("ETag")}
+    connection.close()
+
+
+def _run(port, path, clients, requests, conditional):
+    latencies = []
+    threads = [threading.Thread(target=_client,
+                                args=(port, path, requests, conditional,
+                                      latencies))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(latencies) / elapsed,
+            latencies[len(latencies) // 2],
+            latencies[int(len(latencies) * 0.99)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = VideoLibrary(
+            write_catalog(Path(directory) / "videos.txt", args.videos))
+    server = VideoServer(("127.0.0.1", 0), VideoPlayer(video_library=library))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    for path in ("/videos", "/videos/search?q=cat"):
+        for label, conditional in (("200 every time", False),
+                                   ("If-None-Match", True)):
+            rate, p50, p99 = _run(port, path, args.clients, args.requests,
+                                  conditional)
+            print(f"GET {path:<22} {label:<15} {rate:9.1f} requests/s  "
+                  f"p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compares the memory and lookup time of a dict and a StaticIdIndex."""
+import argparse
+import time
+import tracemalloc
+
+from src.static_id_index import StaticIdIndex
+
+
+def _build(build, ids):
+    """Returns what build(ids) built, its bytes and its seconds."""
+    start = time.perf_counter()
+    build(ids)
+    seconds = time.perf_counter() - start
+    # Measured on a second build, tracing slows building down.
+    tracemalloc.start()
+    index = build(ids)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return index, size, seconds
+
+
+def _lookup_seconds(find, ids):
+    start = time.perf_counter()
+    for video_id in ids:
+        find(video_id)
+    return (time.perf_counter() - start) / len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ids = [f"video_{number}_id" for number in range(args.videos)]
+    misses = [f"video_{number}_id"
+              for number in range(args.videos, 2 * args.videos)]
+    rows, rows_size, rows_seconds = _build(
+        lambda ids: {video_id: row for row, video_id in enumerate(ids)},
+        ids)
+    index, index_size, index_seconds = _build(StaticIdIndex, ids)
+
+    print(f"{'index':>8} {'MB':>8} {'build s':>8} {'hit ns':>8} "
+          f"{'miss ns':>8}")
+    for name, size, seconds, find in (
+            ("dict", rows_size, rows_seconds, rows.get),
+            ("mph", index_size, index_seconds, index.find)):
+        print(f"{name:>8} {size / 1e6:8.1f} {seconds:8.2f} "
+              f"{_lookup_seconds(find, ids) * 1e9:8.0f} "
+              f"{_lookup_seconds(find, misses) * 1e9:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Measures listing throughput with and without memoized video strings."""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+from .catalog import write_catalog
+
+
+def _listings_per_second(player, videos, repeat, cached):
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if not cached:
+                # Forget the rendered strings, as before memoization.
+                for video in videos:
+                    video._result = None
+            player.show_all_videos()
+        return repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = VideoLibrary(
+            write_catalog(Path(directory) / "videos.txt", args.videos))
+    player = VideoPlayer(video_library=library)
+    videos = library.get_all_videos()
+    library.flag_videos(video.video_id for video in videos[::10])
+
+    for label, cached in (("rendered every time", False),
+                          ("memoized", True)):
+        rate = _listings_per_second(player, videos, args.repeat, cached)
+        print(f"SHOW_ALL_VIDEOS, {label:<20} {rate:8.2f} listings/s "
+              f"({rate * args.videos:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measures how searches scale with the shards of a ShardedVideoLibrary."""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from src.search_engine import create_search_engine
+from src.sharded_video_library import ShardedVideoLibrary
+from src.video_library import VideoLibrary
+
+from .catalog import write_catalog
+
+
+def _time(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def _measure(engine, repeat):
+    """Returns the seconds per title search, tag search and listing."""
+    return (_time(lambda: engine.search_title("cooking tut"), repeat),
+            _time(lambda: engine.search_tag("#python"), repeat),
+            _time(engine.videos_by_title, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-shards", type=int,
+                        default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video_file = write_catalog(Path(directory) / "videos.txt",
+                                   args.videos)
+        baseline = _measure(
+            create_search_engine("python", VideoLibrary(video_file)),
+            args.repeat)
+        print(f"{'shards':>8} {'title ms':>10} {'tag ms':>10} "
+              f"{'by title ms':>12} {'title speedup':>14}")
+        print(f"{'none':>8} {baseline[0] * 1e3:10.1f} "
+              f"{baseline[1] * 1e3:10.1f} {baseline[2] * 1e3:12.1f} "
+              f"{1:13.2f}x")
+
+        # 1, 2, 4, ... up to and including max_shards.
+        counts = [1 << power for power in range(args.max_shards.bit_length())
+                  if 1 << power < args.max_shards] + [args.max_shards]
+        for shards in counts:
+            with ShardedVideoLibrary(video_file, shards) as library:
+                title, tag, by_title = _measure(
+                    create_search_engine("sharded", library), args.repeat)
+            print(f"{shards:>8} {title * 1e3:10.1f} {tag * 1e3:10.1f} "
+                  f"{by_title * 1e3:12.1f} {baseline[0] / title:13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
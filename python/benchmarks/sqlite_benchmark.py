@@ -0,0 +1,61 @@
+"""Compares the SQLite video library with the in-memory one."""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.search_engine import create_search_engine
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.sqlite_video_library import connect
+from src.video_library import VideoLibrary
+
+from .catalog import write_catalog
+
+
+def _time(label, function, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"    {label:<32} {elapsed / repeat * 1e6:12.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video_file = write_catalog(Path(directory) / "videos.txt",
+                                   args.videos)
+        start = time.perf_counter()
+        memory = VideoLibrary(video_file)
+        print(f"dict: loaded {args.videos} videos in "
+              f"{time.perf_counter() - start:.2f} s")
+        start = time.perf_counter()
+        sqlite = SqliteVideoLibrary(connect(Path(directory) / "videos.db"),
+                                    video_file)
+        print(f"sqlite: imported {args.videos} videos in "
+              f"{time.perf_counter() - start:.2f} s")
+
+        unfiltered = SqliteVideoLibrary(
+            connect(Path(directory) / "videos.db"), id_filter_rate=None)
+
+        video_id = f"video_{args.videos // 2}_id"
+        for name, library, engine in (
+                ("dict", memory, "python"), ("sqlite", sqlite, "sqlite"),
+                ("sqlite without id filter", unfiltered, "sqlite")):
+            search_engine = create_search_engine(engine, library)
+            print(name + ":")
+            _time("get_video (hit)",
+                  lambda: library.get_video(video_id), 10_000)
+            _time("get_video (miss)",
+                  lambda: library.get_video("missing"), 10_000)
+            _time("search title 'cooking tut'",
+                  lambda: search_engine.search_title("cooking tut"), 5)
+            _time("search tag '#python'",
+                  lambda: search_engine.search_tag("#python"), 5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""A Bloom filter class."""
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """A class used to tell that a key was definitely never added.
+
+    Keys set k bits of an m bit array, picked by double hashing a 128 bit
+    blake2b digest. A key whose bits are not all set was never added; one
+    whose bits are set was added, or is a false positive. m and k are
+    sized so that at capacity keys, false positives happen at the given
+    rate.
+    """
+
+    def __init__(self, capacity, false_positive_rate=0.01):
+        """BloomFilter constructor.
+
+        Args:
+            capacity: The number of keys the filter is sized for.
+            false_positive_rate: The rate of false positives at capacity,
+                between 0 and 1.
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("The false positive rate must be between 0 "
+                             "and 1")
+        capacity = max(capacity, 1)
+        self._size = math.ceil(-capacity * math.log(false_positive_rate)
+                               / math.log(2) ** 2)
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, key):
+        """Adds a string key."""
+        for bit in self._bits_of(key):
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[bit >> 3] & 1 << (bit & 7)
+                   for bit in self._bits_of(key))
+
+    def _bits_of(self, key):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self._size
+                for i in range(self._hashes)]
@@ -0,0 +1,76 @@
+"""Time budgets for commands, checked cooperatively by long scans."""
+import threading
+import time
+from contextlib import contextmanager
+
+# How many items a bounded scan goes through between two looks at the
+# clock.
+_CHECK_STRIDE = 256
+
+_local = threading.local()
+
+
+class Deadline:
+    """A class used to represent the time budget of the running command.
+
+    truncated is set once a bounded scan stopped early because the budget
+    ran out, so whoever shows the results can say they are partial.
+    """
+
+    def __init__(self, seconds, clock=time.monotonic):
+        """Deadline constructor.
+
+        Args:
+            seconds: The budget in seconds, starting now.
+            clock: Returns the current time in seconds.
+        """
+        self._seconds = seconds
+        self._clock = clock
+        self._expires = clock() + seconds
+        self.truncated = False
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    def expired(self):
+        """Returns whether the budget ran out."""
+        return self._clock() >= self._expires
+
+
+def current_deadline():
+    """Returns the Deadline of the command running on this thread, or None
+       if it has no budget.
+    """
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def command_deadline(seconds):
+    """Gives the command run inside the with block a budget of seconds, or
+       none if seconds is None, and yields its Deadline.
+
+    Deadlines are kept per thread, so commands running concurrently on
+    other threads keep their own.
+    """
+    previous = current_deadline()
+    _local.deadline = None if seconds is None else Deadline(seconds)
+    try:
+        yield _local.deadline
+    finally:
+        _local.deadline = previous
+
+
+def bounded(iterable):
+    """Yields the items of iterable until the running command's budget runs
+       out, marking its Deadline as truncated if that cut the scan short.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        yield from iterable
+        return
+    for count, item in enumerate(iterable):
+        if not count % _CHECK_STRIDE and deadline.expired():
+            deadline.truncated = True
+            return
+        yield item
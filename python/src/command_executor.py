@@ -0,0 +1,125 @@
+"""An asynchronous command executor class."""
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from .command_parser import CommandException
+from .command_parser import READ_ONLY_COMMANDS
+
+
+class _ThreadLocalStdout:
+    """A stdout replacement that lets every thread capture its own output.
+
+    Threads that are not capturing write through to the original stdout.
+    """
+
+    def __init__(self, stdout):
+        self._stdout = stdout
+        self._local = threading.local()
+
+    def capture(self):
+        """Starts capturing the output of the calling thread."""
+        self._local.buffer = io.StringIO()
+
+    def release(self):
+        """Stops capturing and returns what the calling thread printed."""
+        output = self._local.buffer.getvalue()
+        del self._local.buffer
+        return output
+
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stdout).write(text)
+
+    def flush(self):
+        getattr(self._local, "buffer", self._stdout).flush()
+
+
+class AsyncCommandExecutor:
+    """A class used to execute commands concurrently where it is safe.
+
+    Read-only commands (see READ_ONLY_COMMANDS) run concurrently on a
+    thread pool. Every other command waits for the commands submitted
+    before it, and the commands submitted after it wait for it. Read-only
+    commands therefore always see the state left by the last mutating
+    command before them, as if they ran on a snapshot of it. Each command's
+    output is captured separately and returned through its future, so
+    callers can emit outputs in submission order.
+
+    Use it as a context manager, which installs the output capture on
+    sys.stdout and shuts the thread pool down on exit:
+
+        with AsyncCommandExecutor(parser) as executor:
+            for output in executor.run(commands):
+                print(output, end="")
+    """
+
+    def __init__(self, command_parser, max_workers=4):
+        """AsyncCommandExecutor constructor.
+
+        Args:
+            command_parser: The CommandParser commands are executed with.
+            max_workers: The number of threads running commands.
+        """
+        self._parser = command_parser
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._last_mutation = None
+        self._reads = []
+        self._stdout = None
+
+    def __enter__(self):
+        self._stdout = _ThreadLocalStdout(sys.stdout)
+        sys.stdout = self._stdout
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pool.shutdown()
+        sys.stdout = self._stdout._stdout
+
+    def submit(self, command):
+        """Schedules a command and returns a Future of its output.
+
+        Args:
+            command: The command, split into words.
+        """
+        with self._lock:
+            if command and command[0].upper() in READ_ONLY_COMMANDS:
+                after = [self._last_mutation]
+                future = self._pool.submit(self._execute, after, command)
+                self._reads.append(future)
+            else:
+                after = self._reads + [self._last_mutation]
+                future = self._pool.submit(self._execute, after, command)
+                self._last_mutation = future
+                self._reads = []
+        return future
+
+    def run(self, commands):
+        """Executes commands and yields their outputs in order."""
+        futures = [self.submit(command) for command in commands]
+        for future in futures:
+            yield future.result()
+
+    async def execute(self, command):
+        """Executes a command and returns its output, for asyncio callers.
+
+        Commands are scheduled in the order execute is called.
+        """
+        return await asyncio.wrap_future(self.submit(command))
+
+    def _execute(self, after, command):
+        # Futures are submitted in order and the pool starts them in order,
+        # so everything waited for here has already started.
+        wait([future for future in after if future])
+
+        self._stdout.capture()
+        try:
+            self._parser.execute_command(command)
+        except CommandException as e:
+            print(e)
+        finally:
+            output = self._stdout.release()
+        return output
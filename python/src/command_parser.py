@@ -3,6 +3,38 @@
 import textwrap
 from typing import Sequence
 
+from .command_deadline import command_deadline
+
+# Commands that never change the player or library state. SEARCH_VIDEOS and
+# SEARCH_VIDEOS_WITH_TAG are not included since they can play the video the
+# user picks from the results.
+READ_ONLY_COMMANDS = frozenset({
+    "NUMBER_OF_VIDEOS",
+    "SHOW_ALL_VIDEOS",
+    "SHOW_PLAYING",
+    "HISTORY",
+    "SHOW_PLAYLIST",
+    "SHOW_ALL_PLAYLISTS",
+    "AUTOCOMPLETE",
+    "AUTOCOMPLETE_PLAYLIST",
+    "RELATED",
+    "TOP_PLAYED",
+    "TRENDING",
+    "VIEWERS",
+    "HELP",
+})
+
+
+# Seconds the commands that scan the whole catalog may take before they
+# stop and show what they found so far, marked as truncated.
+DEFAULT_BUDGETS = {
+    "SHOW_ALL_VIDEOS": 5.0,
+    "SEARCH_VIDEOS": 5.0,
+    "SEARCH_VIDEOS_WITH_TAG": 5.0,
+    "SEARCH_VIDEOS_REGEX": 5.0,
+    "QUERY": 5.0,
+}
+
 
 class CommandException(Exception):
     """A class used to represent a wrong command exception."""
@@ -12,13 +44,30 @@ class CommandException(Exception):
 class CommandParser:
     """A class used to parse and execute a user Command."""
 
-    def __init__(self, video_player):
+    def __init__(self, video_player, budgets=None):
+        """CommandParser constructor.
+
+        Args:
+            video_player: The VideoPlayer commands are executed on.
+            budgets: Seconds each command may take by command name,
+                DEFAULT_BUDGETS by default. Commands not listed have no
+                limit.
+        """
         self._player = video_player
+        self._budgets = DEFAULT_BUDGETS if budgets is None else budgets
 
     def execute_command(self, command: Sequence[str]):
         """Executes the user command. Expects the command to be upper case.
            Raises CommandException if a command cannot be parsed.
+
+        The command's budget starts when it starts executing. Long scans
+        check it as they go and stop once it is spent.
         """
+        budget = self._budgets.get(command[0].upper()) if command else None
+        with command_deadline(budget):
+            self._execute_command(command)
+
+    def _execute_command(self, command):
         if not command:
             raise CommandException(
                 "Please enter a valid command, "
@@ -37,7 +86,15 @@ class CommandParser:
             self._player.play_video(command[1])
 
         elif command[0].upper() == "PLAY_RANDOM":
-            self._player.play_random_video()
+            if len(command) == 1:
+                self._player.play_random_video()
+            elif len(command) == 2 and command[1].upper() in (
+                    "UNIFORM", "WEIGHTED", "SHUFFLE"):
+                self._player.play_random_video(command[1].lower())
+            else:
+                raise CommandException(
+                    "Please enter PLAY_RANDOM command followed by an "
+                    "optional mode: UNIFORM, WEIGHTED or SHUFFLE.")
 
         elif command[0].upper() == "STOP":
             self._player.stop_video()
@@ -51,6 +108,16 @@ class CommandParser:
         elif command[0].upper() == "SHOW_PLAYING":
             self._player.show_playing()
 
+        elif command[0].upper() == "HISTORY":
+            self._player.show_history()
+
+        elif command[0].upper() == "RESUME":
+            if len(command) > 2:
+                raise CommandException(
+                    "Please enter RESUME command followed by an optional "
+                    "video_id.")
+            self._player.resume_video(*command[1:])
+
         elif command[0].upper() == "CREATE_PLAYLIST":
             if len(command) != 2:
                 raise CommandException(
@@ -87,21 +154,50 @@ class CommandParser:
             self._player.delete_playlist(command[1])
 
         elif command[0].upper() == "SHOW_PLAYLIST":
-            if len(command) != 2:
+            if len(command) == 2:
+                self._player.show_playlist(command[1])
+            elif len(command) in (3, 4) and command[2] == "--page":
+                self._player.show_playlist(
+                    command[1], self._parse_page_cursor(command))
+            else:
                 raise CommandException(
                     "Please enter SHOW_PLAYLIST command followed by a "
+                    "playlist name and an optional --page [cursor].")
+
+        elif command[0].upper() == "PLAY_PLAYLIST":
+            if len(command) != 2:
+                raise CommandException(
+                    "Please enter PLAY_PLAYLIST command followed by a "
                     "playlist name.")
-            self._player.show_playlist(command[1])
+            self._player.play_playlist(command[1])
+
+        elif command[0].upper() == "NEXT":
+            self._player.next_video()
+
+        elif command[0].upper() == "PREVIOUS":
+            self._player.previous_video()
 
         elif command[0].upper() == "SHOW_ALL_PLAYLISTS":
             self._player.show_all_playlists()
 
         elif command[0].upper() == "SEARCH_VIDEOS":
-            if len(command) != 2:
+            if len(command) == 2:
+                self._player.search_videos(command[1])
+            elif len(command) in (3, 4) and command[2] == "--page":
+                self._player.search_videos(
+                    command[1], self._parse_page_cursor(command))
+            else:
                 raise CommandException(
                     "Please enter SEARCH_VIDEOS command followed by a "
-                    "search term.")
-            self._player.search_videos(command[1])
+                    "search term and an optional --page [cursor].")
+
+        elif command[0].upper() == "SEARCH_VIDEOS_REGEX":
+            if len(command) < 2:
+                raise CommandException(
+                    "Please enter SEARCH_VIDEOS_REGEX command followed by a "
+                    "regular expression.")
+            # Commands are split on whitespace, put spaces back.
+            self._player.search_videos_regex(" ".join(command[1:]))
 
         elif command[0].upper() == "SEARCH_VIDEOS_WITH_TAG":
             if len(command) != 2:
@@ -127,6 +223,55 @@ class CommandParser:
                     "video_id.")
             self._player.allow_video(command[1])
 
+        elif command[0].upper() == "QUERY":
+            explain = len(command) > 1 and command[1].upper() == "EXPLAIN"
+            query = command[2:] if explain else command[1:]
+            if not query:
+                raise CommandException(
+                    "Please enter QUERY command followed by an optional "
+                    "EXPLAIN and a query, e.g. title:cat AND tag:#animal.")
+            self._player.query_videos(query, explain)
+
+        elif command[0].upper() == "AUTOCOMPLETE":
+            self._player.autocomplete_videos(
+                *self._parse_autocomplete(command, "a title prefix"))
+
+        elif command[0].upper() == "AUTOCOMPLETE_PLAYLIST":
+            self._player.autocomplete_playlists(
+                *self._parse_autocomplete(command, "a playlist name prefix"))
+
+        elif command[0].upper() == "RELATED":
+            if len(command) == 2:
+                self._player.show_related_videos(command[1])
+            elif (len(command) == 3 and command[2].isdigit()
+                  and int(command[2])):
+                self._player.show_related_videos(command[1], int(command[2]))
+            else:
+                raise CommandException(
+                    "Please enter RELATED command followed by a video_id "
+                    "and an optional number of videos.")
+
+        elif command[0].upper() == "TOP_PLAYED":
+            self._player.show_top_played(*self._parse_count(command))
+
+        elif command[0].upper() == "TRENDING":
+            self._player.show_trending(*self._parse_count(command))
+
+        elif command[0].upper() == "VIEWERS":
+            if len(command) != 2:
+                raise CommandException(
+                    "Please enter VIEWERS command followed by a video_id.")
+            self._player.show_viewers(command[1])
+
+        elif command[0].upper() == "FLAG_VIDEOS":
+            video_ids, flag_reason = self._parse_bulk_video_ids(
+                command, allow_reason=True)
+            self._player.flag_videos(video_ids, flag_reason)
+
+        elif command[0].upper() == "ALLOW_VIDEOS":
+            video_ids, _ = self._parse_bulk_video_ids(command)
+            self._player.allow_videos(video_ids)
+
         elif command[0].upper() == "HELP":
             self._get_help()
         else:
@@ -134,6 +279,75 @@ class CommandParser:
                 "Please enter a valid command, type HELP for a list of "
                 "available commands.")
 
+    def _parse_page_cursor(self, command):
+        """Returns the cursor following --page, 0 (the first page) if
+           there is none.
+        """
+        if len(command) == 3:
+            return 0
+        if not command[3].isdigit():
+            raise CommandException(
+                f"Please enter a valid page cursor for {command[0].upper()}.")
+        return int(command[3])
+
+    def _parse_autocomplete(self, command, prefix_description):
+        """Returns the prefix and optional number of completions of an
+           autocomplete command.
+        """
+        if len(command) == 2:
+            return (command[1],)
+        if len(command) == 3 and command[2].isdigit() and int(command[2]):
+            return command[1], int(command[2])
+        raise CommandException(
+            f"Please enter {command[0].upper()} command followed by "
+            f"{prefix_description} and an optional number of completions.")
+
+    def _parse_count(self, command):
+        """Returns the optional number of videos of a ranking command."""
+        if len(command) == 1:
+            return ()
+        if len(command) == 2 and command[1].isdigit() and int(command[1]):
+            return (int(command[1]),)
+        raise CommandException(
+            f"Please enter {command[0].upper()} command followed by an "
+            "optional number of videos.")
+
+    def _parse_bulk_video_ids(self, command, allow_reason=False):
+        """Collects video ids for a bulk command from its arguments and
+           any --file <path> (one id per line). FLAG_VIDEOS also accepts
+           --reason <flag_reason>.
+        """
+        usage = (f"Please enter {command[0].upper()} command followed by "
+                 "video_ids and/or --file <path>")
+        if allow_reason:
+            usage += " and an optional --reason <flag_reason>"
+        usage += "."
+
+        video_ids = []
+        flag_reason = "Not supplied"
+        args = iter(command[1:])
+        for arg in args:
+            if arg == "--file" or (allow_reason and arg == "--reason"):
+                value = next(args, None)
+                if value is None:
+                    raise CommandException(usage)
+                if arg == "--reason":
+                    flag_reason = value
+                    continue
+                try:
+                    with open(value) as id_file:
+                        video_ids.extend(
+                            line.strip() for line in id_file if line.strip())
+                except OSError:
+                    raise CommandException(
+                        f"Cannot read video_ids from file: {value}")
+            else:
+                video_ids.append(arg)
+
+        if not video_ids:
+            raise CommandException(usage)
+        return video_ids, flag_reason
+
     def _get_help(self):
         """Displays all available commands to the user."""
         help_text = textwrap.dedent("""
@@ -141,22 +355,37 @@ class CommandParser:
             NUMBER_OF_VIDEOS - Shows how many videos are in the library.
             SHOW_ALL_VIDEOS - Lists all videos from the library.
             PLAY <video_id> - Plays specified video.
-            PLAY_RANDOM - Plays a random video from the library.
+            PLAY_RANDOM [UNIFORM|WEIGHTED|SHUFFLE] - Plays a random video from the library, optionally weighted by popularity or without repeats.
             STOP - Stop the current video.
             PAUSE - Pause the current video.
             CONTINUE - Resume the current paused video.
             SHOW_PLAYING - Displays the title, url and paused status of the video that is currently playing (or paused).
+            HISTORY - Displays the videos watched most recently and where they were stopped.
+            RESUME [video_id] - Plays a video, by default the last one stopped, from where it was stopped.
             CREATE_PLAYLIST <playlist_name> - Creates a new (empty) playlist with the provided name.
             ADD_TO_PLAYLIST <playlist_name> <video_id> - Adds the requested video to the playlist.
             REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the specified video from the specified playlist
             CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the playlist.
             DELETE_PLAYLIST <playlist_name> - Deletes the playlist.
-            SHOW_PLAYLIST <playlist_name> - List all the videos in this playlist.
+            SHOW_PLAYLIST <playlist_name> [--page [cursor]] - List all the videos in this playlist, optionally one page at a time.
+            PLAY_PLAYLIST <playlist_name> - Plays the videos of the playlist one after another.
+            NEXT - Plays the next video of the playlist being played.
+            PREVIOUS - Plays the previous video of the playlist being played.
             SHOW_ALL_PLAYLISTS - Display all the available playlists.
-            SEARCH_VIDEOS <search_term> - Display all the videos whose titles contain the search_term.
+            SEARCH_VIDEOS <search_term> [--page [cursor]] - Display all the videos whose titles contain the search_term, optionally one page at a time.
+            SEARCH_VIDEOS_REGEX <pattern> - Display all the videos whose titles match the regular expression, ignoring case.
             SEARCH_VIDEOS_WITH_TAG <tag_name> -Display all videos whose tags contains the provided tag.
+            QUERY [EXPLAIN] <query> - Display all videos matching a query such as title:cat AND tag:#animal NOT tag:#dog, or how it is evaluated.
+            AUTOCOMPLETE <prefix> [k] - Display up to k video titles starting with the prefix.
+            AUTOCOMPLETE_PLAYLIST <prefix> [k] - Display up to k playlist names starting with the prefix.
+            RELATED <video_id> [k] - Display up to k videos sharing the most tags with the video.
+            TOP_PLAYED [k] - Display up to k of the most played videos.
+            TRENDING [k] - Display up to k of the videos played the most recently.
+            VIEWERS <video_id> - Display about how many sessions played the video.
             FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.
             ALLOW_VIDEO <video_id> - Removes a flag from a video.
+            FLAG_VIDEOS <video_id>... [--file <path>] [--reason <flag_reason>] - Mark many videos as flagged.
+            ALLOW_VIDEOS <video_id>... [--file <path>] - Removes the flag from many videos.
             HELP - Displays help.
             EXIT - Terminates the program execution.
         """)
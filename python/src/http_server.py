@@ -0,0 +1,192 @@
+"""A local HTTP/JSON API for the video player.
+
+Usage:
+    python3 -m src.http_server [--port PORT]
+
+Endpoints:
+    GET  /videos                      All videos, sorted by title.
+    GET  /videos/search?q=<term>      Allowed videos whose title contains
+                                      term.
+    GET  /videos/tag?tag=<tag>        Allowed videos with the tag.
+    GET  /playlists                   All playlists, sorted by name.
+    GET  /playlists/<name>            The videos of a playlist.
+    POST /videos/<video_id>/flag      Flags a video, with an optional JSON
+                                      body {"reason": "..."}.
+    POST /videos/<video_id>/allow     Removes the flag from a video.
+
+GET responses carry an ETag built from the player's generation counters;
+a request whose If-None-Match still matches is answered 304 before any
+listing is computed. Connections are kept alive (HTTP/1.1).
+"""
+import argparse
+import json
+import threading
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from .results import CONFLICT
+from .results import INVALID
+from .results import NOT_FOUND
+from .results import ErrorResult
+from .video_player import VideoPlayer
+
+
+def _json(result):
+    """Returns the JSON-ready form of a result or list of results."""
+    if isinstance(result, list):
+        return [_json(item) for item in result]
+    if isinstance(result, ErrorResult):
+        return {"error": str(result)}
+    return asdict(result)
+
+
+_ERROR_STATUSES = {
+    NOT_FOUND: HTTPStatus.NOT_FOUND,
+    CONFLICT: HTTPStatus.CONFLICT,
+    INVALID: HTTPStatus.BAD_REQUEST,
+}
+
+
+def _status(result):
+    """Returns the HTTP status answering a result."""
+    if not isinstance(result, ErrorResult):
+        return HTTPStatus.OK
+    return _ERROR_STATUSES[result.kind]
+
+
+class VideoRequestHandler(BaseHTTPRequestHandler):
+    """A class used to answer the requests of one HTTP connection."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        with self.server.player_lock:
+            etag = '"%d-%d"' % self.server.player.generation
+            if self.headers.get("If-None-Match") == etag:
+                self._send(HTTPStatus.NOT_MODIFIED, None, etag)
+                return
+            status, body = self._get(parts, query)
+        self._send(status, body, etag if status == HTTPStatus.OK else None)
+
+    def do_POST(self):
+        parts = [unquote(part) for part in urlsplit(self.path).path.split("/")
+                 if part]
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body cannot be told apart from the next request.
+            self.close_connection = True
+            self._send(HTTPStatus.BAD_REQUEST,
+                       {"error": "Invalid Content-Length"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or "{}")
+        except ValueError:
+            body = None
+        if (not isinstance(body, dict)
+                or not isinstance(body.get("reason", ""), str)):
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Invalid JSON body"})
+            return
+
+        if (len(parts) != 3 or parts[0] != "videos"
+                or parts[2] not in ("flag", "allow")):
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        player = self.server.player
+        with self.server.player_lock:
+            if parts[2] == "flag":
+                result = player.flag(parts[1],
+                                     body.get("reason", "Not supplied"))
+            else:
+                result = player.allow(parts[1])
+        self._send(_status(result), _json(result))
+
+    def _get(self, parts, query):
+        """Returns the status and JSON body of a GET request."""
+        player = self.server.player
+        if parts == ["videos"]:
+            result = player.get_all_videos()
+        elif parts == ["videos", "search"] and "q" in query:
+            result = player.find_videos(query["q"][0])
+        elif parts == ["videos", "tag"] and "tag" in query:
+            result = player.find_videos_with_tag(query["tag"][0])
+        elif parts == ["playlists"]:
+            result = player.get_playlists()
+        elif len(parts) == 2 and parts[0] == "playlists":
+            result = player.get_playlist(parts[1])
+        else:
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+        return _status(result), _json(result)
+
+    def _send(self, status, body, etag=None):
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class VideoServer(ThreadingHTTPServer):
+    """A class used to serve a VideoPlayer over HTTP.
+
+    Connections are handled on their own threads; calls into the player
+    are serialized with a lock.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address=("127.0.0.1", 8080), player=None,
+                 verbose=False):
+        """VideoServer constructor.
+
+        Args:
+            address: The (host, port) to listen on, port 0 picks a free one.
+            player: The VideoPlayer to serve, a new one by default.
+            verbose: Whether to log every request to stderr.
+        """
+        super().__init__(address, VideoRequestHandler)
+        self.player = player if player else VideoPlayer()
+        self.player_lock = threading.Lock()
+        self.verbose = verbose
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the video player "
+                                                 "as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    with VideoServer((args.host, args.port), verbose=True) as server:
+        print(f"Serving on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
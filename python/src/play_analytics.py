@@ -0,0 +1,206 @@
+"""Play count sketches for the top played and trending videos."""
+import heapq
+import time
+import zlib
+from array import array
+
+# Trending weights are rescaled to 1 once they grow past 2 ** this, and
+# dropped when scaling them down would leave nothing of them.
+_RESCALE_AFTER = 32
+_RESET_AFTER = 1000
+
+
+class CountMinSketch:
+    """A class used to estimate how often keys were counted in fixed memory.
+
+    Every key adds to one counter in each of depth rows of width counters,
+    picked by double hashing its crc32, and is estimated as the smallest of
+    them. Estimates never undercount, and overcount by at most
+    2 / width of the total count with probability 1 - 2 ** -depth.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        """CountMinSketch constructor.
+
+        Args:
+            width: The number of counters per row.
+            depth: The number of rows.
+        """
+        self._width = width
+        self._depth = depth
+        self._counters = array("d", bytes(8 * width * depth))
+
+    def add(self, key, count=1.0):
+        """Adds count to a key and returns its new estimate."""
+        counters = self._counters
+        cells = self._cells(key)
+        for cell in cells:
+            counters[cell] += count
+        return min(counters[cell] for cell in cells)
+
+    def estimate(self, key):
+        """Returns the estimated count of a key."""
+        return min(self._counters[cell] for cell in self._cells(key))
+
+    def scale(self, factor):
+        """Multiplies every count by factor."""
+        self._counters = array(
+            "d", (counter * factor for counter in self._counters))
+
+    def _cells(self, key):
+        data = key.encode()
+        first = zlib.crc32(data)
+        # Odd, so it steps through every column of a power of two width.
+        step = zlib.crc32(data, first) | 1
+        return [row * self._width + (first + row * step) % self._width
+                for row in range(self._depth)]
+
+
+class SpaceSaving:
+    """A class used to keep the keys counted most often in fixed memory.
+
+    At most capacity keys are kept with their counts. A new key replaces
+    the kept key with the smallest count and starts from that count, so
+    counts may overestimate by what they inherited, but every key counted
+    more than total / capacity times is kept. The smallest count is found
+    with a heap of (count, key) entries; entries outdated by later counts
+    are skipped, and pruned when the heap grows too large.
+    """
+
+    def __init__(self, capacity=100):
+        """SpaceSaving constructor.
+
+        Args:
+            capacity: The number of keys kept.
+        """
+        self._capacity = capacity
+        self._counts = {}
+        self._heap = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, key, count=1.0):
+        """Adds count to a key, replacing the least counted key if it is
+           not kept yet.
+        """
+        counts = self._counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self._capacity:
+            counts[key] = count
+        else:
+            smallest, evicted = self._pop_smallest()
+            del counts[evicted]
+            counts[key] = smallest + count
+
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self._capacity:
+            self._rebuild_heap()
+
+    def items(self):
+        """Returns the kept (key, count) pairs."""
+        return self._counts.items()
+
+    def scale(self, factor):
+        """Multiplies every count by factor."""
+        self._counts = {key: count * factor
+                        for key, count in self._counts.items()}
+        self._rebuild_heap()
+
+    def _pop_smallest(self):
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self._counts.get(key) == count:
+                return count, key
+
+    def _rebuild_heap(self):
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+
+class PlayAnalytics:
+    """A class used to rank videos by their plays, all time and trending.
+
+    Plays are counted by a CountMinSketch and a SpaceSaving summary of the
+    most played videos, whose counts both overestimate, so a video scores
+    the smaller of the two. Trending keeps a second pair in which a play at
+    time t weighs 2 ** (t / half_life) (forward decay): ranking by these
+    weights ranks by exponentially decayed plays without revisiting old
+    counts. Trending scores are divided by the weight of the current time
+    when read, and every trending count is rescaled once weights grow
+    large, before they are computed, so long idle gaps cannot overflow
+    them. Memory depends on the sketch sizes, not on the catalog.
+    """
+
+    def __init__(self, capacity=100, width=2048, depth=4, half_life=3600.0,
+                 clock=time.monotonic):
+        """PlayAnalytics constructor.
+
+        Args:
+            capacity: The number of videos ranked.
+            width: The counters per row of the count-min sketches.
+            depth: The rows of the count-min sketches.
+            half_life: The seconds after which a play counts half as much
+                towards trending.
+            clock: Returns the current time in seconds.
+        """
+        self._capacity = capacity
+        self._width = width
+        self._depth = depth
+        self._half_life = half_life
+        self._clock = clock
+        self._landmark = clock()
+        self._plays = CountMinSketch(width, depth)
+        self._top_played = SpaceSaving(capacity)
+        self._recent_plays = CountMinSketch(width, depth)
+        self._trending = SpaceSaving(capacity)
+
+    def record_play(self, video_id):
+        """Counts a play of a video."""
+        self._plays.add(video_id)
+        self._top_played.add(video_id)
+
+        weight = self._weight()
+        self._recent_plays.add(video_id, weight)
+        self._trending.add(video_id, weight)
+
+    def top_played(self):
+        """Returns (video_id, estimated plays) pairs of the most played
+           videos, most played first.
+        """
+        return _ranked(self._top_played, self._plays, 1.0)
+
+    def trending(self):
+        """Returns (video_id, decayed plays) pairs of the trending videos,
+           most played recently first.
+        """
+        weight = self._weight()
+        return _ranked(self._trending, self._recent_plays, weight)
+
+    def _weight(self):
+        """Returns the trending weight of a play made now, rescaling the
+           trending counts first if it would be too large.
+        """
+        now = self._clock()
+        exponent = (now - self._landmark) / self._half_life
+        if exponent <= _RESCALE_AFTER:
+            return 2.0 ** exponent
+        if exponent > _RESET_AFTER:
+            self._recent_plays = CountMinSketch(self._width, self._depth)
+            self._trending = SpaceSaving(self._capacity)
+        else:
+            self._recent_plays.scale(2.0 ** -exponent)
+            self._trending.scale(2.0 ** -exponent)
+        self._landmark = now
+        return 1.0
+
+
+def _ranked(summary, sketch, weight):
+    """Returns the (key, score) pairs of a summary best first, scored by
+       the smaller of both estimates divided by weight.
+    """
+    scores = [(key, min(count, sketch.estimate(key)) / weight)
+              for key, count in summary.items()]
+    scores.sort(key=lambda score: score[1], reverse=True)
+    return scores
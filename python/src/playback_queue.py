@@ -0,0 +1,77 @@
+"""A playback queue class."""
+from collections import deque
+
+
+class PlaybackQueue:
+    """A class used to play through a playlist one video at a time.
+
+    The queue works on the playlist's video ids as they were when playback
+    started. Up to `prefetch` upcoming videos are resolved from the library
+    ahead of time, so advancing never rescans the playlist. Ids that no
+    longer exist are skipped while prefetching and flagged videos are
+    skipped again when advanced to, in case they were flagged after being
+    prefetched.
+    """
+
+    def __init__(self, name, video_ids, video_library, prefetch=3):
+        """PlaybackQueue constructor.
+
+        Args:
+            name: The name of the playlist being played.
+            video_ids: The video ids to play, in order.
+            video_library: The library the videos are resolved from.
+            prefetch: How many upcoming videos to resolve ahead of time.
+        """
+        self._name = name
+        self._video_ids = tuple(video_ids)
+        self._video_library = video_library
+        self._prefetch = prefetch
+        self._position = -1
+        self._cursor = 0
+        self._upcoming = deque()
+        self._fill()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def next_video(self):
+        """Advances to the next playable video and returns it, or None if
+           the end of the playlist was reached.
+        """
+        while True:
+            if not self._upcoming:
+                self._fill()
+                if not self._upcoming:
+                    return None
+            position, video = self._upcoming.popleft()
+            if not video.flagged:
+                self._position = position
+                self._fill()
+                return video
+
+    def previous_video(self):
+        """Goes back to the previous playable video and returns it, or None
+           if there is none before the current one.
+        """
+        position = self._position - 1
+        while position >= 0:
+            video = self._video_library.get_video(self._video_ids[position])
+            if video and not video.flagged:
+                self._position = position
+                self._cursor = position + 1
+                self._upcoming.clear()
+                self._fill()
+                return video
+            position -= 1
+        return None
+
+    def _fill(self):
+        """Resolves upcoming videos until `prefetch` of them are queued."""
+        while (len(self._upcoming) < self._prefetch
+               and self._cursor < len(self._video_ids)):
+            video = self._video_library.get_video(
+                self._video_ids[self._cursor])
+            if video and not video.flagged:
+                self._upcoming.append((self._cursor, video))
+            self._cursor += 1
@@ -0,0 +1,63 @@
+"""A sorted prefix index class."""
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+class PrefixIndex:
+    """A class used to look up values by the prefix of their key.
+
+    Keys are kept in a sorted array next to their values, so the first
+    match for a prefix is found with a binary search and completions are
+    read off in key order from there.
+    """
+
+    def __init__(self, items=()):
+        """PrefixIndex constructor.
+
+        Args:
+            items: Optional (key, value) pairs to index.
+        """
+        items = sorted(items, key=lambda item: item[0])
+        self._keys = [key for key, _ in items]
+        self._values = [value for _, value in items]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        """Iterates over the values in key order."""
+        return iter(self._values)
+
+    def insert(self, key, value):
+        """Adds a value under key, after any values with an equal key."""
+        row = bisect_right(self._keys, key)
+        self._keys.insert(row, key)
+        self._values.insert(row, value)
+
+    def remove(self, key, value):
+        """Removes a value stored under key. Does nothing if not present."""
+        row = bisect_left(self._keys, key)
+        while row < len(self._keys) and self._keys[row] == key:
+            if self._values[row] == value:
+                del self._keys[row]
+                del self._values[row]
+                return
+            row += 1
+
+    def complete(self, prefix, k, accept=None):
+        """Returns up to k values whose key starts with prefix, in key order.
+
+        Args:
+            prefix: The key prefix to complete.
+            k: The maximum number of values to return.
+            accept: Optional predicate, values it rejects are skipped.
+        """
+        completions = []
+        row = bisect_left(self._keys, prefix)
+        while (len(completions) < k and row < len(self._keys)
+               and self._keys[row].startswith(prefix)):
+            value = self._values[row]
+            if accept is None or accept(value):
+                completions.append(value)
+            row += 1
+        return completions
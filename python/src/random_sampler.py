@@ -0,0 +1,203 @@
+"""Samplers used by the video player to pick a random video."""
+import random
+from collections import Counter
+
+# How many flagged videos a sampler may draw in a row before it gives up on
+# rejection sampling and picks from an explicitly built allowed set.
+_MAX_REJECTIONS = 32
+
+
+class UniformSampler:
+    """A class used to pick allowed videos uniformly at random.
+
+    Draws a random row of the catalog and rejects it if the video is
+    flagged, so no list of allowed videos is built per call. Only the
+    drawn video is built.
+    """
+
+    def __init__(self, video_library, rng=None):
+        """UniformSampler constructor.
+
+        Args:
+            video_library: The library to sample from.
+            rng: The random.Random to draw from, the random module's by
+                default.
+        """
+        self._video_library = video_library
+        self._flags = video_library.get_flag_bitmap()
+        self._random = rng if rng is not None else random
+
+    def sample(self):
+        """Returns a random allowed video, or None if there is none."""
+        count = len(self._video_library)
+        if not count:
+            return None
+        for _ in range(_MAX_REJECTIONS):
+            row = self._random.randrange(count)
+            if not self._flags[row]:
+                return self._video_library.get_video_at(row)
+
+        # Mostly flagged catalog, pick from the allowed rows directly.
+        rows = [row for row, flagged in enumerate(self._flags) if not flagged]
+        if not rows:
+            return None
+        return self._video_library.get_video_at(self._random.choice(rows))
+
+    def record_play(self, video_id):
+        """Called by the player whenever a video starts playing."""
+        pass
+
+
+class WeightedSampler:
+    """A class used to pick allowed videos weighted by popularity.
+
+    The popularity of a video is its initial weight (1 unless given) plus
+    the number of times it has been played. Initial weights are sampled
+    through an alias table, which costs O(N) to build and O(1) per draw.
+    Plays are appended to a list, so drawing uniformly from that list picks
+    a video in proportion to its play count, and counted per row; recording
+    a play is therefore O(1) too. Once there are as many plays as videos
+    they are folded into the weights and the alias table is rebuilt,
+    amortizing the rebuild.
+    """
+
+    def __init__(self, video_library, weights=None, rng=None):
+        """WeightedSampler constructor.
+
+        Args:
+            video_library: The library to sample from.
+            weights: Optional initial popularity per video, in catalog
+                order. Defaults to 1 for every video.
+            rng: The random.Random to draw from, the random module's by
+                default.
+        """
+        self._video_library = video_library
+        self._flags = video_library.get_flag_bitmap()
+        self._random = rng if rng is not None else random
+        self._count = len(video_library)
+        if weights is None:
+            weights = [1.0] * self._count
+        self._weights = [float(weight) for weight in weights]
+        self._played_rows = []
+        self._play_counts = Counter()
+        self._build_alias_table()
+
+    def sample(self):
+        """Returns a random allowed video, or None if there is none."""
+        if not self._count or (self._total <= 0 and not self._played_rows):
+            return None
+        for _ in range(_MAX_REJECTIONS):
+            row = self._draw_row()
+            if not self._flags[row]:
+                return self._video_library.get_video_at(row)
+
+        # Mostly flagged catalog, pick from the allowed rows directly.
+        rows, weights = [], []
+        for row, flagged in enumerate(self._flags):
+            weight = self._weights[row] + self._play_counts[row]
+            if weight > 0 and not flagged:
+                rows.append(row)
+                weights.append(weight)
+        if not rows:
+            return None
+        row, = self._random.choices(rows, weights)
+        return self._video_library.get_video_at(row)
+
+    def record_play(self, video_id):
+        """Increases the popularity of a video by one play."""
+        row = self._video_library.get_row(video_id)
+        if row is None:
+            return
+        self._played_rows.append(row)
+        self._play_counts[row] += 1
+        if len(self._played_rows) >= self._count:
+            for played_row, count in self._play_counts.items():
+                self._weights[played_row] += count
+            self._played_rows = []
+            self._play_counts = Counter()
+            self._build_alias_table()
+
+    def get_weight(self, video_id):
+        """Returns the current popularity of a video."""
+        row = self._video_library.get_row(video_id)
+        return self._weights[row] + self._play_counts[row]
+
+    def _draw_row(self):
+        """Draws a row in proportion to its weight plus its play count."""
+        if self._random.random() * (self._total + len(self._played_rows)) \
+                >= self._total:
+            return self._random.choice(self._played_rows)
+        column = self._random.randrange(self._count)
+        if self._random.random() < self._probability[column]:
+            return column
+        return self._alias[column]
+
+    def _build_alias_table(self):
+        """Builds the alias table for the weights (Vose's method)."""
+        count = len(self._weights)
+        self._total = sum(self._weights)
+        self._probability = [0.0] * count
+        self._alias = list(range(count))
+        if self._total <= 0:
+            return
+
+        scaled = [weight * count / self._total for weight in self._weights]
+        small = [row for row, weight in enumerate(scaled) if weight < 1]
+        large = [row for row, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._probability[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        for row in small + large:
+            self._probability[row] = 1.0
+
+
+class ShuffleBagSampler:
+    """A class used to pick allowed videos without repeats.
+
+    Rows are drawn from a shuffled bag of the whole catalog; no video is
+    drawn twice until the bag is exhausted, at which point it is refilled
+    and shuffled again. Flagged videos are skipped when they are drawn.
+    """
+
+    def __init__(self, video_library, rng=None):
+        """ShuffleBagSampler constructor.
+
+        Args:
+            video_library: The library to sample from.
+            rng: The random.Random to draw from, the random module's by
+                default.
+        """
+        self._video_library = video_library
+        self._flags = video_library.get_flag_bitmap()
+        self._random = rng if rng is not None else random
+        self._bag = []
+
+    def sample(self):
+        """Returns the next allowed video from the bag, or None if there
+           is none.
+        """
+        refilled = False
+        while True:
+            if not self._bag:
+                if refilled or not len(self._video_library):
+                    return None
+                self._bag = list(range(len(self._video_library)))
+                self._random.shuffle(self._bag)
+                refilled = True
+            row = self._bag.pop()
+            if not self._flags[row]:
+                return self._video_library.get_video_at(row)
+
+    def record_play(self, video_id):
+        """Called by the player whenever a video starts playing."""
+        pass
+
+
+RANDOM_SAMPLERS = {
+    "uniform": UniformSampler,
+    "weighted": WeightedSampler,
+    "shuffle": ShuffleBagSampler,
+}
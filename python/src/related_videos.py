@@ -0,0 +1,101 @@
+"""A related videos class."""
+import heapq
+import math
+import threading
+
+
+class RelatedVideos:
+    """A class used to find the videos that share the most tags with a
+       video.
+
+    Two videos score the sum of the IDF weights (log(N / df)) of the tags
+    they share, so rare tags count for more. Candidates are gathered from
+    per-tag posting lists, rarest tag first; once the k-th best score so
+    far beats the most any unseen video could still reach, no new
+    candidates are taken, only the scores of those seen are completed.
+    Neighbor lists are cached per video and dropped when flagging or
+    allowing a video could change them. The cache is guarded by a lock, so
+    related() may be called from several threads.
+    """
+
+    def __init__(self, video_library):
+        self._video_library = video_library
+        self._videos = video_library.get_all_videos()
+        self._rows = {video.video_id: row
+                      for row, video in enumerate(self._videos)}
+        self._postings = {}
+        for row, video in enumerate(self._videos):
+            for tag in set(video.tags):
+                self._postings.setdefault(tag, []).append(row)
+        self._idf = {tag: math.log(len(self._videos) / len(rows))
+                     for tag, rows in self._postings.items()}
+
+        # Neighbor lists by row as (k, [(score, row), ...]), and for every
+        # row the rows whose cached list contains it.
+        self._cache = {}
+        self._listed_in = {}
+        self._lock = threading.Lock()
+
+    def related(self, video_id, k):
+        """Returns up to k allowed videos related to a video, best first.
+
+        Ties are broken by catalog order.
+        """
+        row = self._rows[video_id]
+        with self._lock:
+            cached = self._cache.get(row)
+            if cached is None or cached[0] < k:
+                neighbors = self._top_k(row, k)
+                self._uncache(row)
+                self._cache[row] = (k, neighbors)
+                for _, neighbor in neighbors:
+                    self._listed_in.setdefault(neighbor, set()).add(row)
+                cached = self._cache[row]
+        return [self._videos[neighbor] for _, neighbor in cached[1][:k]]
+
+    def flagged(self, video_id):
+        """Drops the cached lists that contain a newly flagged video."""
+        row = self._rows.get(video_id)
+        with self._lock:
+            for listing_row in list(self._listed_in.get(row, ())):
+                self._uncache(listing_row)
+
+    def allowed(self, video_id):
+        """Drops the cached lists a newly allowed video could enter."""
+        row = self._rows.get(video_id)
+        if row is None:
+            return
+        with self._lock:
+            for tag in set(self._videos[row].tags):
+                for tagged_row in self._postings[tag]:
+                    self._uncache(tagged_row)
+
+    def _top_k(self, row, k):
+        tags = sorted(set(self._videos[row].tags),
+                      key=lambda tag: self._idf[tag], reverse=True)
+        remaining = sum(self._idf[tag] for tag in tags)
+        scores = {}
+        accept_new = True
+        for tag in tags:
+            weight = self._idf[tag]
+            remaining -= weight
+            for candidate in self._postings[tag]:
+                if candidate in scores:
+                    scores[candidate] += weight
+                elif accept_new and candidate != row and \
+                        not self._is_flagged(candidate):
+                    scores[candidate] = weight
+            if accept_new and len(scores) >= k:
+                kth_score = heapq.nlargest(k, scores.values())[-1]
+                accept_new = kth_score <= remaining
+        return heapq.nsmallest(k, ((-score, candidate)
+                                   for candidate, score in scores.items()))
+
+    def _is_flagged(self, row):
+        return self._video_library.is_flagged(self._videos[row].video_id)
+
+    def _uncache(self, row):
+        cached = self._cache.pop(row, None)
+        if cached:
+            for _, neighbor in cached[1]:
+                self._listed_in[neighbor].discard(row)
@@ -0,0 +1,129 @@
+"""Replays recorded sessions against video players for load testing.
+
+Usage:
+    python3 -m src.replay session.log [--paced] [--seed SEED]
+"""
+import argparse
+import contextlib
+import json
+import os
+import time
+
+from .command_parser import CommandException
+from .command_parser import CommandParser
+from .video_player import VideoPlayer
+
+
+class ReplayReport:
+    """A class used to represent the result of a replay."""
+
+    def __init__(self, latencies, elapsed):
+        """ReplayReport constructor.
+
+        Args:
+            latencies: The latency of every replayed command in seconds.
+            elapsed: The wall clock duration of the replay in seconds.
+        """
+        self._latencies = sorted(latencies)
+        self._elapsed = elapsed
+
+    @property
+    def commands(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Returns the replayed commands per second."""
+        return self.commands / self._elapsed if self._elapsed else 0.0
+
+    def percentile(self, percent):
+        """Returns the latency below which percent% of commands fell."""
+        if not self._latencies:
+            return 0.0
+        rank = round(percent / 100 * (len(self._latencies) - 1))
+        return self._latencies[rank]
+
+    def __str__(self):
+        return (f"{self.commands} commands in {self._elapsed:.3f} s "
+                f"({self.throughput:.1f} commands/s), latency "
+                f"p50 {self.percentile(50) * 1e3:.3f} ms, "
+                f"p90 {self.percentile(90) * 1e3:.3f} ms, "
+                f"p99 {self.percentile(99) * 1e3:.3f} ms")
+
+
+def read_log(log_file):
+    """Returns the records of a session log, in the order written."""
+    return [json.loads(line) for line in log_file if line.strip()]
+
+
+def replay(records, paced=False, seed=None, player_factory=VideoPlayer):
+    """Re-drives recorded commands against a fresh player per session.
+
+    Output of the commands is discarded.
+
+    Args:
+        records: The records from read_log.
+        paced: Whether to wait between commands as long as they were
+            apart when recorded, instead of replaying as fast as possible.
+        seed: Seed for the random picks of every session, the one logged
+            for the session (or 0) by default.
+        player_factory: Creates the VideoPlayer of every session.
+
+    Returns:
+        A ReplayReport.
+    """
+    seeds = {record["session"]: record["seed"]
+             for record in records if "seed" in record}
+    commands = [record for record in records if "command" in record]
+    parsers = {}
+    answers = []
+
+    def read_recorded_choice():
+        return answers.pop(0) if answers else ""
+
+    latencies = []
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for record in commands:
+            if paced:
+                delay = (record["time"] - commands[0]["time"]
+                         - (time.perf_counter() - start))
+                if delay > 0:
+                    time.sleep(delay)
+
+            parser = parsers.get(record["session"])
+            if parser is None:
+                player = player_factory()
+                player._read_choice = read_recorded_choice
+                player.seed_random(seed if seed is not None
+                                   else seeds.get(record["session"], 0))
+                parser = parsers[record["session"]] = CommandParser(player)
+
+            answers[:] = record["answers"]
+            issued = time.perf_counter()
+            try:
+                parser.execute_command(record["command"])
+            except CommandException:
+                pass
+            latencies.append(time.perf_counter() - issued)
+        elapsed = time.perf_counter() - start
+    return ReplayReport(latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays recorded sessions.")
+    parser.add_argument("log", help="session log written by the recorder")
+    parser.add_argument("--paced", action="store_true",
+                        help="keep the recorded time between commands")
+    parser.add_argument("--seed", type=int,
+                        help="seed for PLAY_RANDOM, the recorded one by "
+                             "default")
+    args = parser.parse_args()
+    with open(args.log) as log_file:
+        records = read_log(log_file)
+    print(replay(records, args.paced, args.seed))
+
+
+if __name__ == "__main__":
+    main()
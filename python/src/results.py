@@ -0,0 +1,190 @@
+"""The result types returned by the VideoPlayer API.
+
+The VideoPlayer's printing methods render these; servers and batch callers
+can use them directly, e.g. with dataclasses.asdict.
+"""
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import Optional
+from typing import Tuple
+
+# The kinds of ErrorResult, for callers that branch on why an operation
+# failed rather than parsing its reason.
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"
+INVALID = "invalid"
+
+
+class _Result:
+    """A class used to pickle and copy the frozen results.
+
+    Frozen dataclasses with __slots__ have no __dict__ to restore and
+    refuse setattr, so their fields are saved as a tuple and set around
+    the dataclass __setattr__. Memos like VideoResult._rendered are not
+    fields and are left out.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+
+@dataclass(frozen=True)
+class VideoResult(_Result):
+    """A class used to represent a snapshot of a video."""
+
+    # "_rendered" is not a field, it holds str(result) once built.
+    __slots__ = ("video_id", "title", "tags", "flagged", "flag_reason",
+                 "_rendered")
+
+    video_id: str
+    title: str
+    tags: Tuple[str, ...]
+    flagged: bool
+    flag_reason: str
+
+    def pretty_flag_reason(self):
+        return "(reason: " + self.flag_reason + ")"
+
+    def __str__(self):
+        try:
+            return self._rendered
+        except AttributeError:
+            out = (self.title + " (" + self.video_id + ") [" +
+                   " ".join(self.tags) + "]")
+            if self.flagged:
+                out += " - FLAGGED " + self.pretty_flag_reason()
+            # Frozen, so the memo is set around the dataclass __setattr__.
+            object.__setattr__(self, "_rendered", out)
+            return out
+
+
+@dataclass(frozen=True)
+class PlaylistResult(_Result):
+    """A class used to represent a playlist and the ids of its videos."""
+
+    __slots__ = ("name", "video_ids")
+
+    name: str
+    video_ids: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PlaylistPage(_Result):
+    """A class used to represent (a page of) the videos of a playlist.
+
+    next_cursor is the cursor of the next page, or None on the last page.
+    """
+
+    __slots__ = ("name", "videos", "next_cursor")
+
+    name: str
+    videos: Tuple[VideoResult, ...]
+    next_cursor: Optional[int]
+
+
+@dataclass(frozen=True)
+class SearchResult(_Result):
+    """A class used to represent (a page of) the hits of a search.
+
+    next_cursor is the cursor of the next page, or None on the last page.
+    truncated is True if the command's time budget ran out before the
+    search finished, so only the hits found until then are included.
+    """
+
+    __slots__ = ("term", "videos", "next_cursor", "truncated")
+
+    term: str
+    videos: Tuple[VideoResult, ...]
+    next_cursor: Optional[int]
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class PlaybackResult(_Result):
+    """A class used to represent the video being played.
+
+    stopped is the video that was stopped to play this one, if any, and
+    resumed_at the position in seconds playback resumed at, or None if it
+    started from the beginning.
+    """
+
+    __slots__ = ("video", "playing", "stopped", "resumed_at")
+
+    video: VideoResult
+    playing: bool
+    stopped: Optional[VideoResult]
+    resumed_at: Optional[float]
+
+
+@dataclass(frozen=True)
+class HistoryEntry(_Result):
+    """A class used to represent a watched video.
+
+    position is the position in seconds it can be resumed at, or None.
+    """
+
+    __slots__ = ("video", "position")
+
+    video: VideoResult
+    position: Optional[float]
+
+
+@dataclass(frozen=True)
+class BulkResult(_Result):
+    """A class used to represent a change made to many videos at once.
+
+    changed holds the changed videos, missing the ids that do not exist and
+    skipped the ids whose video needed no change.
+    """
+
+    __slots__ = ("changed", "missing", "skipped")
+
+    changed: Tuple[VideoResult, ...]
+    missing: Tuple[str, ...]
+    skipped: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RankedVideo(_Result):
+    """A class used to represent a video in a ranking and its score."""
+
+    __slots__ = ("video", "score")
+
+    video: VideoResult
+    score: float
+
+
+@dataclass(frozen=True)
+class ViewerCount(_Result):
+    """A class used to represent the estimated distinct viewers of a video.
+    """
+
+    __slots__ = ("video", "viewers")
+
+    video: VideoResult
+    viewers: int
+
+
+@dataclass(frozen=True)
+class ErrorResult(_Result):
+    """A class used to represent an operation that could not be done.
+
+    Renders as "Cannot <action>: <reason>". kind is one of NOT_FOUND (the
+    video or playlist does not exist), CONFLICT (the current state forbids
+    it) or INVALID (the request itself is malformed).
+    """
+
+    __slots__ = ("kind", "action", "reason")
+
+    kind: str
+    action: str
+    reason: str
+
+    def __str__(self):
+        return "Cannot " + self.action + ": " + self.reason
@@ -1,21 +1,46 @@
 """A youtube terminal simulator."""
+import os
+import random
+
 from .video_player import VideoPlayer
+from .command_parser import DEFAULT_BUDGETS
 from .command_parser import CommandException
 from .command_parser import CommandParser
+from .session_recorder import RecordingCommandParser
 
 
 if __name__ == "__main__":
     print("""Hello and welcome to YouTube, what would you like to do?
     Enter HELP for list of available commands or EXIT to terminate.""")
-    video_player = VideoPlayer()
-    parser = CommandParser(video_player)
-    while True:
-        command = input("YT> ")
-        if command.upper() == "EXIT":
-            break
-        try:
-            parser.execute_command(command.split())
-        except CommandException as e:
-            print(e)
+    video_player = VideoPlayer(
+        search_engine=os.environ.get("YT_SEARCH_ENGINE", "indexed"))
+    budgets = DEFAULT_BUDGETS
+    if os.environ.get("YT_COMMAND_BUDGET"):
+        # One budget in seconds for every command that has one.
+        budget = float(os.environ["YT_COMMAND_BUDGET"])
+        budgets = dict.fromkeys(DEFAULT_BUDGETS, budget)
+    record_log = os.environ.get("YT_RECORD_LOG")
+    log_file = None
+    if record_log:
+        # The seed is logged so PLAY_RANDOM picks the same videos on replay.
+        seed = int(os.environ.get("YT_RECORD_SEED",
+                                  random.randrange(2 ** 32)))
+        log_file = open(record_log, "a")
+        parser = RecordingCommandParser(video_player, log_file, seed=seed,
+                                        budgets=budgets)
+    else:
+        parser = CommandParser(video_player, budgets)
+    try:
+        while True:
+            command = input("YT> ")
+            if command.upper() == "EXIT":
+                break
+            try:
+                parser.execute_command(command.split())
+            except CommandException as e:
+                print(e)
+    finally:
+        if log_file:
+            log_file.close()
     print("YouTube has now terminated its execution. "
           "Thank you and goodbye!")
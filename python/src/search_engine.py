@@ -0,0 +1,302 @@
+"""Search engines used by the video player to answer search queries."""
+from itertools import islice
+
+from .command_deadline import bounded
+from .trigram_index import TrigramIndex
+from .warm_up import WarmUpScheduler
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the numpy engine needs it.
+    np = None
+
+
+class PythonSearchEngine:
+    """A class used to answer searches with plain Python loops."""
+
+    def __init__(self, video_library):
+        self._video_library = video_library
+
+    def allowed_videos(self):
+        """Returns all videos with no flags, in catalog order."""
+        return self._video_library.get_allowed_videos()
+
+    def videos_by_title(self):
+        """Returns all videos sorted by title, ties in catalog order."""
+        return sorted(self._video_library.get_all_videos(),
+                      key=lambda video: video.title)
+
+    def search_title(self, search_term, start_row=0, limit=None):
+        """Returns allowed videos whose title contains search_term,
+           ignoring case, in catalog order.
+
+        Args:
+            search_term: The term to look for.
+            start_row: Only return videos from this catalog row on.
+            limit: If given, return at most this many videos.
+        """
+        term = search_term.lower()
+        if not start_row and limit is None:
+            return [video for video in bounded(self.allowed_videos())
+                    if term in video.title.lower()]
+
+        # Scan lazily and stop as soon as limit videos are found.
+        flags = self._video_library.get_flag_bitmap()
+        matches = (video for row, video
+                   in bounded(self._video_library.iter_videos(start_row))
+                   if not flags[row] and term in video.title.lower())
+        return list(islice(matches, limit))
+
+    def search_tag(self, video_tag):
+        """Returns allowed videos tagged with video_tag, in catalog order."""
+        return [video for video in bounded(self.allowed_videos())
+                if video_tag in video.tags]
+
+    def search_regex(self, title_pattern, deadline=None):
+        """Returns allowed videos whose title matches a TitlePattern, in
+           catalog order.
+
+        Args:
+            title_pattern: The TitlePattern to search for.
+            deadline: If given, the time.monotonic() time to finish by.
+
+        Raises:
+            TitleSearchTimeout: If the deadline passes first.
+        """
+        return title_pattern.filter(bounded(self.allowed_videos()), deadline)
+
+
+class LibrarySearchEngine(PythonSearchEngine):
+    """A class used to answer searches with the library's own search_titles
+       and search_tag methods, leaving out flagged videos.
+    """
+
+    def search_title(self, search_term, start_row=0, limit=None):
+        """Returns allowed videos whose title contains search_term,
+           ignoring case, in catalog order.
+
+        Args:
+            search_term: The term to look for.
+            start_row: Only return videos from this catalog row on.
+            limit: If given, return at most this many videos.
+        """
+        videos = self._video_library.search_titles(search_term, start_row)
+        return list(islice(
+            (video for video in bounded(videos)
+             if not self._video_library.is_flagged(video.video_id)),
+            limit))
+
+    def search_tag(self, video_tag):
+        """Returns allowed videos tagged with video_tag, in catalog order."""
+        videos = self._video_library.search_tag(video_tag)
+        return [video for video in bounded(videos)
+                if not self._video_library.is_flagged(video.video_id)]
+
+
+class SqliteSearchEngine(LibrarySearchEngine):
+    """A class used to answer searches with the indexes of a
+       SqliteVideoLibrary (FTS5 titles, indexed tags).
+    """
+    pass
+
+
+class ShardedSearchEngine(LibrarySearchEngine):
+    """A class used to answer searches by fanning them out to the worker
+       processes of a ShardedVideoLibrary.
+    """
+
+    def videos_by_title(self):
+        """Returns all videos sorted by title, ties in catalog order."""
+        return self._video_library.get_videos_by_title()
+
+
+class IndexedSearchEngine(PythonSearchEngine):
+    """A class used to answer searches with indexes built in the
+       background.
+
+    A title TrigramIndex, per tag posting lists and the title order are
+    built on a WarmUpScheduler thread, so creating the engine returns at
+    once. Each search uses the plain Python loops until its index is
+    ready and the index from then on; results are the same either way.
+    The catalog must not change after the engine is created, flags may.
+    """
+
+    def __init__(self, video_library):
+        super().__init__(video_library)
+        self._warm_up = WarmUpScheduler([
+            ("videos_by_title",
+             lambda: tuple(PythonSearchEngine.videos_by_title(self))),
+            ("tags", self._build_tag_postings),
+            ("titles", lambda: TrigramIndex(
+                video.title.lower()
+                for video in video_library.get_all_videos())),
+        ])
+        self._warm_up.start()
+
+    @property
+    def warm_up(self) -> WarmUpScheduler:
+        return self._warm_up
+
+    def videos_by_title(self):
+        """Returns all videos sorted by title, ties in catalog order."""
+        videos = self._warm_up.get("videos_by_title")
+        if videos is None:
+            return super().videos_by_title()
+        return list(videos)
+
+    def search_title(self, search_term, start_row=0, limit=None):
+        """Returns allowed videos whose title contains search_term,
+           ignoring case, in catalog order.
+
+        Args:
+            search_term: The term to look for.
+            start_row: Only return videos from this catalog row on.
+            limit: If given, return at most this many videos.
+        """
+        index = self._warm_up.get("titles")
+        if index is None:
+            return super().search_title(search_term, start_row, limit)
+
+        flags = self._video_library.get_flag_bitmap()
+        matches = (self._video_library.get_video_at(row) for row
+                   in bounded(index.search(search_term.lower(), start_row))
+                   if not flags[row])
+        return list(islice(matches, limit))
+
+    def search_tag(self, video_tag):
+        """Returns allowed videos tagged with video_tag, in catalog order."""
+        postings = self._warm_up.get("tags")
+        if postings is None:
+            return super().search_tag(video_tag)
+
+        flags = self._video_library.get_flag_bitmap()
+        return [self._video_library.get_video_at(row)
+                for row in postings.get(video_tag, ()) if not flags[row]]
+
+    def search_regex(self, title_pattern, deadline=None):
+        """Returns allowed videos whose title matches a TitlePattern, in
+           catalog order, only matching the titles that have the trigrams
+           the pattern requires.
+
+        Args:
+            title_pattern: The TitlePattern to search for.
+            deadline: If given, the time.monotonic() time to finish by.
+
+        Raises:
+            TitleSearchTimeout: If the deadline passes first.
+        """
+        index = self._warm_up.get("titles")
+        if index is None or not title_pattern.trigrams:
+            return super().search_regex(title_pattern, deadline)
+
+        flags = self._video_library.get_flag_bitmap()
+        return title_pattern.filter(
+            bounded(self._video_library.get_video_at(row)
+                    for row in index.candidates(title_pattern.trigrams)
+                    if not flags[row]),
+            deadline)
+
+    def _build_tag_postings(self):
+        """Returns the rows of the videos with each tag, by tag."""
+        postings = {}
+        for row, video in enumerate(self._video_library.get_all_videos()):
+            for tag in dict.fromkeys(video.tags):
+                postings.setdefault(tag, []).append(row)
+        return postings
+
+
+class NumpySearchEngine:
+    """A class used to answer searches with vectorized NumPy operations.
+
+    Titles are stored as a NumPy string array, tags as a sparse
+    video x tag boolean matrix in compressed-column form (one sorted row
+    array per tag) and flags as a boolean view over the library's flag
+    bitmap, so flagging or allowing a video needs no re-indexing.
+    """
+
+    def __init__(self, video_library):
+        if np is None:
+            raise ImportError("The numpy search engine requires NumPy.")
+        self._videos = video_library.get_all_videos()
+        self._titles = np.array(
+            [video.title.lower() for video in self._videos], dtype=np.str_)
+        self._flags = np.frombuffer(video_library.get_flag_bitmap(),
+                                    dtype=np.bool_)
+
+        tag_rows = {}
+        for row, video in enumerate(self._videos):
+            for tag in video.tags:
+                tag_rows.setdefault(tag, []).append(row)
+        self._tag_rows = {tag: np.array(rows, dtype=np.intp)
+                          for tag, rows in tag_rows.items()}
+
+    def allowed_videos(self):
+        """Returns all videos with no flags, in catalog order."""
+        return self._select(~self._flags)
+
+    def videos_by_title(self):
+        """Returns all videos sorted by title, ties in catalog order."""
+        return sorted(self._videos, key=lambda video: video.title)
+
+    def search_title(self, search_term, start_row=0, limit=None):
+        """Returns allowed videos whose title contains search_term,
+           ignoring case, in catalog order.
+
+        Args:
+            search_term: The term to look for.
+            start_row: Only return videos from this catalog row on.
+            limit: If given, return at most this many videos.
+        """
+        mask = np.char.find(self._titles[start_row:],
+                            search_term.lower()) >= 0
+        rows = np.flatnonzero(mask & ~self._flags[start_row:])[:limit]
+        return [self._videos[row] for row in rows + start_row]
+
+    def search_tag(self, video_tag):
+        """Returns allowed videos tagged with video_tag, in catalog order."""
+        rows = self._tag_rows.get(video_tag)
+        if rows is None:
+            return []
+        return [self._videos[row] for row in rows[~self._flags[rows]]]
+
+    def search_regex(self, title_pattern, deadline=None):
+        """Returns allowed videos whose title matches a TitlePattern, in
+           catalog order, only matching the titles that have the trigrams
+           the pattern requires.
+
+        Args:
+            title_pattern: The TitlePattern to search for.
+            deadline: If given, the time.monotonic() time to finish by.
+
+        Raises:
+            TitleSearchTimeout: If the deadline passes first.
+        """
+        mask = ~self._flags
+        for trigram in title_pattern.trigrams:
+            mask &= np.char.find(self._titles, trigram) >= 0
+        return title_pattern.filter(bounded(self._select(mask)), deadline)
+
+    def _select(self, mask):
+        """Returns the videos of the rows set in mask, in catalog order."""
+        return [self._videos[row] for row in np.flatnonzero(mask)]
+
+
+SEARCH_ENGINES = {
+    "python": PythonSearchEngine,
+    "indexed": IndexedSearchEngine,
+    "numpy": NumpySearchEngine,
+    "sqlite": SqliteSearchEngine,
+    "sharded": ShardedSearchEngine,
+}
+
+
+def create_search_engine(name, video_library):
+    """Creates the search engine registered under name for a library.
+
+    Raises ValueError if no engine is registered under that name.
+    """
+    try:
+        engine_class = SEARCH_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown search engine: {name}")
+    return engine_class(video_library)
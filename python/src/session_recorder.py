@@ -0,0 +1,63 @@
+"""A command parser class that records sessions for replay."""
+import json
+import time
+import uuid
+
+from .command_parser import CommandParser
+
+
+class RecordingCommandParser(CommandParser):
+    """A class used to parse, execute and record user commands.
+
+    Every command is appended to a JSON lines log together with the time
+    it was issued, the session id and the answers given to the search
+    results prompt while it ran, so the session can be replayed later with
+    src.replay.
+    """
+
+    def __init__(self, video_player, log_file, session_id=None, seed=None,
+                 budgets=None):
+        """RecordingCommandParser constructor.
+
+        Args:
+            video_player: The VideoPlayer commands are executed on.
+            log_file: An open text file the records are appended to.
+            session_id: Identifies the session in the log, random by
+                default.
+            seed: If given, seeds the player's random picks and is
+                logged, so PLAY_RANDOM picks the same videos on replay.
+            budgets: Seconds each command may take by command name, see
+                CommandParser.
+        """
+        super().__init__(video_player, budgets)
+        self._log_file = log_file
+        self._session_id = session_id if session_id else uuid.uuid4().hex
+        self._answers = []
+        video_player._read_choice = self._record_choice
+        if seed is not None:
+            video_player.seed_random(seed)
+            self._write({"session": self._session_id, "seed": seed})
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    def execute_command(self, command):
+        """Executes the user command and records it."""
+        record = {"session": self._session_id, "time": time.time(),
+                  "command": list(command)}
+        self._answers = []
+        try:
+            super().execute_command(command)
+        finally:
+            record["answers"] = self._answers
+            self._write(record)
+
+    def _record_choice(self):
+        answer = input()
+        self._answers.append(answer)
+        return answer
+
+    def _write(self, record):
+        self._log_file.write(json.dumps(record) + "\n")
+        self._log_file.flush()
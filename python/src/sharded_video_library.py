@@ -0,0 +1,141 @@
+"""A video library class that searches its catalog in worker processes."""
+import bisect
+import heapq
+import multiprocessing
+import threading
+import zlib
+
+from .video_library import VideoLibrary
+
+
+def shard_of(video_id, shards):
+    """Returns the shard owning a video, by a stable hash of its id."""
+    return zlib.crc32(video_id.encode()) % shards
+
+
+def _serve_shard(connection, rows, titles, tags):
+    """Answers the parent's requests for one shard until it hangs up.
+
+    Every answer is a list of catalog rows: ascending for searches and in
+    (title, row) order for "by_title". A None request stops the shard.
+    """
+    lowered = [title.lower() for title in titles]
+    by_title = [row for _, row in sorted(zip(titles, rows))]
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        operation, argument = request
+        if operation == "title":
+            term, start_row = argument
+            start = bisect.bisect_left(rows, start_row)
+            connection.send([row for row, title
+                             in zip(rows[start:], lowered[start:])
+                             if term in title])
+        elif operation == "tag":
+            connection.send([row for row, video_tags in zip(rows, tags)
+                             if argument in video_tags])
+        else:
+            connection.send(by_title)
+    connection.close()
+
+
+class ShardedVideoLibrary(VideoLibrary):
+    """A class used to represent a Video Library searched by worker
+       processes.
+
+    Videos are partitioned across shards by a hash of their id, and every
+    shard is served by its own process holding the titles and tags of its
+    videos. Searches are sent to all shards at once and their sorted
+    answers merged, so results keep the catalog (or title) order of an
+    unsharded library.
+
+    The parent keeps the whole catalog and the flags, as VideoLibrary
+    does: get_video and the flag checks stay local dictionary lookups,
+    which are much cheaper than a round trip to a worker.
+    """
+
+    def __init__(self, video_file_path=None, shards=None):
+        """ShardedVideoLibrary constructor.
+
+        Args:
+            video_file_path: The videos file to load, the bundled
+                videos.txt by default.
+            shards: The number of worker processes, one per CPU by
+                default.
+        """
+        super().__init__(video_file_path)
+        if shards is None:
+            shards = multiprocessing.cpu_count()
+
+        partitions = [([], [], []) for _ in range(shards)]
+        for row, video in enumerate(self._videos_by_row):
+            rows, titles, tags = partitions[shard_of(video.video_id, shards)]
+            rows.append(row)
+            titles.append(video.title)
+            tags.append(video.tags)
+
+        self._connections = []
+        self._workers = []
+        for partition in partitions:
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_serve_shard, args=(worker_connection, *partition),
+                daemon=True)
+            worker.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._workers.append(worker)
+        # One request at a time goes through the pipes.
+        self._lock = threading.Lock()
+
+    @property
+    def shards(self) -> int:
+        """Returns the number of shards."""
+        return len(self._workers)
+
+    def close(self):
+        """Stops the worker processes."""
+        for connection in self._connections:
+            # Forked workers hold copies of the other pipe ends, so closing
+            # ours would not be noticed; ask them to stop instead.
+            connection.send(None)
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search_titles(self, search_term, start_row=0):
+        """Returns all videos from start_row on whose title contains
+           search_term, ignoring case, in catalog order.
+        """
+        rows = heapq.merge(*self._scatter(
+            "title", (search_term.lower(), start_row)))
+        return [self._videos_by_row[row] for row in rows]
+
+    def search_tag(self, video_tag):
+        """Returns all videos tagged with video_tag, in catalog order."""
+        rows = heapq.merge(*self._scatter("tag", video_tag))
+        return [self._videos_by_row[row] for row in rows]
+
+    def get_videos_by_title(self):
+        """Returns all videos sorted by title, ties in catalog order."""
+        videos = self._videos_by_row
+        rows = heapq.merge(*self._scatter("by_title", None),
+                           key=lambda row: (videos[row].title, row))
+        return [videos[row] for row in rows]
+
+    def _scatter(self, operation, argument):
+        """Sends a request to every shard and returns their answers."""
+        with self._lock:
+            for connection in self._connections:
+                connection.send((operation, argument))
+            return [connection.recv() for connection in self._connections]
@@ -0,0 +1,217 @@
+"""A video library class backed by shared memory."""
+import struct
+import weakref
+from multiprocessing import shared_memory
+
+from .video import Video
+from .video_library import VideoLibrary
+
+# The block starts with a magic string, the number of videos and the byte
+# offsets of its sections. Every section is 8-byte aligned.
+_MAGIC = b"YTLIB001"
+_HEADER = struct.Struct("<8sQ7Q")
+_SECTIONS = ("id_offsets", "ids", "title_offsets", "titles",
+             "tag_offsets", "tags", "id_order")
+
+
+def _align(size):
+    return (size + 7) & ~7
+
+
+def _encode_column(values):
+    """Returns the end offset of every value and the concatenated values."""
+    offsets = [0]
+    blob = bytearray()
+    for value in values:
+        blob += value.encode()
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+class SharedVideoLibrary(VideoLibrary):
+    """A class used to represent a Video Library in shared memory.
+
+    One process creates the library, which copies the catalog into a
+    shared memory block as columns: ids, titles and comma-joined tags, each
+    stored as one UTF-8 blob plus an offsets array, and the rows sorted by
+    id for binary search. Worker processes attach to the block by name
+    and read it in place, so the catalog exists once however many workers
+    there are and attaching costs no parsing.
+
+    Flags are not shared: each process keeps its own flag bitmap, exactly
+    like VideoLibrary. Video objects are built on demand and cached weakly,
+    so callers holding a video see the flags set later on.
+    """
+
+    def __init__(self, block, owner=False):
+        """SharedVideoLibrary constructor, use create() or attach().
+
+        Args:
+            block: The SharedMemory block holding the catalog.
+            owner: Whether this library created the block and should
+                unlink it when closed.
+        """
+        self._block = block
+        self._owner = owner
+        self._buffer = buffer = block.buf.toreadonly()
+        magic, self._count, *offsets = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a video library block: {block.name}")
+
+        ends = offsets[1:] + [offsets[-1] + 8 * self._count]
+        views = {name: buffer[start:end]
+                 for name, start, end in zip(_SECTIONS, offsets, ends)}
+        for name in ("id_offsets", "title_offsets", "tag_offsets"):
+            views[name] = views[name][:8 * (self._count + 1)].cast("Q")
+        views["id_order"] = views["id_order"].cast("Q")
+        self._id_offsets = views["id_offsets"]
+        self._ids = views["ids"]
+        self._title_offsets = views["title_offsets"]
+        self._titles = views["titles"]
+        self._tag_offsets = views["tag_offsets"]
+        self._tags = views["tags"]
+        self._id_order = views["id_order"]
+
+        self._materialized = weakref.WeakValueDictionary()
+        self._flags = bytearray(self._count)
+        self._flag_reasons = {}
+
+    @classmethod
+    def create(cls, video_library=None, name=None):
+        """Copies a library into a new shared memory block.
+
+        Args:
+            video_library: The library to share, a VideoLibrary loaded from
+                videos.txt by default.
+            name: Optional name of the block, chosen by the OS if not given.
+
+        Returns:
+            A SharedVideoLibrary owning the block. Workers can attach to it
+            using its name.
+        """
+        if video_library is None:
+            video_library = VideoLibrary()
+        videos = video_library.get_all_videos()
+        ids = [video.video_id for video in videos]
+        columns = [
+            _encode_column(ids),
+            _encode_column(video.title for video in videos),
+            _encode_column(",".join(video.tags) for video in videos),
+        ]
+        id_order = sorted(range(len(ids)), key=lambda row: ids[row].encode())
+
+        sections = []
+        for offsets, blob in columns:
+            sections.append(struct.pack(f"<{len(offsets)}Q", *offsets))
+            sections.append(blob)
+        sections.append(struct.pack(f"<{len(id_order)}Q", *id_order))
+
+        offsets = []
+        size = _align(_HEADER.size)
+        for section in sections:
+            offsets.append(size)
+            size += _align(len(section))
+
+        block = shared_memory.SharedMemory(name=name, create=True,
+                                           size=max(size, 1))
+        _HEADER.pack_into(block.buf, 0, _MAGIC, len(videos), *offsets)
+        for offset, section in zip(offsets, sections):
+            block.buf[offset:offset + len(section)] = section
+        return cls(block, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attaches to a library created by another process.
+
+        Args:
+            name: The name of the shared memory block.
+        """
+        try:
+            # Python 3.13+, keep the resource tracker from unlinking the
+            # creator's block when this worker exits.
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=name)
+        return cls(block)
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the shared memory block."""
+        return self._block.name
+
+    def close(self):
+        """Detaches from the block, unlinking it if this library created
+           it. Videos already handed out stay valid.
+        """
+        for view in (self._id_offsets, self._ids, self._title_offsets,
+                     self._titles, self._tag_offsets, self._tags,
+                     self._id_order, self._buffer):
+            view.release()
+        self._block.close()
+        if self._owner:
+            self._block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_all_videos(self):
+        """Returns all available video information from the video library."""
+        return [self.get_video_at(row) for row in range(self._count)]
+
+    def iter_videos(self, start_row=0):
+        """Yields (row, video) for the videos from start_row on, in
+           catalog order.
+        """
+        for row in range(start_row, self._count):
+            yield row, self.get_video_at(row)
+
+    def get_video(self, video_id):
+        """Returns the video object (title, url, tags) from the video library.
+
+        Args:
+            video_id: The video url.
+
+        Returns:
+            The Video object for the requested video_id. None if the video
+            does not exist.
+        """
+        row = self._lookup_row(video_id)
+        return None if row is None else self.get_video_at(row)
+
+    def _find_row(self, video_id):
+        """Returns the catalog row of a video, or None if it does not
+           exist.
+        """
+        key = video_id.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            row = self._id_order[middle]
+            if self._read(self._ids, self._id_offsets, row) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            row = self._id_order[low]
+            if self._read(self._ids, self._id_offsets, row) == key:
+                return row
+        return None
+
+    def get_video_at(self, row):
+        """Returns the Video of a catalog row, building it if needed."""
+        return self._cached_video(row, self._load_video)
+
+    def _load_video(self, row):
+        tags = self._read(self._tags, self._tag_offsets, row).decode()
+        return Video(
+            self._read(self._titles, self._title_offsets, row).decode(),
+            self._read(self._ids, self._id_offsets, row).decode(),
+            tags.split(",") if tags else [],
+        )
+
+    @staticmethod
+    def _read(blob, offsets, row):
+        return bytes(blob[offsets[row]:offsets[row + 1]])
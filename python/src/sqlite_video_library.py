@@ -0,0 +1,281 @@
+"""Video library and playlist storage classes backed by SQLite."""
+import sqlite3
+import weakref
+
+from .command_deadline import bounded
+from .video import Video
+from .video_library import VideoLibrary
+from .video_library import read_videos
+from .video_playlist import Playlist
+
+# Statements are kept as constants so that sqlite3's statement cache
+# prepares each of them once per connection and reuses it afterwards.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    row INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS video_tags (
+    row INTEGER NOT NULL REFERENCES videos(row),
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (row, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS video_tags_by_tag ON video_tags (tag, row);
+CREATE VIRTUAL TABLE IF NOT EXISTS video_titles USING fts5(
+    title, content='videos', content_rowid='row', tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS playlists (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS playlist_videos (
+    key TEXT NOT NULL REFERENCES playlists(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    video_id TEXT NOT NULL,
+    PRIMARY KEY (key, position)
+) WITHOUT ROWID;
+"""
+_COUNT_VIDEOS = "SELECT count(*) FROM videos"
+_INSERT_VIDEO = "INSERT INTO videos (row, video_id, title) VALUES (?, ?, ?)"
+_INSERT_TAG = "INSERT INTO video_tags (row, position, tag) VALUES (?, ?, ?)"
+_REBUILD_TITLES = "INSERT INTO video_titles (video_titles) VALUES ('rebuild')"
+_SELECT_ROW = "SELECT row FROM videos WHERE video_id = ?"
+_SELECT_VIDEO = "SELECT video_id, title FROM videos WHERE row = ?"
+_SELECT_TAGS = "SELECT tag FROM video_tags WHERE row = ? ORDER BY position"
+_SELECT_ROWS = "SELECT row FROM videos ORDER BY row"
+_SELECT_VIDEO_IDS = "SELECT video_id FROM videos"
+_SELECT_ROWS_FROM = "SELECT row FROM videos WHERE row >= ? ORDER BY row"
+_SELECT_TITLES_FROM = ("SELECT row, title FROM videos WHERE row >= ? "
+                       "ORDER BY row")
+_MATCH_TITLE_FROM = ("SELECT rowid, title FROM video_titles "
+                     "WHERE video_titles MATCH ? AND rowid >= ? "
+                     "ORDER BY rowid")
+_SELECT_TAGGED = "SELECT row FROM video_tags WHERE tag = ? ORDER BY row"
+_SELECT_PLAYLISTS = "SELECT key, name FROM playlists"
+_SELECT_PLAYLIST_VIDEOS = ("SELECT video_id FROM playlist_videos "
+                           "WHERE key = ? ORDER BY position")
+_INSERT_PLAYLIST = "INSERT INTO playlists (key, name) VALUES (?, ?)"
+_DELETE_PLAYLIST = "DELETE FROM playlists WHERE key = ?"
+_INSERT_PLAYLIST_VIDEO = ("INSERT INTO playlist_videos (key, position, "
+                          "video_id) VALUES (?, ?, ?)")
+_DELETE_PLAYLIST_VIDEOS = "DELETE FROM playlist_videos WHERE key = ?"
+
+
+def connect(database=":memory:"):
+    """Opens a connection to a video database, creating its tables.
+
+    The connection may be used from several threads, as the
+    AsyncCommandExecutor does for read-only commands; SQLite serializes
+    access to it, and mutating commands never run alongside other
+    commands.
+
+    Args:
+        database: Path of the SQLite database file, in memory by default.
+    """
+    connection = sqlite3.connect(database, check_same_thread=False)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+class SqliteVideoLibrary(VideoLibrary):
+    """A class used to represent a Video Library stored in SQLite.
+
+    Videos live in the database and are only built when asked for, so the
+    catalog does not need to fit in memory; only the flag bitmap does.
+    Video ids and tags are indexed, titles are indexed for substring search
+    in an FTS5 trigram table. An empty database is filled from a videos
+    file on first use. Ids are checked against a Bloom filter in memory
+    first, so looking up ids that do not exist rarely costs a query.
+    """
+
+    def __init__(self, connection=None, video_file_path=None,
+                 id_filter_rate=0.01):
+        """SqliteVideoLibrary constructor.
+
+        Args:
+            connection: A connection from connect(), a new in memory
+                database by default.
+            video_file_path: The videos file imported when the database
+                is empty, the bundled videos.txt by default.
+            id_filter_rate: The false positive rate of the Bloom filter
+                of video ids, or None for no filter.
+        """
+        self._connection = connection if connection else connect()
+        count, = self._connection.execute(_COUNT_VIDEOS).fetchone()
+        if not count:
+            count = self.import_videos(video_file_path)
+
+        self._materialized = weakref.WeakValueDictionary()
+        self._flags = bytearray(count)
+        self._flag_reasons = {}
+        if id_filter_rate is not None:
+            self._build_id_filter(
+                (video_id for video_id, in self._connection.execute(
+                    _SELECT_VIDEO_IDS)),
+                count, id_filter_rate)
+
+    def import_videos(self, video_file_path=None):
+        """Imports a videos file into the database in a single transaction.
+
+        Like VideoLibrary, a later line with the same id replaces the
+        earlier one in its place.
+
+        Returns:
+            The number of videos imported.
+        """
+        videos = list({video_id: (title, video_id, tags)
+                       for title, video_id, tags
+                       in read_videos(video_file_path)}.values())
+        with self._connection:
+            self._connection.executemany(
+                _INSERT_VIDEO,
+                ((row, video_id, title)
+                 for row, (title, video_id, _) in enumerate(videos)))
+            self._connection.executemany(
+                _INSERT_TAG,
+                ((row, position, tag)
+                 for row, (_, _, tags) in enumerate(videos)
+                 for position, tag in enumerate(tags)))
+            self._connection.execute(_REBUILD_TITLES)
+        if self._id_filter is not None:
+            for _, video_id, _ in videos:
+                self._id_filter.add(video_id)
+        return len(videos)
+
+    def get_all_videos(self):
+        """Returns all available video information from the video library."""
+        return [self.get_video_at(row)
+                for row, in self._connection.execute(_SELECT_ROWS)]
+
+    def get_video(self, video_id):
+        """Returns the video object (title, url, tags) from the video library.
+
+        Args:
+            video_id: The video url.
+
+        Returns:
+            The Video object for the requested video_id. None if the video
+            does not exist.
+        """
+        row = self._lookup_row(video_id)
+        return None if row is None else self.get_video_at(row)
+
+    def iter_videos(self, start_row=0):
+        """Yields (row, video) for the videos from start_row on, in
+           catalog order.
+        """
+        rows = self._connection.execute(_SELECT_ROWS_FROM, (start_row,))
+        for row, in rows:
+            yield row, self.get_video_at(row)
+
+    def search_titles(self, search_term, start_row=0):
+        """Returns all videos from start_row on whose title contains
+           search_term, ignoring case, in catalog order.
+        """
+        term = search_term.lower()
+        if len(term) >= 3:
+            # Trigram phrase queries match substrings of 3+ characters.
+            query = '"' + term.replace('"', '""') + '"'
+            titles = self._connection.execute(_MATCH_TITLE_FROM,
+                                              (query, start_row))
+        else:
+            titles = self._connection.execute(_SELECT_TITLES_FROM,
+                                              (start_row,))
+        return [self.get_video_at(row) for row, title in bounded(titles)
+                if term in title.lower()]
+
+    def search_tag(self, video_tag):
+        """Returns all videos tagged with video_tag, in catalog order."""
+        rows = self._connection.execute(_SELECT_TAGGED, (video_tag,))
+        return [self.get_video_at(row) for row, in bounded(rows)]
+
+    def _find_row(self, video_id):
+        """Returns the catalog row of a video, or None if it does not
+           exist.
+        """
+        found = self._connection.execute(_SELECT_ROW, (video_id,)).fetchone()
+        return found[0] if found else None
+
+    def get_video_at(self, row):
+        """Returns the Video of a catalog row, loading it if needed."""
+        return self._cached_video(row, self._load_video)
+
+    def _load_video(self, row):
+        video_id, title = self._connection.execute(
+            _SELECT_VIDEO, (row,)).fetchone()
+        tags = [tag for tag, in self._connection.execute(_SELECT_TAGS, (row,))]
+        return Video(title, video_id, tags)
+
+
+class SqlitePlaylist(Playlist):
+    """A class used to represent a Playlist stored in SQLite.
+
+    Changes are written through to the database as they are made.
+    """
+
+    def __init__(self, connection, key, name, video_ids=()):
+        """SqlitePlaylist constructor."""
+        super().__init__(name, video_ids)
+        self._connection = connection
+        self._key = key
+
+    def add_video(self, video_id: str):
+        with self._connection:
+            self._connection.execute(
+                _INSERT_PLAYLIST_VIDEO,
+                (self._key, len(self._video_ids), video_id))
+        super().add_video(video_id)
+
+    def remove_video(self, video_id: str):
+        super().remove_video(video_id)
+        self._save_videos()
+
+    def clear_videos(self):
+        super().clear_videos()
+        self._save_videos()
+
+    def _save_videos(self):
+        with self._connection:
+            self._connection.execute(_DELETE_PLAYLIST_VIDEOS, (self._key,))
+            self._connection.executemany(
+                _INSERT_PLAYLIST_VIDEO,
+                ((self._key, position, video_id)
+                 for position, video_id in enumerate(self._video_ids)))
+
+
+class SqlitePlaylistStore:
+    """A class used to keep playlists in SQLite across runs."""
+
+    def __init__(self, connection=None):
+        """SqlitePlaylistStore constructor.
+
+        Args:
+            connection: A connection from connect(), a new in memory
+                database by default.
+        """
+        self._connection = connection if connection else connect()
+
+    def load(self):
+        """Returns all stored playlists, keyed by playlist_key(name)."""
+        return {
+            key: SqlitePlaylist(
+                self._connection, key, name,
+                (video_id for video_id, in self._connection.execute(
+                    _SELECT_PLAYLIST_VIDEOS, (key,))))
+            for key, name in self._connection.execute(
+                _SELECT_PLAYLISTS).fetchall()
+        }
+
+    def create(self, key, name):
+        """Stores a new, empty playlist and returns it."""
+        with self._connection:
+            self._connection.execute(_INSERT_PLAYLIST, (key, name))
+        return SqlitePlaylist(self._connection, key, name)
+
+    def delete(self, key):
+        """Deletes a stored playlist and its videos."""
+        with self._connection:
+            self._connection.execute(_DELETE_PLAYLIST, (key,))
@@ -0,0 +1,83 @@
+"""A minimal perfect hash index of ids."""
+from array import array
+
+
+class StaticIdIndex:
+    """A class used to find the row of an id among a fixed set of ids.
+
+    The ids are hashed into as many buckets as there are ids with a
+    minimal perfect hash in the hash-and-displace (CHD) style: buckets are
+    placed largest first, each getting the first seed that hashes all of
+    its ids to distinct free slots, and buckets of one id are pointed
+    straight at a remaining free slot. A lookup is one bucket hash and one
+    slot hash. Per id this takes a 4 byte seed and a 4 byte row instead of
+    a dict entry, plus a reference in the caller's id sequence, which is
+    kept to verify lookups since ids outside the set hash to some slot too.
+
+    Hashes come from hash(), so an index is only valid in the process that
+    built it.
+    """
+
+    def __init__(self, ids):
+        """StaticIdIndex constructor.
+
+        Args:
+            ids: The distinct ids, in row order. The sequence is kept to
+                check looked up ids against.
+
+        Raises:
+            ValueError: If an id is repeated.
+        """
+        self._ids = ids
+        size = len(ids)
+        buckets = {}
+        for row, video_id in enumerate(ids):
+            buckets.setdefault(hash(video_id) % max(size, 1), []).append(row)
+
+        # Seeds by bucket: 0 for an empty bucket, a positive seed to hash
+        # its ids with, or -(slot + 1) for a bucket of one id.
+        self._seeds = array("i", bytes(4 * size))
+        self._rows = array("I", bytes(4 * size))
+        taken = bytearray(size)
+        singles = []
+        for bucket, rows in sorted(buckets.items(),
+                                   key=lambda item: -len(item[1])):
+            if len(rows) == 1:
+                singles.append((bucket, rows[0]))
+                continue
+            if len({ids[row] for row in rows}) < len(rows):
+                raise ValueError(f"Duplicate id: {ids[rows[0]]}")
+            seed = 1
+            while True:
+                slots = {hash((seed, ids[row])) % size for row in rows}
+                if (len(slots) == len(rows)
+                        and not any(taken[slot] for slot in slots)):
+                    break
+                seed += 1
+            self._seeds[bucket] = seed
+            for row in rows:
+                slot = hash((seed, ids[row])) % size
+                taken[slot] = 1
+                self._rows[slot] = row
+
+        free_slots = (slot for slot in range(size) if not taken[slot])
+        for (bucket, row), slot in zip(singles, free_slots):
+            self._seeds[bucket] = -(slot + 1)
+            self._rows[slot] = row
+
+    def __len__(self):
+        return len(self._seeds)
+
+    def find(self, video_id):
+        """Returns the row of an id, or None if it is not in the index."""
+        if not self._seeds:
+            return None
+        seed = self._seeds[hash(video_id) % len(self._seeds)]
+        if seed == 0:
+            return None
+        if seed > 0:
+            slot = hash((seed, video_id)) % len(self._seeds)
+        else:
+            slot = -seed - 1
+        row = self._rows[slot]
+        return row if self._ids[row] == video_id else None
@@ -0,0 +1,220 @@
+"""Regular expressions matched against video titles."""
+import re
+import time
+
+from .trigram_index import trigrams
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+# Pattern characters that only match themselves and their upper case when
+# ignoring case, so trigrams of them can be looked up in lower case titles.
+# "i" and "s" also match "ı" and "ſ", which lower() keeps as they are.
+_PLAIN_CHARACTERS = frozenset(
+    chr(code) for code in range(32, 127)) - set("iIsS")
+
+# How many titles are matched between two looks at the clock.
+_DEADLINE_STRIDE = 64
+
+
+class TitlePatternError(Exception):
+    """A class used to represent a title pattern that cannot be used."""
+    pass
+
+
+class TitleSearchTimeout(Exception):
+    """A class used to represent a title search that ran out of time."""
+    pass
+
+
+class TitlePattern:
+    """A class used to represent a regular expression searched for in
+       video titles, ignoring case.
+
+    The trigrams every matching title must contain are read off the parsed
+    pattern, from its literal runs outside of optional parts, alternatives
+    and lookarounds, so that an index can pick the candidate titles. A
+    match itself cannot be interrupted, so patterns that repeat a variable
+    repeat, like (a+)+, which can backtrack for exponential time even on
+    short titles, are rejected up front, and so are patterns that repeat
+    alternatives which can start with the same character, like (a|a)+ or
+    (a|ab)+, for the same reason.
+    """
+
+    def __init__(self, pattern):
+        """TitlePattern constructor.
+
+        Raises:
+            TitlePatternError: If the pattern is not a valid regular
+                expression, has nested repeats or repeats overlapping
+                alternatives.
+        """
+        try:
+            self._regex = re.compile(pattern, re.IGNORECASE)
+            parsed = sre_parse.parse(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise TitlePatternError(f"Invalid pattern: {e}")
+        problem = _exponential_part(parsed, False)
+        if problem:
+            raise TitlePatternError(f"Pattern repeats {problem}, which can "
+                                    "take exponential time")
+        self._pattern = pattern
+        self._trigrams = frozenset(
+            trigram for literal in _required_literals(parsed)
+            for trigram in trigrams(literal.lower())
+            if _PLAIN_CHARACTERS.issuperset(trigram))
+
+    @property
+    def pattern(self) -> str:
+        return self._pattern
+
+    @property
+    def trigrams(self) -> frozenset:
+        """Returns lower case trigrams every matching title contains."""
+        return self._trigrams
+
+    def matches(self, title):
+        """Returns whether the pattern is found in a title."""
+        return self._regex.search(title) is not None
+
+    def filter(self, videos, deadline=None):
+        """Returns the videos whose title the pattern is found in.
+
+        Args:
+            videos: An iterable of videos.
+            deadline: If given, the time.monotonic() time to finish by.
+
+        Raises:
+            TitleSearchTimeout: If the deadline passes first.
+        """
+        search = self._regex.search
+        matches = []
+        for count, video in enumerate(videos, 1):
+            if search(video.title):
+                matches.append(video)
+            if (deadline is not None and not count % _DEADLINE_STRIDE
+                    and time.monotonic() > deadline):
+                raise TitleSearchTimeout()
+        return matches
+
+
+def _required_literals(parsed):
+    """Returns strings that every match of a parsed pattern contains."""
+    literals = []
+    run = []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is sre_parse.AT:
+            # Anchors match no characters, the run goes on around them.
+            continue
+        if run:
+            literals.append("".join(run))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            literals.extend(_required_literals(av[-1]))
+        elif op in _REPEATS and av[0] >= 1:
+            literals.extend(_required_literals(av[2]))
+    if run:
+        literals.append("".join(run))
+    return literals
+
+
+def _exponential_part(parsed, in_repeat):
+    """Returns what makes matching a parsed pattern take exponential time,
+       a repeat or overlapping alternatives inside a variable repeat, or
+       None.
+    """
+    for op, av in parsed:
+        problem = None
+        if op in _REPEATS:
+            variable = av[0] != av[1]
+            if variable and in_repeat:
+                return "a repeat"
+            problem = _exponential_part(av[2], in_repeat or variable)
+        elif op is sre_parse.SUBPATTERN:
+            problem = _exponential_part(av[-1], in_repeat)
+        elif op is sre_parse.BRANCH:
+            if in_repeat and _branches_overlap(av[1]):
+                return "overlapping alternatives"
+            for branch in av[1]:
+                problem = problem or _exponential_part(branch, in_repeat)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            problem = _exponential_part(av[1], in_repeat)
+        if problem:
+            return problem
+    return None
+
+
+def _branches_overlap(branches):
+    """Returns whether two alternatives might match the same text.
+
+    Alternatives overlap unless the characters they can start with are
+    known and disjoint. An alternative that can match nothing overlaps
+    with every other, since what it starts with depends on what follows.
+    """
+    seen = set()
+    for branch in branches:
+        characters, empty = _first_characters(branch)
+        if characters is None or empty or not seen.isdisjoint(characters):
+            return True
+        seen |= characters
+    return False
+
+
+def _first_characters(parsed):
+    """Returns the lower case characters a match of a parsed pattern can
+       start with, or None if they are not known, and whether it can
+       match nothing.
+    """
+    characters = set()
+    for op, av in parsed:
+        if op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # Matches no characters, the match starts with what follows.
+            continue
+        if op is sre_parse.LITERAL:
+            first, empty = {chr(av).lower()}, False
+        elif op is sre_parse.IN:
+            first, empty = _set_characters(av), False
+        elif op is sre_parse.SUBPATTERN:
+            first, empty = _first_characters(av[-1])
+        elif op in _REPEATS:
+            first, empty = _first_characters(av[2])
+            empty = empty or av[0] == 0
+        elif op is sre_parse.BRANCH:
+            first, empty = set(), False
+            for branch in av[1]:
+                branch_first, branch_empty = _first_characters(branch)
+                if branch_first is None:
+                    return None, True
+                first |= branch_first
+                empty = empty or branch_empty
+        else:
+            return None, True
+        if first is None:
+            return None, True
+        characters |= first
+        if not empty:
+            return characters, False
+    return characters, True
+
+
+def _set_characters(items):
+    """Returns the lower case characters a parsed [...] set matches, or
+       None if they are not known or too many to list.
+    """
+    characters = set()
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            characters.add(chr(av).lower())
+        elif op is sre_parse.RANGE and av[1] - av[0] < 256:
+            characters.update(chr(code).lower()
+                              for code in range(av[0], av[1] + 1))
+        else:
+            return None
+    return characters
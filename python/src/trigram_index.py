@@ -0,0 +1,72 @@
+"""A trigram index of titles."""
+from array import array
+from bisect import bisect_left
+
+
+class TrigramIndex:
+    """A class used to find the titles containing a substring.
+
+    Every three character substring (trigram) of a title maps to the sorted
+    rows of the titles containing it. A title can only contain a term if it
+    contains every trigram of the term, so the candidates are the rows in
+    all of their posting lists, read off the shortest one and checked
+    against the others by binary search. Candidates are then checked for
+    the term itself. Terms shorter than a trigram check every title.
+    """
+
+    def __init__(self, titles):
+        """TrigramIndex constructor.
+
+        Args:
+            titles: The titles in row order, lower case.
+        """
+        self._titles = list(titles)
+        self._postings = {}
+        for row, title in enumerate(self._titles):
+            for trigram in set(trigrams(title)):
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    postings = self._postings[trigram] = array("I")
+                postings.append(row)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def title_at(self, row):
+        """Returns the title of a row."""
+        return self._titles[row]
+
+    def search(self, term, start_row=0):
+        """Yields the rows from start_row on whose title contains term, in
+           row order.
+        """
+        term_trigrams = set(trigrams(term))
+        if term_trigrams:
+            rows = self.candidates(term_trigrams, start_row)
+        else:
+            rows = range(start_row, len(self._titles))
+        titles = self._titles
+        return (row for row in rows if term in titles[row])
+
+    def candidates(self, trigrams, start_row=0):
+        """Returns the rows from start_row on whose title contains every
+           trigram, in row order.
+        """
+        postings = sorted((self._postings.get(trigram, ())
+                           for trigram in trigrams), key=len)
+        shortest = postings[0]
+        rows = shortest[bisect_left(shortest, start_row):]
+        for others in postings[1:]:
+            rows = [row for row in rows if _contains(others, row)]
+        return rows
+
+
+def trigrams(text):
+    """Yields the three character substrings of text."""
+    return (text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _contains(rows, row):
+    """Returns whether the sorted rows contain row."""
+    position = bisect_left(rows, row)
+    return position < len(rows) and rows[position] == row
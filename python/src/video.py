@@ -2,6 +2,8 @@
 
 from typing import Sequence
 
+from .results import VideoResult
+
 
 class Video:
     """A class used to represent a Video."""
@@ -12,6 +14,9 @@ class Video:
         self._video_id = video_id
         self._flag_reason = ""
         self._flagged = False
+        # The VideoResult snapshot, built on first use and cleared whenever
+        # the flag changes. It also memoizes str(video).
+        self._result = None
 
         # Turn the tags into a tuple here so it's unmodifiable,
         # in case the caller changes the 'video_tags' they passed to us
@@ -46,20 +51,24 @@ class Video:
         """Flag the video with an optional reason."""
         self._flagged = True
         self._flag_reason = flag_reason
+        self._result = None
 
     def allow(self):
         """ Remove the flag from the video."""
         self._flagged = False
         self._flag_reason = ""
+        self._result = None
 
     def pretty_flag_reason(self):
         return "(reason: " + self.flag_reason + ")"
 
-    def __str__(self):
-        tags = ' '.join(self.tags)
-        out = self.title + " (" + self.video_id + ") [" + tags + "]"
-
-        if self._flagged:
-            out += " - FLAGGED " + self.pretty_flag_reason()
+    def to_result(self) -> VideoResult:
+        """Returns a VideoResult snapshot of the video."""
+        if self._result is None:
+            self._result = VideoResult(self._video_id, self._title,
+                                       self._tags, self._flagged,
+                                       self._flag_reason)
+        return self._result
 
-        return out
+    def __str__(self):
+        return str(self.to_result())
@@ -1,6 +1,9 @@
 """A video library class."""
 
+from .bloom_filter import BloomFilter
+from .static_id_index import StaticIdIndex
 from .video import Video
+from itertools import islice
 from pathlib import Path
 import csv
 
@@ -11,26 +14,75 @@ def _csv_reader_with_strip(reader):
     yield from ((item.strip() for item in line) for line in reader)
 
 
+def read_videos(video_file_path=None):
+    """Yields (title, video_id, tags) for every video in a videos file.
+
+    Args:
+        video_file_path: The "title | video_id | tag, tag" file to read,
+            the bundled videos.txt by default.
+    """
+    if video_file_path is None:
+        video_file_path = Path(__file__).parent / "videos.txt"
+    with open(video_file_path) as video_file:
+        reader = _csv_reader_with_strip(
+            csv.reader(video_file, delimiter="|"))
+        for video_info in reader:
+            title, url, tags = video_info
+            yield (
+                title,
+                url,
+                [tag.strip() for tag in tags.split(",")] if tags else [],
+            )
+
+
 class VideoLibrary:
     """A class used to represent a Video Library."""
 
-    def __init__(self):
-        """The VideoLibrary class is initialized."""
-        self._videos = {}
-        with open(Path(__file__).parent / "videos.txt") as video_file:
-            reader = _csv_reader_with_strip(
-                csv.reader(video_file, delimiter="|"))
-            for video_info in reader:
-                title, url, tags = video_info
-                self._videos[url] = Video(
-                    title,
-                    url,
-                    [tag.strip() for tag in tags.split(",")] if tags else [],
-                )
+    # Incremented whenever a flag changes, so callers can tell whether
+    # anything they computed from the library is still current.
+    _generation = 0
+
+    # Set by _build_id_filter for libraries that check ids against a Bloom
+    # filter before looking them up, with counts of what it decided.
+    _id_filter = None
+    _filter_rejected = 0
+    _filter_passed = 0
+    _filter_false_positives = 0
+
+    def __init__(self, video_file_path=None, id_filter_rate=None):
+        """The VideoLibrary class is initialized.
+
+        Args:
+            video_file_path: The videos file to load, the bundled
+                videos.txt by default.
+            id_filter_rate: If given, ids are checked against a Bloom
+                filter with this false positive rate before being looked
+                up. Lookups in memory are cheaper than the filter, so
+                there is none by default.
+        """
+        # Later lines replace earlier ones with the same id, in place.
+        videos = {}
+        for title, url, tags in read_videos(video_file_path):
+            videos[url] = Video(title, url, tags)
+        self._videos_by_row = list(videos.values())
+        # The catalog never changes, so ids are looked up with a minimal
+        # perfect hash instead of keeping the dict around.
+        self._id_index = StaticIdIndex(list(videos))
+        del videos
+        if id_filter_rate is not None:
+            self._build_id_filter(
+                (video.video_id for video in self._videos_by_row),
+                len(self._videos_by_row), id_filter_rate)
+
+        # Flags are kept as a column, one byte per video in catalog order,
+        # so filtering to the allowed set is a single pass over the bitmap.
+        # Reasons are only stored for the (few) flagged videos.
+        self._flags = bytearray(len(self._videos_by_row))
+        self._flag_reasons = {}
 
     def get_all_videos(self):
         """Returns all available video information from the video library."""
-        return list(self._videos.values())
+        return list(self._videos_by_row)
 
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
@@ -42,4 +94,171 @@ class VideoLibrary:
             The Video object for the requested video_id. None if the video
             does not exist.
         """
-        return self._videos.get(video_id, None)
+        row = self._lookup_row(video_id)
+        return None if row is None else self._videos_by_row[row]
+
+    def __len__(self):
+        """Returns the number of videos in the library."""
+        return len(self._flags)
+
+    def get_row(self, video_id):
+        """Returns the catalog row of a video, or None if it does not
+           exist.
+        """
+        return self._lookup_row(video_id)
+
+    def get_video_at(self, row):
+        """Returns the Video of a catalog row."""
+        return self._videos_by_row[row]
+
+    def iter_videos(self, start_row=0):
+        """Yields (row, video) for the videos from start_row on, in
+           catalog order.
+        """
+        videos = islice(self._videos_by_row, start_row, None)
+        yield from enumerate(videos, start_row)
+
+    def get_allowed_videos(self):
+        """Returns all videos that are not flagged, in catalog order."""
+        videos = self.get_all_videos()
+        if not any(self._flags):
+            return videos
+        return [video for video, flagged
+                in zip(videos, self._flags) if not flagged]
+
+    @property
+    def generation(self) -> int:
+        """Returns a counter that changes whenever a video's flag does."""
+        return self._generation
+
+    def get_flag_bitmap(self):
+        """Returns the live flag bitmap, one byte per video in catalog order.
+
+        The bitmap is updated in place by flag_videos and allow_videos, so
+        views over it (e.g. NumPy arrays) always see the current flags.
+        """
+        return self._flags
+
+    def is_flagged(self, video_id):
+        """Returns whether the video with the given id is flagged."""
+        row = self._lookup_row(video_id)
+        return row is not None and bool(self._flags[row])
+
+    def get_flag_reason(self, video_id):
+        """Returns the flag reason of a video, or "" if it is not flagged."""
+        return self._flag_reasons.get(video_id, "")
+
+    def flag_videos(self, video_ids, flag_reason="Not supplied"):
+        """Flags every existing, not yet flagged video in video_ids.
+
+        Args:
+            video_ids: An iterable of video ids to flag.
+            flag_reason: Reason for flagging the videos.
+
+        Returns:
+            A tuple (flagged, missing, skipped) holding the newly flagged
+            Video objects, the ids that do not exist and the ids that were
+            already flagged.
+        """
+        flagged, missing, skipped = [], [], []
+        for video_id in dict.fromkeys(video_ids):
+            row = self._lookup_row(video_id)
+            if row is None:
+                missing.append(video_id)
+            elif self._flags[row]:
+                skipped.append(video_id)
+            else:
+                self._flags[row] = 1
+                self._generation += 1
+                self._flag_reasons[video_id] = flag_reason
+                video = self.get_video_at(row)
+                video.flag(flag_reason)
+                flagged.append(video)
+        return flagged, missing, skipped
+
+    def allow_videos(self, video_ids):
+        """Removes the flag from every existing, flagged video in video_ids.
+
+        Args:
+            video_ids: An iterable of video ids to allow.
+
+        Returns:
+            A tuple (allowed, missing, skipped) holding the Video objects
+            whose flag was removed, the ids that do not exist and the ids
+            that were not flagged.
+        """
+        allowed, missing, skipped = [], [], []
+        for video_id in dict.fromkeys(video_ids):
+            row = self._lookup_row(video_id)
+            if row is None:
+                missing.append(video_id)
+            elif not self._flags[row]:
+                skipped.append(video_id)
+            else:
+                self._flags[row] = 0
+                self._generation += 1
+                del self._flag_reasons[video_id]
+                video = self.get_video_at(row)
+                video.allow()
+                allowed.append(video)
+        return allowed, missing, skipped
+
+    def id_filter_stats(self):
+        """Returns a tuple (rejected, passed, false_positives) counting the
+           ids the Bloom filter rejected without a lookup, the ids it let
+           through to a lookup and those of them that did not exist.
+        """
+        return (self._filter_rejected, self._filter_passed,
+                self._filter_false_positives)
+
+    def _build_id_filter(self, video_ids, count, false_positive_rate):
+        """Checks ids against a Bloom filter of video_ids from now on.
+
+        Args:
+            video_ids: An iterable of every video id.
+            count: The number of video ids.
+            false_positive_rate: The rate at which ids that do not exist
+                still get looked up.
+        """
+        id_filter = BloomFilter(count, false_positive_rate)
+        for video_id in video_ids:
+            id_filter.add(video_id)
+        self._id_filter = id_filter
+
+    def _lookup_row(self, video_id):
+        """Returns the catalog row of a video, or None if it does not
+           exist, without looking up ids the Bloom filter rules out.
+        """
+        if self._id_filter is None:
+            return self._find_row(video_id)
+        if video_id not in self._id_filter:
+            self._filter_rejected += 1
+            return None
+        self._filter_passed += 1
+        row = self._find_row(video_id)
+        if row is None:
+            self._filter_false_positives += 1
+        return row
+
+    def _find_row(self, video_id):
+        """Returns the catalog row of a video, or None if it does not
+           exist.
+        """
+        return self._id_index.find(video_id)
+
+    def _cached_video(self, row, load):
+        """Returns the Video of a row for libraries that build videos on
+           demand, reusing the one handed out before while it is alive so
+           that its flag stays in sync.
+
+        Args:
+            row: The catalog row of the video.
+            load: Called with the row to build the Video if not cached.
+        """
+        video = self._materialized.get(row)
+        if video is None:
+            video = load(row)
+            if self._flags[row]:
+                video.flag(self._flag_reasons[video.video_id])
+            self._materialized[row] = video
+        return video
@@ -1,108 +1,794 @@
 """A video player class."""
 import random
+import threading
+import time
+import uuid
+from itertools import islice
 
+from .command_deadline import bounded
+from .command_deadline import current_deadline
+from .play_analytics import PlayAnalytics
+from .playback_queue import PlaybackQueue
+from .prefix_index import PrefixIndex
+from .random_sampler import RANDOM_SAMPLERS
+from .random_sampler import WeightedSampler
+from .related_videos import RelatedVideos
+from .results import CONFLICT
+from .results import INVALID
+from .results import NOT_FOUND
+from .results import BulkResult
+from .results import ErrorResult
+from .results import HistoryEntry
+from .results import PlaybackResult
+from .results import PlaylistPage
+from .results import PlaylistResult
+from .results import RankedVideo
+from .results import SearchResult
+from .results import ViewerCount
+from .search_engine import create_search_engine
+from .title_pattern import TitlePattern
+from .title_pattern import TitlePatternError
+from .title_pattern import TitleSearchTimeout
 from .video_library import VideoLibrary
-from .video_playlist import Playlist
+from .video_playlist import PlaylistStore
+from .video_playlist import playlist_key
+from .video_query import QueryEngine
+from .video_query import QuerySyntaxError
+from .video_query import parse_query
+from .viewer_counts import ViewerCounts
+from .watch_history import WatchHistory
 
 
 class VideoPlayer:
     """A class used to represent a Video Player."""
 
-    def __init__(self):
-        self._video_library = VideoLibrary()
+    def __init__(self, search_engine="python", video_library=None,
+                 playlist_store=None, session_id=None):
+        """VideoPlayer constructor.
+
+        Args:
+            search_engine: Name of the search engine answering searches,
+                "python" (default), "indexed" (builds indexes in the
+                background), "numpy", "sqlite" (needs a
+                SqliteVideoLibrary) or "sharded" (needs a
+                ShardedVideoLibrary).
+            video_library: The library to play videos from, a VideoLibrary
+                loaded from videos.txt by default.
+            playlist_store: Where playlists are kept, in memory by default.
+            session_id: Identifies this session in the unique viewer counts,
+                a random id by default.
+        """
+        if video_library is None:
+            video_library = VideoLibrary()
+        self._video_library = video_library
+        self._search_engine = create_search_engine(search_engine,
+                                                   self._video_library)
+        # Random samplers by mode, created on first use, and the
+        # random.Random they draw from, the random module's until seeded.
+        self._random_samplers = {}
+        self._rng = None
+        self._play_analytics = PlayAnalytics()
+        self._session_id = session_id if session_id else uuid.uuid4().hex
+        self._viewer_counts = ViewerCounts()
+        # Built on first use; the lock keeps read-only commands running
+        # concurrently from building them twice.
+        self._title_index = None
+        self._related_videos = None
+        self._query_engine = None
+        self._build_lock = threading.Lock()
         self._current_video_id = None
-        self._playlists = {}
+        if playlist_store is None:
+            playlist_store = PlaylistStore()
+        self._playlist_store = playlist_store
+        self._playlists = playlist_store.load()
+        # Playlists by key, kept sorted for listing and prefix lookups.
+        self._playlist_index = PrefixIndex(self._playlists.items())
+        self._playlist_generation = 0
+        self._playback_queue = None
+        self._watch_history = WatchHistory()
         self.playing = False
 
-    def number_of_videos(self):
-        num_videos = len(self._video_library.get_all_videos())
-        print(f"{num_videos} videos in the library")
+    @property
+    def viewer_counts(self):
+        """Returns the ViewerCounts of this player, e.g. to merge with the
+           counts of players in other processes.
+        """
+        return self._viewer_counts
 
-    def show_all_videos(self):
-        """Returns all videos."""
-        print("Here's a list of all available videos:")
-        videos = self._video_library.get_all_videos()
-        for video in sorted(videos, key=lambda v: v.title):
-            print("   ", video)
+    @property
+    def generation(self):
+        """Returns a (library, playlists) pair of counters that change
+           whenever a flag or a playlist does.
+        """
+        return self._video_library.generation, self._playlist_generation
 
-    def play_video(self, video_id):
-        """Plays the respective video.
+    def get_all_videos(self):
+        """Returns all videos in the library as VideoResults, sorted by
+           title. If the command's time budget runs out first, only the
+           videos listed until then are returned.
+        """
+        return [video.to_result()
+                for video in bounded(self._search_engine.videos_by_title())]
+
+    def get_video(self, video_id):
+        """Returns the VideoResult of a video, or None if it does not
+           exist.
+        """
+        video = self._video_library.get_video(video_id)
+        return video.to_result() if video else None
+
+    def find_videos(self, search_term, cursor=None, page_size=10):
+        """Returns a SearchResult of the allowed videos whose titles
+           contain the search_term.
 
         Args:
-            video_id: The video_id to be played.
+            search_term: The query to be used in search.
+            cursor: If given, only return the page of page_size results
+                starting at this cursor (0 for the first page).
+            page_size: The number of results per page.
+        """
+        if cursor is None:
+            videos = self._search_engine.search_title(search_term)
+            next_cursor = None
+        else:
+            # Ask for one result more than the page, to know whether there
+            # is a next page and where it starts.
+            videos = self._search_engine.search_title(search_term, cursor,
+                                                      page_size + 1)
+            next_cursor = None
+            if len(videos) > page_size:
+                next_cursor = self._video_library.get_row(
+                    videos.pop().video_id)
+        return SearchResult(
+            search_term, tuple(video.to_result() for video in videos),
+            next_cursor, _truncated())
+
+    def find_videos_with_tag(self, video_tag):
+        """Returns a SearchResult of the allowed videos whose tags contain
+           the video_tag.
+        """
+        videos = self._search_engine.search_tag(video_tag)
+        return SearchResult(
+            video_tag, tuple(video.to_result() for video in videos), None,
+            _truncated())
+
+    def find_videos_by_pattern(self, pattern, timeout=1.0):
+        """Returns a SearchResult of the allowed videos whose titles match
+           a regular expression, ignoring case, or an ErrorResult if the
+           pattern cannot be used or matching takes too long.
+
+        Args:
+            pattern: The regular expression, searched for anywhere in the
+                titles unless anchored.
+            timeout: The seconds matching may take, or None for no limit.
+        """
+        try:
+            title_pattern = TitlePattern(pattern)
+        except TitlePatternError as e:
+            return ErrorResult(INVALID, "search videos", str(e))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            videos = self._search_engine.search_regex(title_pattern,
+                                                      deadline)
+        except TitleSearchTimeout:
+            return ErrorResult(INVALID, "search videos",
+                               f"Pattern took longer than {timeout:g} s")
+        return SearchResult(
+            pattern, tuple(video.to_result() for video in videos), None,
+            _truncated())
+
+    def find_videos_matching(self, query):
+        """Returns a SearchResult of the allowed videos matching a query,
+           or an ErrorResult if the query is not valid.
+
+        Args:
+            query: The words of the query.
+        """
+        plan = self.explain_query(query)
+        if isinstance(plan, ErrorResult):
+            return plan
+        videos = self._query_engine.run(plan)
+        return SearchResult(
+            " ".join(query), tuple(video.to_result() for video in videos),
+            None, _truncated())
+
+    def explain_query(self, query):
+        """Returns the QueryPlan of a query, or an ErrorResult if the query
+           is not valid.
+
+        Args:
+            query: The words of the query.
+        """
+        try:
+            predicates = parse_query(query)
+        except QuerySyntaxError as e:
+            return ErrorResult(INVALID, "run query", str(e))
+
+        with self._build_lock:
+            if self._query_engine is None:
+                self._query_engine = QueryEngine(self._video_library)
+        return self._query_engine.plan(predicates)
+
+    def find_related_videos(self, video_id, k=5):
+        """Returns a SearchResult of up to k allowed videos sharing the most
+           tags with a video, or an ErrorResult if it does not exist.
+
+        Args:
+            video_id: The video_id to find related videos for.
+            k: The maximum number of videos to return.
+        """
+        if not self._video_library.get_video(video_id):
+            return ErrorResult(NOT_FOUND, "show related videos",
+                               "Video does not exist")
+
+        with self._build_lock:
+            if self._related_videos is None:
+                self._related_videos = RelatedVideos(self._video_library)
+        videos = self._related_videos.related(video_id, k)
+        return SearchResult(
+            video_id, tuple(video.to_result() for video in videos), None,
+            _truncated())
+
+    def get_playlists(self):
+        """Returns all playlists as PlaylistResults, sorted by name."""
+        return [PlaylistResult(playlist.name, tuple(playlist.video_ids))
+                for playlist in self._playlist_index]
+
+    def get_playlist(self, playlist_name, cursor=None, page_size=10):
+        """Returns a PlaylistPage of the videos in a playlist, or an
+           ErrorResult if it does not exist.
+
+        Args:
+            playlist_name: The playlist name.
+            cursor: If given, only return the page of page_size videos
+                starting at this cursor (0 for the first page).
+            page_size: The number of videos per page.
+        """
+        playlist = self._playlists.get(playlist_key(playlist_name))
+        if not playlist:
+            return ErrorResult(NOT_FOUND, "show playlist " + playlist_name,
+                               "Playlist does not exist")
+
+        if cursor is None:
+            video_ids = playlist.video_ids
+            next_cursor = None
+        else:
+            page = list(islice(playlist.iter_from(cursor), page_size + 1))
+            video_ids = [video_id for _, video_id in page[:page_size]]
+            next_cursor = page[-1][0] if len(page) > page_size else None
+        # A stored playlist can outlive videos dropped from the catalog;
+        # those are skipped rather than shown.
+        videos = (self._video_library.get_video(video_id)
+                  for video_id in video_ids)
+        return PlaylistPage(
+            playlist.name,
+            tuple(video.to_result() for video in videos if video),
+            next_cursor)
+
+    def flag(self, video_id, flag_reason="Not supplied"):
+        """Flags a video, stopping it if it is playing.
+
+        Returns:
+            The flagged VideoResult, or an ErrorResult.
+        """
+        # Flag video; the library validates it in the same lookup.
+        flagged, missing, _ = self._video_library.flag_videos(
+            [video_id], flag_reason)
+        if missing:
+            return ErrorResult(NOT_FOUND, "flag video",
+                               "Video does not exist")
+        if not flagged:
+            return ErrorResult(CONFLICT, "flag video",
+                               "Video is already flagged")
+
+        if self._current_video_id == video_id:
+            self._stop()
+        if self._related_videos:
+            self._related_videos.flagged(video_id)
+        return flagged[0].to_result()
+
+    def allow(self, video_id):
+        """Removes the flag from a video.
+
+        Returns:
+            The allowed VideoResult, or an ErrorResult.
+        """
+        # Allow video; the library validates it in the same lookup.
+        allowed, missing, _ = self._video_library.allow_videos([video_id])
+        if missing:
+            return ErrorResult(NOT_FOUND, "remove flag from video",
+                               "Video does not exist")
+        if not allowed:
+            return ErrorResult(CONFLICT, "remove flag from video",
+                               "Video is not flagged")
+
+        if self._related_videos:
+            self._related_videos.allowed(video_id)
+        return allowed[0].to_result()
+
+    def new_playlist(self, playlist_name):
+        """Creates a playlist with a given name.
+
+        Returns:
+            The new PlaylistResult, or an ErrorResult.
+        """
+        key = playlist_key(playlist_name)
+        if self._playlists.get(key):
+            return ErrorResult(CONFLICT, "create playlist",
+                               "A playlist with the same name already "
+                               "exists")
+
+        playlist = self._playlist_store.create(key, playlist_name)
+        self._playlists[key] = playlist
+        self._playlist_index.insert(key, playlist)
+        self._playlist_generation += 1
+        return PlaylistResult(playlist.name, ())
+
+    def add_video(self, playlist_name, video_id):
+        """Adds a video to a playlist with a given name.
+
+        Returns:
+            The added VideoResult, or an ErrorResult.
+        """
+        playlist = self._playlists.get(playlist_key(playlist_name))
+        video = self._video_library.get_video(video_id)
+        action = "add video to " + playlist_name
+
+        # Validate can add to playlist.
+        if not playlist:
+            return ErrorResult(NOT_FOUND, action, "Playlist does not exist")
+        if not video:
+            return ErrorResult(NOT_FOUND, action, "Video does not exist")
+        if playlist.has_video(video_id):
+            return ErrorResult(CONFLICT, action, "Video already added")
+        if video.flagged:
+            return ErrorResult(CONFLICT, action,
+                               "Video is currently flagged " +
+                               video.pretty_flag_reason())
+
+        # Add video to playlist.
+        playlist.add_video(video_id)
+        self._playlist_generation += 1
+        return video.to_result()
+
+    def remove_video(self, playlist_name, video_id):
+        """Removes a video from a playlist with a given name.
+
+        Returns:
+            The removed VideoResult, or an ErrorResult.
+        """
+        playlist = self._playlists.get(playlist_key(playlist_name))
+        video = self._video_library.get_video(video_id)
+        action = "remove video from " + playlist_name
+
+        # Validate can remove from playlist.
+        if not playlist:
+            return ErrorResult(NOT_FOUND, action, "Playlist does not exist")
+        if not video:
+            return ErrorResult(NOT_FOUND, action, "Video does not exist")
+        if not playlist.has_video(video_id):
+            return ErrorResult(CONFLICT, action, "Video is not in playlist")
+
+        # Remove video from playlist.
+        playlist.remove_video(video_id)
+        self._playlist_generation += 1
+        return video.to_result()
+
+    def clear_videos(self, playlist_name):
+        """Removes all videos from a playlist with a given name.
+
+        Returns:
+            The emptied PlaylistResult, or an ErrorResult.
+        """
+        playlist = self._playlists.get(playlist_key(playlist_name))
+        if not playlist:
+            return ErrorResult(NOT_FOUND, "clear playlist " + playlist_name,
+                               "Playlist does not exist")
+
+        playlist.clear_videos()
+        self._playlist_generation += 1
+        return PlaylistResult(playlist.name, ())
+
+    def drop_playlist(self, playlist_name):
+        """Deletes a playlist with a given name.
+
+        Returns:
+            The deleted PlaylistResult, or an ErrorResult.
+        """
+        key = playlist_key(playlist_name)
+        playlist = self._playlists.get(key)
+        if not playlist:
+            return ErrorResult(NOT_FOUND,
+                               "delete playlist " + playlist_name,
+                               "Playlist does not exist")
+
+        self._playlists.pop(key)
+        self._playlist_store.delete(key)
+        self._playlist_index.remove(key, playlist)
+        self._playlist_generation += 1
+        return PlaylistResult(playlist.name, tuple(playlist.video_ids))
+
+    def play(self, video_id):
+        """Plays a video, stopping the current one first.
+
+        Returns:
+            A PlaybackResult, or an ErrorResult.
         """
         video = self._video_library.get_video(video_id)
 
         # Validate can play video.
         if not video:
-            print("Cannot play video: Video does not exist")
-            return
+            return ErrorResult(NOT_FOUND, "play video",
+                               "Video does not exist")
         if video.flagged:
-            print("Cannot play video: Video is currently flagged",
-                  video.pretty_flag_reason())
-            return
+            return ErrorResult(CONFLICT, "play video",
+                               "Video is currently flagged " +
+                               video.pretty_flag_reason())
 
         # Stop video if another is playing
+        stopped = None
         if self._current_video_id:
-            self.stop_video()
+            stopped = self._stop().to_result()
 
         # Play video
         self._current_video_id = video.video_id
         self.playing = True
-        print("Playing video:", video.title)
+        self._watch_history.started(video.video_id)
+        self._play_analytics.record_play(video.video_id)
+        self._viewer_counts.add(video.video_id, self._session_id)
+        for sampler in self._random_samplers.values():
+            sampler.record_play(video.video_id)
+        return PlaybackResult(video.to_result(), True, stopped, None)
+
+    def stop(self):
+        """Stops the current video.
+
+        Returns:
+            The stopped VideoResult, or an ErrorResult.
+        """
+        if not self._current_video_id:
+            return ErrorResult(CONFLICT, "stop video",
+                               "No video is currently playing")
+        return self._stop().to_result()
+
+    def play_random(self, mode="uniform"):
+        """Plays a random video that is not flagged.
+
+        Args:
+            mode: How the video is picked, "uniform" (default), "weighted"
+                by popularity or "shuffle" for no repeats until every video
+                has been played.
+
+        Returns:
+            A PlaybackResult, or None if every video is flagged.
+        """
+        sampler = self._random_samplers.get(mode)
+        if sampler is None:
+            if RANDOM_SAMPLERS[mode] is WeightedSampler:
+                sampler = WeightedSampler(self._video_library,
+                                          weights=self._popularity(),
+                                          rng=self._rng)
+            else:
+                sampler = RANDOM_SAMPLERS[mode](self._video_library,
+                                                rng=self._rng)
+            self._random_samplers[mode] = sampler
+        random_video = sampler.sample()
+        return self.play(random_video.video_id) if random_video else None
+
+    def seed_random(self, seed):
+        """Makes random videos be picked by a random.Random of their own,
+           seeded with seed, so the same picks can be made again.
+        """
+        self._rng = random.Random(seed)
+        self._random_samplers = {}
+
+    def _popularity(self):
+        """Returns 1 plus the estimated plays of every video, in catalog
+           order, for the plays made before a weighted sampler existed.
+           Only the top played videos are counted.
+        """
+        weights = [1.0] * len(self._video_library)
+        for video_id, plays in self._play_analytics.top_played():
+            row = self._video_library.get_row(video_id)
+            if row is not None:
+                weights[row] += plays
+        return weights
+
+    def pause(self):
+        """Pauses the current video; pausing it again changes nothing.
+
+        Returns:
+            A PlaybackResult, or an ErrorResult.
+        """
+        if not self._current_video_id:
+            return ErrorResult(CONFLICT, "pause video",
+                               "No video is currently playing")
+        if self.playing:
+            self.playing = False
+            self._watch_history.paused()
+        return self.get_playing()
+
+    def unpause(self):
+        """Continues the current, paused video.
+
+        Returns:
+            A PlaybackResult, or an ErrorResult.
+        """
+        if not self._current_video_id:
+            return ErrorResult(CONFLICT, "continue video",
+                               "No video is currently playing")
+        if self.playing:
+            return ErrorResult(CONFLICT, "continue video",
+                               "Video is not paused")
+
+        self.playing = True
+        self._watch_history.continued()
+        return self.get_playing()
+
+    def get_playing(self):
+        """Returns a PlaybackResult of the current video, or None if no
+           video is playing.
+        """
+        if not self._current_video_id:
+            return None
+        return PlaybackResult(self._get_current_video().to_result(),
+                              self.playing, None, None)
+
+    def resume(self, video_id=None):
+        """Plays a video from where it was last stopped.
+
+        Args:
+            video_id: The video_id to be resumed, the video stopped most
+                recently by default.
+
+        Returns:
+            A PlaybackResult, or an ErrorResult.
+        """
+        if video_id is None:
+            video_id = self._watch_history.last_stopped()
+            if video_id is None:
+                return ErrorResult(CONFLICT, "resume video",
+                                   "No video to continue watching")
+
+        result = self.play(video_id)
+        if isinstance(result, ErrorResult):
+            return result
+        position = self._watch_history.resume_position(video_id)
+        if not position:
+            return result
+        self._watch_history.seek(position)
+        return PlaybackResult(result.video, True, result.stopped, position)
+
+    def get_history(self):
+        """Returns HistoryEntries of the videos watched most recently,
+           newest first.
+        """
+        return [HistoryEntry(
+                    self._video_library.get_video(video_id).to_result(),
+                    self._watch_history.resume_position(video_id))
+                for video_id in self._watch_history.history()]
+
+    def start_playlist(self, playlist_name):
+        """Starts playing through a playlist with a given name.
+
+        Returns:
+            The PlaybackResult of its first video, or an ErrorResult.
+        """
+        playlist = self._playlists.get(playlist_key(playlist_name))
+        if not playlist:
+            return ErrorResult(NOT_FOUND, "play playlist " + playlist_name,
+                               "Playlist does not exist")
+
+        queue = PlaybackQueue(playlist_name, playlist.video_ids,
+                              self._video_library)
+        video = queue.next_video()
+        if not video:
+            return ErrorResult(CONFLICT, "play playlist " + playlist_name,
+                               "No videos to play")
+
+        self._playback_queue = queue
+        return self.play(video.video_id)
+
+    def skip_next(self):
+        """Plays the next video of the playlist being played.
+
+        Returns:
+            A PlaybackResult, None at the end of the playlist, or an
+            ErrorResult.
+        """
+        if not self._playback_queue:
+            return ErrorResult(CONFLICT, "play next video",
+                               "No playlist is being played")
+        video = self._playback_queue.next_video()
+        return self.play(video.video_id) if video else None
+
+    def skip_previous(self):
+        """Plays the previous video of the playlist being played.
+
+        Returns:
+            A PlaybackResult, None at the start of the playlist, or an
+            ErrorResult.
+        """
+        if not self._playback_queue:
+            return ErrorResult(CONFLICT, "play previous video",
+                               "No playlist is being played")
+        video = self._playback_queue.previous_video()
+        return self.play(video.video_id) if video else None
+
+    def complete_titles(self, prefix, k=10):
+        """Returns VideoResults of up to k allowed videos whose titles start
+           with prefix, case ignored.
+        """
+        with self._build_lock:
+            if self._title_index is None:
+                self._title_index = PrefixIndex(
+                    (video.title.lower(), video)
+                    for video in self._video_library.get_all_videos())
+        videos = self._title_index.complete(
+            prefix.lower(), k,
+            lambda v: not self._video_library.is_flagged(v.video_id))
+        return [video.to_result() for video in videos]
+
+    def complete_playlists(self, prefix, k=10):
+        """Returns PlaylistResults of up to k playlists whose names start
+           with prefix, case ignored.
+        """
+        return [PlaylistResult(playlist.name, tuple(playlist.video_ids))
+                for playlist in self._playlist_index.complete(
+                    playlist_key(prefix), k)]
+
+    def flag_many(self, video_ids, flag_reason="Not supplied"):
+        """Flags many videos at once, stopping the current one first if it
+           is about to be flagged.
+
+        Returns:
+            A BulkResult of the flagged videos.
+        """
+        video_ids = list(video_ids)
+        if (self._current_video_id in video_ids
+                and not self._video_library.is_flagged(
+                    self._current_video_id)):
+            self._stop()
+
+        flagged, missing, skipped = self._video_library.flag_videos(
+            video_ids, flag_reason)
+        if self._related_videos:
+            for video in flagged:
+                self._related_videos.flagged(video.video_id)
+        return BulkResult(tuple(video.to_result() for video in flagged),
+                          tuple(missing), tuple(skipped))
+
+    def allow_many(self, video_ids):
+        """Removes the flag from many videos at once.
+
+        Returns:
+            A BulkResult of the allowed videos.
+        """
+        allowed, missing, skipped = self._video_library.allow_videos(
+            video_ids)
+        if self._related_videos:
+            for video in allowed:
+                self._related_videos.allowed(video.video_id)
+        return BulkResult(tuple(video.to_result() for video in allowed),
+                          tuple(missing), tuple(skipped))
+
+    def get_top_played(self, k=10):
+        """Returns RankedVideos of up to k allowed videos played the most,
+           scored by their estimated plays.
+        """
+        return self._rank(self._play_analytics.top_played(), k)
+
+    def get_trending(self, k=10):
+        """Returns RankedVideos of up to k allowed videos played the most
+           recently, scored by plays that count half as much per hour.
+        """
+        return self._rank(self._play_analytics.trending(), k)
+
+    def count_viewers(self, video_id):
+        """Returns a ViewerCount of the estimated distinct sessions that
+           played a video, or an ErrorResult if it does not exist.
+        """
+        video = self._video_library.get_video(video_id)
+        if not video:
+            return ErrorResult(NOT_FOUND, "count viewers",
+                               "Video does not exist")
+        return ViewerCount(video.to_result(),
+                           self._viewer_counts.estimate(video_id))
+
+    def number_of_videos(self):
+        num_videos = len(self._video_library.get_all_videos())
+        print(f"{num_videos} videos in the library")
+
+    def show_all_videos(self):
+        """Returns all videos."""
+        print("Here's a list of all available videos:")
+        for video in bounded(self.get_all_videos()):
+            print("   ", video)
+        if _truncated():
+            _print_truncated()
+
+    def play_video(self, video_id):
+        """Plays the respective video.
+
+        Args:
+            video_id: The video_id to be played.
+        """
+        self._print_playback(self.play(video_id))
 
     def stop_video(self):
         """Stops the current video."""
-        if self._current_video_id:
-            current_video = self._get_current_video()
-            print("Stopping video:", current_video.title)
-            self._current_video_id = None
+        result = self.stop()
+        if isinstance(result, ErrorResult):
+            print(result)
         else:
-            print("Cannot stop video: No video is currently playing")
+            print("Stopping video:", result.title)
 
-    def play_random_video(self):
-        videos = self._filter_to_allowed_videos()
-        if videos:
-            random_video = random.choice(videos)
-            self.play_video(random_video.video_id)
+    def play_random_video(self, mode="uniform"):
+        """Plays a random video that is not flagged.
+
+        Args:
+            mode: How the video is picked, "uniform" (default), "weighted"
+                by popularity or "shuffle" for no repeats until every video
+                has been played.
+        """
+        result = self.play_random(mode)
+        if result:
+            self._print_playback(result)
         else:
             print("No videos available")
 
     def pause_video(self):
         """Pauses the current video."""
-        current_video = self._get_current_video()
+        was_playing = self.playing
+        result = self.pause()
+        if isinstance(result, ErrorResult):
+            print(result)
+        elif was_playing:
+            print("Pausing video:", result.video.title)
+        else:
+            print("Video already paused:", result.video.title)
 
-        # Validate can pause video.
-        if not current_video:
-            print("Cannot pause video: No video is currently playing")
-            return
-        if not self.playing:
-            print("Video already paused:", current_video.title)
+    def continue_video(self):
+        result = self.unpause()
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            print("Continuing video:", result.video.title)
+
+    def show_history(self):
+        """Displays the videos watched most recently, newest first."""
+        entries = self.get_history()
+        if not entries:
+            print("No videos watched yet")
             return
 
-        # Pause video.
-        self.playing = False
-        print("Pausing video:", current_video.title)
+        print("Watch history:")
+        for entry in entries:
+            if entry.position is None:
+                print("   ", entry.video)
+            else:
+                print("   ", entry.video, "- stopped at",
+                      _format_position(entry.position))
 
-    def continue_video(self):
-        # Validate can continue video.
-        if not self._current_video_id:
-            print("Cannot continue video: No video is currently playing")
-            return
-        if self.playing:
-            print("Cannot continue video: Video is not paused")
-            return
+    def resume_video(self, video_id=None):
+        """Plays a video from where it was last stopped.
 
-        # Continue video.
-        current_video = self._get_current_video()
-        self.playing = True
-        print("Continuing video:", current_video.title)
+        Args:
+            video_id: The video_id to be resumed, the video stopped most
+                recently by default.
+        """
+        result = self.resume(video_id)
+        self._print_playback(result)
+        if not isinstance(result, ErrorResult) and result.resumed_at:
+            print("Resuming at", _format_position(result.resumed_at))
 
     def show_playing(self):
         """Displays video currently playing."""
-        if self._current_video_id:
-            out = "Currently playing: " + str(self._get_current_video())
-            if not self.playing:
+        result = self.get_playing()
+        if result:
+            out = "Currently playing: " + str(result.video)
+            if not result.playing:
                 out += ' - PAUSED'
             print(out)
         else:
@@ -114,13 +800,11 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        key = playlist_name.lower()
-        if not self._playlists.get(key):
-            self._playlists[key] = Playlist(playlist_name)
-            print("Successfully created new playlist:", playlist_name)
+        result = self.new_playlist(playlist_name)
+        if isinstance(result, ErrorResult):
+            print(result)
         else:
-            print("Cannot create playlist: A playlist with the same name "
-                  "already exists")
+            print("Successfully created new playlist:", playlist_name)
 
     def add_to_playlist(self, playlist_name, video_id):
         """Adds a video to a playlist with a given name.
@@ -129,57 +813,72 @@ class VideoPlayer:
             playlist_name: The playlist name.
             video_id: The video_id to be added.
         """
-        playlist = self._playlists.get(playlist_name.lower())
-        video = self._video_library.get_video(video_id)
-
-        # Validate can add to playlist.
-        if not playlist:
-            print("Cannot add video to", playlist_name +
-                  ": Playlist does not exist")
-            return
-        if not video:
-            print("Cannot add video to", playlist_name +
-                  ": Video does not exist")
-            return
-        if playlist.has_video(video_id):
-            print("Cannot add video to", playlist_name +
-                  ": Video already added")
-            return
-        if video.flagged:
-            print("Cannot add video to", playlist_name +
-                  ": Video is currently flagged",
-                  video.pretty_flag_reason())
-            return
-
-        # Add video to playlist.
-        playlist.add_video(video_id)
-        print("Added video to", playlist_name + ":", video.title)
+        result = self.add_video(playlist_name, video_id)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            print("Added video to", playlist_name + ":", result.title)
 
     def show_all_playlists(self):
         """Display all playlists."""
-        if len(self._playlists):
+        playlists = self.get_playlists()
+        if playlists:
             print("Showing all playlists:")
-            for key in sorted(self._playlists):
-                print("   ", self._playlists[key].name)
+            for playlist in playlists:
+                print("   ", playlist.name)
         else:
             print("No playlists exist yet")
 
-    def show_playlist(self, playlist_name):
+    def show_playlist(self, playlist_name, cursor=None, page_size=10):
         """Display all videos in a playlist with a given name.
 
+        Args:
+            playlist_name: The playlist name.
+            cursor: If given, only display the page of page_size videos
+                starting at this cursor (0 for the first page).
+            page_size: The number of videos per page.
+        """
+        page = self.get_playlist(playlist_name, cursor, page_size)
+        if isinstance(page, ErrorResult):
+            print(page)
+            return
+
+        print("Showing playlist:", playlist_name)
+        for video in page.videos:
+            print("   ", video)
+        if not page.videos:
+            print("    No more videos" if cursor else
+                  "    No videos here yet")
+        if page.next_cursor is not None:
+            print("More videos, continue with --page", page.next_cursor)
+
+    def play_playlist(self, playlist_name):
+        """Starts playing through a playlist with a given name.
+
         Args:
             playlist_name: The playlist name.
         """
-        playlist = self._playlists.get(playlist_name.lower())
-        if playlist:
-            print("Showing playlist:", playlist_name)
-            for video_id in playlist.video_ids:
-                print("   ", self._video_library.get_video(video_id))
-            if not playlist.video_ids:
-                print("    No videos here yet")
+        result = self.start_playlist(playlist_name)
+        if not isinstance(result, ErrorResult):
+            print("Playing playlist:", playlist_name)
+        self._print_playback(result)
+
+    def next_video(self):
+        """Plays the next video of the playlist being played."""
+        result = self.skip_next()
+        if result:
+            self._print_playback(result)
         else:
-            print("Cannot show playlist", playlist_name +
-                  ": Playlist does not exist")
+            print("Reached the end of playlist:", self._playback_queue.name)
+
+    def previous_video(self):
+        """Plays the previous video of the playlist being played."""
+        result = self.skip_previous()
+        if result:
+            self._print_playback(result)
+        else:
+            print("Reached the start of playlist:",
+                  self._playback_queue.name)
 
     def remove_from_playlist(self, playlist_name, video_id):
         """Removes a video to a playlist with a given name.
@@ -188,27 +887,11 @@ class VideoPlayer:
             playlist_name: The playlist name.
             video_id: The video_id to be removed.
         """
-        playlist = self._playlists.get(playlist_name.lower())
-        video = self._video_library.get_video(video_id)
-
-        # Validate can remove from playlist.
-        if not playlist:
-            print("Cannot remove video from", playlist_name +
-                  ": Playlist does not exist")
-            return
-        if not video:
-            print("Cannot remove video from", playlist_name +
-                  ": Video does not exist")
-            return
-        if not playlist.has_video(video_id):
-            print("Cannot remove video from", playlist_name +
-                  ": Video is not in playlist")
-            return
-
-        # Remove video from playlist.
-        playlist.remove_video(video_id)
-        print("Removed video from", playlist_name +
-              ":", video.title)
+        result = self.remove_video(playlist_name, video_id)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            print("Removed video from", playlist_name + ":", result.title)
 
     def clear_playlist(self, playlist_name):
         """Removes all videos from a playlist with a given name.
@@ -216,13 +899,11 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        playlist = self._playlists.get(playlist_name.lower())
-        if playlist:
-            playlist.clear_videos()
-            print("Successfully removed all videos from", playlist_name)
+        result = self.clear_videos(playlist_name)
+        if isinstance(result, ErrorResult):
+            print(result)
         else:
-            print("Cannot clear playlist", playlist_name +
-                  ": Playlist does not exist")
+            print("Successfully removed all videos from", playlist_name)
 
     def delete_playlist(self, playlist_name):
         """Deletes a playlist with a given name.
@@ -230,26 +911,23 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        playlist = self._playlists.get(playlist_name.lower())
-        if playlist:
-            self._playlists.pop(playlist_name.lower())
-            print("Deleted playlist:", playlist_name)
+        result = self.drop_playlist(playlist_name)
+        if isinstance(result, ErrorResult):
+            print(result)
         else:
-            print("Cannot delete playlist", playlist_name +
-                  ": Playlist does not exist")
+            print("Deleted playlist:", playlist_name)
 
-    def search_videos(self, search_term):
+    def search_videos(self, search_term, cursor=None, page_size=10):
         """Display all the videos whose titles contain the search_term.
 
         Args:
             search_term: The query to be used in search.
+            cursor: If given, only display the page of page_size results
+                starting at this cursor (0 for the first page).
+            page_size: The number of results per page.
         """
-        results = []
-        for video in self._filter_to_allowed_videos():
-            if search_term.lower() in video.title.lower():
-                results.append(video)
-
-        self._play_video_from_results(results, search_term)
+        self._play_video_from_results(
+            self.find_videos(search_term, cursor, page_size))
 
     def search_videos_tag(self, video_tag):
         """Display all videos whose tags contains the provided tag.
@@ -257,12 +935,94 @@ class VideoPlayer:
         Args:
             video_tag: The video tag to be used in search.
         """
-        results = []
-        for video in self._filter_to_allowed_videos():
-            if video_tag in video.tags:
-                results.append(video)
+        self._play_video_from_results(self.find_videos_with_tag(video_tag))
+
+    def search_videos_regex(self, pattern):
+        """Display all the videos whose titles match a regular expression.
+
+        Args:
+            pattern: The regular expression, case is ignored.
+        """
+        result = self.find_videos_by_pattern(pattern)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            self._play_video_from_results(result)
+
+    def query_videos(self, query, explain=False):
+        """Display all videos matching a query, such as
+           title:cat AND tag:#animal NOT tag:#dog.
 
-        self._play_video_from_results(results, video_tag)
+        Args:
+            query: The words of the query.
+            explain: If True, display how the query would be evaluated
+                instead of its results.
+        """
+        if explain:
+            plan = self.explain_query(query)
+            if isinstance(plan, ErrorResult):
+                print(plan)
+                return
+            print("Query plan for", " ".join(query) + ":")
+            for line in str(plan).splitlines():
+                print("   ", line)
+            return
+
+        result = self.find_videos_matching(query)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            self._play_video_from_results(result)
+
+    def autocomplete_videos(self, prefix, k=10):
+        """Display up to k titles of allowed videos starting with prefix.
+
+        Args:
+            prefix: The title prefix, case is ignored.
+            k: The maximum number of completions to show.
+        """
+        videos = self.complete_titles(prefix, k)
+        if videos:
+            print("Here are the completions for", prefix + ":")
+            for video in videos:
+                print("   ", video.title)
+        else:
+            print("No completions for", prefix)
+
+    def autocomplete_playlists(self, prefix, k=10):
+        """Display up to k playlist names starting with prefix.
+
+        Args:
+            prefix: The playlist name prefix, case is ignored.
+            k: The maximum number of completions to show.
+        """
+        playlists = self.complete_playlists(prefix, k)
+        if playlists:
+            print("Here are the completions for", prefix + ":")
+            for playlist in playlists:
+                print("   ", playlist.name)
+        else:
+            print("No completions for", prefix)
+
+    def show_related_videos(self, video_id, k=5):
+        """Display up to k allowed videos sharing the most tags with a video.
+
+        Args:
+            video_id: The video_id to find related videos for.
+            k: The maximum number of videos to show.
+        """
+        result = self.find_related_videos(video_id, k)
+        if isinstance(result, ErrorResult):
+            print(result)
+            return
+
+        title = self.get_video(video_id).title
+        if result.videos:
+            print("Here are the videos related to", title + ":")
+            for video in result.videos:
+                print("   ", video)
+        else:
+            print("No related videos for", title)
 
     def flag_video(self, video_id, flag_reason="Not supplied"):
         """Mark a video as flagged.
@@ -271,76 +1031,200 @@ class VideoPlayer:
             video_id: The video_id to be flagged.
             flag_reason: Reason for flagging the video.
         """
-        video = self._video_library.get_video(video_id)
+        playing = self._current_video_id == video_id
+        result = self.flag(video_id, flag_reason)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            if playing:
+                print("Stopping video:", result.title)
+            print("Successfully flagged video:", result.title,
+                  result.pretty_flag_reason())
 
-        # Validate can flag video.
-        if not video:
-            print("Cannot flag video: Video does not exist")
-            return
-        if video.flagged:
-            print("Cannot flag video: Video is already flagged")
-            return
+    def allow_video(self, video_id):
+        """Removes a flag from a video.
 
-        if self._current_video_id == video_id:
+        Args:
+            video_id: The video_id to be allowed again.
+        """
+        result = self.allow(video_id)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            print("Successfully removed flag from video:", result.title)
+
+    def flag_videos(self, video_ids, flag_reason="Not supplied"):
+        """Mark many videos as flagged at once, printing a summary.
+
+        Args:
+            video_ids: The video_ids to be flagged.
+            flag_reason: Reason for flagging the videos.
+        """
+        # Stop the current video first if it is about to be flagged.
+        video_ids = list(video_ids)
+        if (self._current_video_id in video_ids
+                and not self._video_library.is_flagged(
+                    self._current_video_id)):
             self.stop_video()
 
-        # Flag video.
-        video.flag(flag_reason)
-        print("Successfully flagged video:", video.title,
-              video.pretty_flag_reason())
+        result = self.flag_many(video_ids, flag_reason)
+        print("Successfully flagged", len(result.changed), "videos",
+              "(reason: " + flag_reason + ")")
+        if result.missing:
+            print("Cannot flag", len(result.missing),
+                  "videos: Video does not exist")
+        if result.skipped:
+            print("Cannot flag", len(result.skipped),
+                  "videos: Video is already flagged")
 
-    def allow_video(self, video_id):
-        """Removes a flag from a video.
+    def allow_videos(self, video_ids):
+        """Removes the flag from many videos at once, printing a summary.
 
         Args:
-            video_id: The video_id to be allowed again.
+            video_ids: The video_ids to be allowed again.
         """
-        video = self._video_library.get_video(video_id)
+        result = self.allow_many(video_ids)
+        print("Successfully removed flag from", len(result.changed),
+              "videos")
+        if result.missing:
+            print("Cannot remove flag from", len(result.missing),
+                  "videos: Video does not exist")
+        if result.skipped:
+            print("Cannot remove flag from", len(result.skipped),
+                  "videos: Video is not flagged")
 
-        # Validate can allow video.
-        if not video:
-            print("Cannot remove flag from video: Video does not exist")
+    def show_top_played(self, k=10):
+        """Display up to k allowed videos played the most.
+
+        Args:
+            k: The maximum number of videos to show.
+        """
+        ranked = self.get_top_played(k)
+        if not ranked:
+            print("No videos played yet")
             return
-        if not video.flagged:
-            print("Cannot remove flag from video: Video is not flagged")
+
+        print("Top played videos:")
+        for rank, entry in enumerate(ranked, 1):
+            print("   ", str(rank) + ")", entry.video, "-",
+                  round(entry.score), "plays")
+
+    def show_trending(self, k=10):
+        """Display up to k allowed videos played the most recently.
+
+        Args:
+            k: The maximum number of videos to show.
+        """
+        ranked = self.get_trending(k)
+        if not ranked:
+            print("No videos played yet")
             return
 
-        # Allow video.
-        video.allow()
-        print("Successfully removed flag from video:", video.title)
+        print("Trending videos:")
+        for rank, entry in enumerate(ranked, 1):
+            print("   ", str(rank) + ")", entry.video, "-",
+                  f"{entry.score:.1f}", "recent plays")
+
+    def show_viewers(self, video_id):
+        """Display the estimated number of distinct viewers of a video.
 
-    def _filter_to_allowed_videos(self):
-        """ Return a list of videos with no flags. """
-        videos = self._video_library.get_all_videos()
-        return list(filter(lambda v: not v.flagged, videos))
+        Args:
+            video_id: The video_id to count the viewers of.
+        """
+        result = self.count_viewers(video_id)
+        if isinstance(result, ErrorResult):
+            print(result)
+        else:
+            print("Unique viewers of", result.video.title + ":",
+                  result.viewers)
 
     def _get_current_video(self):
         """ As defined by the current video id. """
         return self._video_library.get_video(self._current_video_id)
 
-    def _play_video_from_results(self, results, search_term):
+    def _stop(self):
+        """ Stops the current video and returns it. """
+        current_video = self._get_current_video()
+        self._current_video_id = None
+        self._watch_history.stopped()
+        return current_video
+
+    def _rank(self, scores, k):
+        """ Returns RankedVideos of the first k allowed videos of
+            (video_id, score) pairs.
+        """
+        ranked = []
+        for video_id, score in scores:
+            if len(ranked) == k:
+                break
+            video = self._video_library.get_video(video_id)
+            if video and not video.flagged:
+                ranked.append(RankedVideo(video.to_result(), score))
+        return ranked
+
+    def _print_playback(self, result):
+        """ Prints the stopped and started video of a PlaybackResult, or
+            the ErrorResult in its place.
+        """
+        if isinstance(result, ErrorResult):
+            print(result)
+            return
+        if result.stopped:
+            print("Stopping video:", result.stopped.title)
+        print("Playing video:", result.video.title)
+
+    def _play_video_from_results(self, result):
         """ Allow the user to select a video based on the results
             from a search.
 
             Args:
-                results: The search results (list of videos).
-                search_term: The term searched.
+                result: The SearchResult to choose from.
         """
-        if len(results):
-            print("Here are the results for", search_term + ":")
+        videos = result.videos
+        if len(videos):
+            print("Here are the results for", result.term + ":")
 
             # Number choices 1 to len
-            for x in range(len(results)):
-                print(str(x + 1) + ")", results[x])
+            for x in range(len(videos)):
+                print(str(x + 1) + ")", videos[x])
+            if result.next_cursor is not None:
+                print("More results, continue with --page",
+                      result.next_cursor)
+            if result.truncated:
+                _print_truncated()
 
             print("Would you like to play any of the above? If yes, specify "
                   "the number of the video.")
             print("If your answer is not a valid number, we will assume it's "
                   "a no.")
-            choice = input()
+            choice = self._read_choice()
 
             # Play choice if valid
-            if choice.isdigit() and 0 < int(choice) <= len(results):
-                self.play_video(results[int(choice) - 1].video_id)
+            if choice.isdigit() and 0 < int(choice) <= len(videos):
+                self.play_video(videos[int(choice) - 1].video_id)
         else:
-            print("No search results for", search_term)
+            print("No search results for", result.term)
+            if result.truncated:
+                _print_truncated()
+
+    def _read_choice(self):
+        """ Reads the user's answer to the search results prompt. """
+        return input()
+
+
+def _truncated():
+    """Returns whether the running command's time budget cut a scan
+       short.
+    """
+    deadline = current_deadline()
+    return deadline is not None and deadline.truncated
+
+
+def _print_truncated():
+    print("Results truncated: the command ran out of time")
+
+
+def _format_position(seconds):
+    """Formats a position in seconds as m:ss."""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
@@ -1,12 +1,32 @@
 """A video playlist class."""
+import unicodedata
+from bisect import bisect_left
+
+
+def playlist_key(name: str) -> str:
+    """Returns the case-insensitive key a playlist name is stored under.
+
+    Names are case folded and NFKC normalized, so e.g. "Straße" and
+    "STRASSE" name the same playlist.
+    """
+    return unicodedata.normalize(
+        "NFKC", unicodedata.normalize("NFKC", name).casefold())
+
 
 class Playlist:
-    """A class used to represent a Playlist."""
+    """A class used to represent a Playlist.
+
+    Every added video gets a sequence number that only ever grows, so a
+    sequence number is a stable cursor into the playlist: removing videos
+    does not shift it and new videos always come after it.
+    """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, video_ids=()):
         """Playlist constructor."""
         self._name = name
-        self._video_ids = []
+        self._video_ids = list(video_ids)
+        self._sequence_numbers = list(range(len(self._video_ids)))
+        self._next_sequence_number = len(self._video_ids)
 
     @property
     def name(self) -> str:
@@ -18,12 +38,43 @@ class Playlist:
 
     def add_video(self, video_id: str):
         self._video_ids.append(video_id)
+        self._sequence_numbers.append(self._next_sequence_number)
+        self._next_sequence_number += 1
 
     def remove_video(self, video_id: str):
-        self._video_ids.remove(video_id)
+        position = self._video_ids.index(video_id)
+        del self._video_ids[position]
+        del self._sequence_numbers[position]
 
     def has_video(self, video_id: str):
         return video_id in self._video_ids
 
     def clear_videos(self):
         self._video_ids = []
+        self._sequence_numbers = []
+
+    def iter_from(self, sequence_number: int):
+        """Yields (sequence number, video_id) for the videos added at or
+           after sequence_number that are still in the playlist.
+        """
+        position = bisect_left(self._sequence_numbers, sequence_number)
+        while position < len(self._video_ids):
+            yield (self._sequence_numbers[position],
+                   self._video_ids[position])
+            position += 1
+
+
+class PlaylistStore:
+    """A class used to create playlists that only live in memory."""
+
+    def load(self):
+        """Returns all stored playlists, keyed by playlist_key(name)."""
+        return {}
+
+    def create(self, key, name):
+        """Creates a new, empty playlist and returns it."""
+        return Playlist(name)
+
+    def delete(self, key):
+        """Deletes a stored playlist."""
+        pass
@@ -0,0 +1,174 @@
+"""A video query language.
+
+Queries combine predicates with AND and NOT, e.g.
+
+    title:cat AND tag:#animal NOT tag:#dog
+
+`title:<term>` matches titles containing term (ignoring case) and
+`tag:<tag>` matches videos with that exact tag. `NOT` excludes the
+predicate after it and may follow AND or stand alone between predicates.
+"""
+from .command_deadline import bounded
+
+# How many titles are sampled to estimate how many videos a title
+# predicate matches.
+_TITLE_SAMPLE_SIZE = 1000
+
+
+class QuerySyntaxError(ValueError):
+    """A class used to represent an invalid query."""
+    pass
+
+
+class Predicate:
+    """A class used to represent one `field:value` test of a query."""
+
+    def __init__(self, field: str, value: str, negated: bool):
+        """Predicate constructor."""
+        self.field = field
+        self.value = value
+        self.negated = negated
+
+    def __str__(self):
+        prefix = "NOT " if self.negated else ""
+        return prefix + self.field + ":" + self.value
+
+
+def parse_query(tokens):
+    """Parses the words of a query into a list of Predicates.
+
+    Raises QuerySyntaxError if the query is not valid.
+    """
+    predicates = []
+    expect_predicate = True
+    negated = False
+    for token in tokens:
+        if token.upper() == "AND" and not expect_predicate:
+            expect_predicate = True
+        elif token.upper() == "NOT" and not negated:
+            expect_predicate = True
+            negated = True
+        elif expect_predicate:
+            field, _, value = token.partition(":")
+            if field.lower() not in ("title", "tag") or not value:
+                raise QuerySyntaxError(
+                    f"Expected title:<term> or tag:<tag>, got {token}")
+            predicates.append(Predicate(field.lower(), value, negated))
+            expect_predicate = False
+            negated = False
+        else:
+            raise QuerySyntaxError(f"Expected AND or NOT, got {token}")
+
+    if expect_predicate:
+        raise QuerySyntaxError("Query ends without a predicate")
+    if all(predicate.negated for predicate in predicates):
+        raise QuerySyntaxError("Query needs at least one predicate without "
+                               "NOT")
+    return predicates
+
+
+class QueryPlan:
+    """A class used to represent the order a query is evaluated in.
+
+    Every step is a (operation, predicate, estimated rows) tuple, where
+    operation is one of INDEX (look up the tag posting list), INTERSECT
+    (keep candidates in a posting list), EXCLUDE (drop candidates in a
+    posting list), SCAN (test every title) and FILTER (test the titles of
+    the candidates).
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    def __str__(self):
+        return "\n".join(
+            f"{number}. {operation} {predicate} (est. {rows} rows)"
+            for number, (operation, predicate, rows)
+            in enumerate(self.steps, 1))
+
+
+class QueryEngine:
+    """A class used to plan and run queries against a video library.
+
+    Tag predicates are answered from per-tag posting lists, whose sizes
+    are exact cardinalities. Title predicates have no index; their
+    cardinality is estimated from a sample of titles. The plan starts from
+    the most selective tag predicate, intersects the other tags from the
+    smallest up, subtracts excluded tags and only then tests titles on
+    the remaining candidates.
+    """
+
+    def __init__(self, video_library):
+        self._video_library = video_library
+        self._videos = video_library.get_all_videos()
+        self._postings = {}
+        for row, video in enumerate(self._videos):
+            for tag in video.tags:
+                self._postings.setdefault(tag, set()).add(row)
+
+    def plan(self, predicates):
+        """Returns the QueryPlan for a list of Predicates."""
+        estimates = {id(predicate): self._estimate(predicate)
+                     for predicate in predicates}
+
+        def kept(predicate):
+            """Estimated number of videos a predicate lets through."""
+            if predicate.negated:
+                return len(self._videos) - estimates[id(predicate)]
+            return estimates[id(predicate)]
+
+        tags = sorted((p for p in predicates
+                       if p.field == "tag" and not p.negated), key=kept)
+        excluded_tags = sorted((p for p in predicates
+                                if p.field == "tag" and p.negated), key=kept)
+        titles = sorted((p for p in predicates if p.field == "title"),
+                        key=kept)
+
+        steps = []
+        for predicate in tags:
+            steps.append(("INTERSECT" if steps else "INDEX", predicate))
+        if steps:
+            steps += [("EXCLUDE", predicate) for predicate in excluded_tags]
+        for predicate in titles:
+            steps.append(("FILTER" if steps else "SCAN", predicate))
+        if not tags:
+            steps += [("EXCLUDE", predicate) for predicate in excluded_tags]
+        return QueryPlan([(operation, predicate, estimates[id(predicate)])
+                          for operation, predicate in steps])
+
+    def run(self, plan):
+        """Returns the allowed videos matching a plan, in catalog order."""
+        candidates = None
+        for operation, predicate, _ in plan.steps:
+            if operation == "INDEX":
+                candidates = set(self._postings.get(predicate.value, ()))
+            elif operation == "INTERSECT":
+                candidates &= self._postings.get(predicate.value, set())
+            elif operation == "EXCLUDE":
+                candidates -= self._postings.get(predicate.value, set())
+            else:
+                if candidates is None:
+                    candidates = range(len(self._videos))
+                term = predicate.value.lower()
+                candidates = {
+                    row for row in bounded(candidates)
+                    if (term in self._videos[row].title.lower())
+                    != predicate.negated}
+
+        return [self._videos[row] for row in bounded(sorted(candidates))
+                if not self._video_library.is_flagged(
+                    self._videos[row].video_id)]
+
+    def _estimate(self, predicate):
+        """Returns how many videos a predicate is expected to match,
+           ignoring NOT.
+        """
+        if predicate.field == "tag":
+            return len(self._postings.get(predicate.value, ()))
+
+        sample = self._videos[:_TITLE_SAMPLE_SIZE]
+        if not sample:
+            return 0
+        term = predicate.value.lower()
+        matches = sum(term in video.title.lower() for video in sample)
+        return round(matches * len(self._videos) / len(sample))
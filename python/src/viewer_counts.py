@@ -0,0 +1,134 @@
+"""Unique viewer estimates per video."""
+import math
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+
+
+class HyperLogLog:
+    """A class used to estimate how many distinct values were added.
+
+    Values are hashed to 64 bits with blake2b, which unlike hash() is the
+    same in every process, so sketches built by different processes can be
+    merged. The first precision bits pick one of 2 ** precision registers,
+    which keeps the longest run of leading zeros seen in the other bits.
+    The standard error is about 1.04 / sqrt(2 ** precision).
+
+    A sketch starts sparse, as a sorted array of (register << 6 | rank)
+    entries for the registers that are set, and switches to one byte per
+    register once that would take less memory. Few values are therefore
+    cheap to keep and estimated by linear counting, nearly exactly.
+    """
+
+    def __init__(self, precision=12):
+        """HyperLogLog constructor.
+
+        Args:
+            precision: The number of hash bits picking a register.
+        """
+        self._precision = precision
+        self._sparse = array("I")
+        self._registers = None
+
+    @property
+    def sparse(self):
+        """Returns whether the sketch still keeps only the set registers."""
+        return self._registers is None
+
+    def add(self, value):
+        """Adds a string value."""
+        digest = blake2b(value.encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        bits = 64 - self._precision
+        self._update(hashed >> bits,
+                     bits - (hashed & ((1 << bits) - 1)).bit_length() + 1)
+
+    def merge(self, other):
+        """Adds every value added to another sketch of the same precision.
+        """
+        if other._precision != self._precision:
+            raise ValueError("Cannot merge HyperLogLogs of different "
+                             "precisions")
+        for register, rank in other._ranks():
+            self._update(register, rank)
+
+    def estimate(self):
+        """Returns the estimated number of distinct values added."""
+        size = 1 << self._precision
+        ranks = [rank for _, rank in self._ranks()]
+        zeros = size - len(ranks)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / (
+            zeros + sum(2.0 ** -rank for rank in ranks))
+        if estimate <= 2.5 * size and zeros:
+            # Linear counting is more accurate while many registers are 0.
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def _update(self, register, rank):
+        if self._registers is not None:
+            if rank > self._registers[register]:
+                self._registers[register] = rank
+            return
+
+        sparse = self._sparse
+        entry = register << 6 | rank
+        position = bisect_left(sparse, register << 6)
+        if position < len(sparse) and sparse[position] >> 6 == register:
+            if entry > sparse[position]:
+                sparse[position] = entry
+            return
+        sparse.insert(position, entry)
+        # Four bytes per sparse entry against one per dense register.
+        if 4 * len(sparse) > 1 << self._precision:
+            registers = bytearray(1 << self._precision)
+            for entry in sparse:
+                registers[entry >> 6] = entry & 63
+            self._registers = registers
+            self._sparse = None
+
+    def _ranks(self):
+        """Yields the (register, rank) pairs of the set registers."""
+        if self._registers is None:
+            for entry in self._sparse:
+                yield entry >> 6, entry & 63
+        else:
+            for register, rank in enumerate(self._registers):
+                if rank:
+                    yield register, rank
+
+
+class ViewerCounts:
+    """A class used to estimate the distinct viewers of every video.
+
+    Only videos that were watched get a HyperLogLog. Counts kept by other
+    processes, e.g. pickled and sent over, can be merged in.
+    """
+
+    def __init__(self, precision=12):
+        """ViewerCounts constructor.
+
+        Args:
+            precision: The precision of every video's HyperLogLog.
+        """
+        self._precision = precision
+        self._viewers = {}
+
+    def add(self, video_id, session_id):
+        """Records that a session watched a video."""
+        viewers = self._viewers.get(video_id)
+        if viewers is None:
+            viewers = self._viewers[video_id] = HyperLogLog(self._precision)
+        viewers.add(session_id)
+
+    def estimate(self, video_id):
+        """Returns the estimated number of sessions that watched a video."""
+        viewers = self._viewers.get(video_id)
+        return viewers.estimate() if viewers else 0
+
+    def merge(self, other):
+        """Adds the viewers counted by another ViewerCounts."""
+        for video_id, viewers in other._viewers.items():
+            if video_id not in self._viewers:
+                self._viewers[video_id] = HyperLogLog(self._precision)
+            self._viewers[video_id].merge(viewers)
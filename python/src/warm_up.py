@@ -0,0 +1,66 @@
+"""A background warm-up scheduler class."""
+import threading
+
+
+class WarmUpScheduler:
+    """A class used to build expensive structures on a background thread.
+
+    Structures are built one after another, in the order they were given.
+    Until a structure is built get() returns None, so callers keep using
+    their slower path; it then returns the finished structure, which is
+    published with a single dict assignment and so switches in atomically.
+    A structure whose build fails stays unbuilt.
+    """
+
+    def __init__(self, builds):
+        """WarmUpScheduler constructor.
+
+        Args:
+            builds: (name, build) pairs, build returning the structure.
+        """
+        self._builds = list(builds)
+        self._built = {}
+        self._errors = {}
+        self._thread = None
+        self._done = threading.Event()
+
+    def start(self):
+        """Starts building on a daemon thread, so that exiting the program
+           does not wait for it.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name="warm-up")
+            self._thread.start()
+
+    def get(self, name):
+        """Returns the structure built under name, or None if not yet."""
+        return self._built.get(name)
+
+    def ready(self, name):
+        """Returns whether the structure under name is built."""
+        return name in self._built
+
+    def error(self, name):
+        """Returns the exception the build under name failed with, or
+           None.
+        """
+        return self._errors.get(name)
+
+    def wait(self, timeout=None):
+        """Waits until every build finished or failed.
+
+        Returns:
+            False if the timeout expired first, True otherwise.
+        """
+        return self._done.wait(timeout)
+
+    def _run(self):
+        try:
+            for name, build in self._builds:
+                try:
+                    self._built[name] = build()
+                except Exception as e:
+                    self._errors[name] = e
+        finally:
+            self._done.set()
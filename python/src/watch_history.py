@@ -0,0 +1,87 @@
+"""A watch history class."""
+import time
+from collections import OrderedDict
+from collections import deque
+
+
+class WatchHistory:
+    """A class used to remember what a session watched and where it
+       stopped.
+
+    The history is a ring buffer of the last `capacity` videos started.
+    Resume positions are kept for at most `resume_capacity` videos; when
+    full, the position of the least recently watched video is dropped.
+    Memory per session is therefore bounded whatever is watched.
+    """
+
+    def __init__(self, capacity=100, resume_capacity=1000,
+                 clock=time.monotonic):
+        """WatchHistory constructor.
+
+        Args:
+            capacity: How many started videos the history keeps.
+            resume_capacity: How many resume positions are kept.
+            clock: Returns the current time in seconds.
+        """
+        self._history = deque(maxlen=capacity)
+        self._positions = OrderedDict()
+        self._resume_capacity = resume_capacity
+        self._clock = clock
+        self._video_id = None
+        self._position = 0.0
+        self._started_at = None
+
+    def history(self):
+        """Returns the ids of the last videos started, most recent first."""
+        return list(reversed(self._history))
+
+    def resume_position(self, video_id):
+        """Returns the position in seconds a video was stopped at, or None
+           if it has no resume position.
+        """
+        return self._positions.get(video_id)
+
+    def last_stopped(self):
+        """Returns the id of the video most recently stopped with a resume
+           position, or None.
+        """
+        return next(reversed(self._positions), None)
+
+    def started(self, video_id, position=0.0):
+        """Records that a video started playing at position."""
+        self._history.append(video_id)
+        self._video_id = video_id
+        self._position = position
+        self._started_at = self._clock()
+
+    def seek(self, position):
+        """Moves the current video to position, without adding it to the
+           history again.
+        """
+        if self._video_id is None:
+            return
+        self._position = position
+        if self._started_at is not None:
+            self._started_at = self._clock()
+
+    def paused(self):
+        """Records that the current video was paused."""
+        if self._started_at is not None:
+            self._position += self._clock() - self._started_at
+            self._started_at = None
+
+    def continued(self):
+        """Records that the current video continued playing."""
+        if self._video_id is not None and self._started_at is None:
+            self._started_at = self._clock()
+
+    def stopped(self):
+        """Records that the current video stopped and saves its position."""
+        if self._video_id is None:
+            return
+        self.paused()
+        self._positions[self._video_id] = self._position
+        self._positions.move_to_end(self._video_id)
+        if len(self._positions) > self._resume_capacity:
+            self._positions.popitem(last=False)
+        self._video_id = None
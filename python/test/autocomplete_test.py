@@ -0,0 +1,50 @@
+from src.command_parser import CommandParser
+from src.prefix_index import PrefixIndex
+from src.video_player import VideoPlayer
+
+
+def test_prefix_index_complete():
+    index = PrefixIndex([("cab", 2), ("car", 3), ("ca", 1), ("dog", 4)])
+    assert index.complete("ca", 10) == [1, 2, 3]
+    assert index.complete("ca", 2) == [1, 2]
+    assert index.complete("ca", 10, lambda v: v != 2) == [1, 3]
+    assert index.complete("x", 10) == []
+
+    index.insert("caa", 5)
+    index.remove("car", 3)
+    assert index.complete("ca", 10) == [1, 5, 2]
+    assert len(index) == 4
+
+
+def test_autocomplete_videos(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    parser.execute_command(["AUTOCOMPLETE", "a"])
+    player.flag_video("amazing_cats_video_id")
+    parser.execute_command(["AUTOCOMPLETE", "A", "1"])
+    parser.execute_command(["AUTOCOMPLETE", "z"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert "Here are the completions for a:" in lines[0]
+    assert "Amazing Cats" in lines[1]
+    assert "Another Cat Video" in lines[2]
+    assert "Successfully flagged video: Amazing Cats" in lines[3]
+    assert "Here are the completions for A:" in lines[4]
+    assert "Another Cat Video" in lines[5]
+    assert "No completions for z" in lines[6]
+
+
+def test_autocomplete_playlists(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    player.create_playlist("My_Playlist")
+    player.create_playlist("my_other")
+    player.create_playlist("zzz")
+    player.delete_playlist("my_other")
+    parser.execute_command(["AUTOCOMPLETE_PLAYLIST", "MY"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert "Here are the completions for MY:" in lines[4]
+    assert "My_Playlist" in lines[5]
@@ -0,0 +1,57 @@
+import pytest
+
+from src.bloom_filter import BloomFilter
+from src.command_parser import CommandParser
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_added_keys_are_always_found():
+    bloom = BloomFilter(1000, 0.01)
+    for n in range(1000):
+        bloom.add(f"video_{n}_id")
+    assert all(f"video_{n}_id" in bloom for n in range(1000))
+
+
+def test_false_positive_rate_is_near_the_target():
+    bloom = BloomFilter(5000, 0.01)
+    for n in range(5000):
+        bloom.add(f"video_{n}_id")
+    false_positives = sum(f"other_{n}_id" in bloom for n in range(20000))
+    assert false_positives < 20000 * 0.02
+
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.5)
+
+
+@pytest.mark.parametrize("make_library", [
+    lambda: VideoLibrary(id_filter_rate=0.01),
+    lambda: SqliteVideoLibrary(),
+])
+def test_library_counts_filtered_lookups(make_library):
+    library = make_library()
+    assert library.get_video("amazing_cats_video_id").title == "Amazing Cats"
+    for n in range(100):
+        assert library.get_video(f"random_{n}") is None
+    rejected, passed, false_positives = library.id_filter_stats()
+    assert rejected + passed == 101
+    assert passed - false_positives == 1
+    assert rejected > 90
+
+
+def test_libraries_without_a_filter_count_nothing():
+    library = VideoLibrary()
+    assert library.get_video("random") is None
+    assert library.id_filter_stats() == (0, 0, 0)
+
+
+def test_flag_command_looks_up_the_id_once(capfd):
+    library = SqliteVideoLibrary()
+    parser = CommandParser(VideoPlayer(video_library=library))
+    parser.execute_command(["FLAG_VIDEO", "amazing_cats_video_id"])
+    assert library.id_filter_stats() == (0, 1, 0)
+    parser.execute_command(["FLAG_VIDEO", "random_video_id"])
+    assert library.id_filter_stats() == (1, 1, 0)
+    parser.execute_command(["ALLOW_VIDEO", "amazing_cats_video_id"])
+    assert library.id_filter_stats() == (1, 2, 0)
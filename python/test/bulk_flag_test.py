@@ -0,0 +1,63 @@
+from src.command_parser import CommandParser
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_library_flag_videos_updates_bitmap():
+    library = VideoLibrary()
+    flagged, missing, skipped = library.flag_videos(
+        ["amazing_cats_video_id", "funny_dogs_video_id", "nope"], "spam")
+
+    assert [v.video_id for v in flagged] == [
+        "amazing_cats_video_id", "funny_dogs_video_id"]
+    assert missing == ["nope"]
+    assert skipped == []
+    assert library.is_flagged("amazing_cats_video_id")
+    assert library.get_flag_reason("funny_dogs_video_id") == "spam"
+    assert library.get_video("funny_dogs_video_id").flagged
+    assert len(library.get_allowed_videos()) == 3
+
+    allowed, missing, skipped = library.allow_videos(
+        ["amazing_cats_video_id", "nothing_video_id"])
+    assert [v.video_id for v in allowed] == ["amazing_cats_video_id"]
+    assert skipped == ["nothing_video_id"]
+    assert not library.is_flagged("amazing_cats_video_id")
+    assert library.get_flag_reason("amazing_cats_video_id") == ""
+    assert len(library.get_allowed_videos()) == 4
+
+
+def test_flag_videos_command(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    player.play_video("amazing_cats_video_id")
+    parser.execute_command(["FLAG_VIDEOS", "amazing_cats_video_id",
+                            "funny_dogs_video_id", "nope",
+                            "--reason", "spam"])
+    parser.execute_command(["FLAG_VIDEOS", "funny_dogs_video_id"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert "Playing video: Amazing Cats" in lines[0]
+    assert "Stopping video: Amazing Cats" in lines[1]
+    assert "Successfully flagged 2 videos (reason: spam)" in lines[2]
+    assert "Cannot flag 1 videos: Video does not exist" in lines[3]
+    assert "Successfully flagged 0 videos (reason: Not supplied)" in lines[4]
+    assert "Cannot flag 1 videos: Video is already flagged" in lines[5]
+
+
+def test_allow_videos_command_from_file(capfd, tmp_path):
+    id_file = tmp_path / "ids.txt"
+    id_file.write_text("amazing_cats_video_id\n\nfunny_dogs_video_id\n")
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    parser.execute_command(["FLAG_VIDEOS", "--file", str(id_file)])
+    parser.execute_command(["ALLOW_VIDEOS", "--file", str(id_file),
+                            "nothing_video_id"])
+    player.play_video("funny_dogs_video_id")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "Successfully flagged 2 videos (reason: Not supplied)" in lines[0]
+    assert "Successfully removed flag from 2 videos" in lines[1]
+    assert "Cannot remove flag from 1 videos: Video is not flagged" in lines[2]
+    assert "Playing video: Funny Dogs" in lines[3]
@@ -0,0 +1,93 @@
+import threading
+
+from src.command_deadline import Deadline
+from src.command_deadline import bounded
+from src.command_deadline import command_deadline
+from src.command_deadline import current_deadline
+from src.command_executor import AsyncCommandExecutor
+from src.command_parser import CommandParser
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_bounded_scans_stop_when_the_budget_runs_out():
+    assert list(bounded(range(1000))) == list(range(1000))
+
+    with command_deadline(60) as deadline:
+        assert current_deadline() is deadline
+        assert list(bounded(range(1000))) == list(range(1000))
+        assert not deadline.truncated
+    assert current_deadline() is None
+
+    now = [0.0]
+    deadline = Deadline(1.0, clock=lambda: now[0])
+    assert not deadline.expired()
+    now[0] = 1.0
+    assert deadline.expired()
+
+    with command_deadline(0) as deadline:
+        assert list(bounded(range(1000))) == []
+        assert deadline.truncated
+
+
+def test_deadlines_are_per_thread():
+    seen = []
+    with command_deadline(0):
+        worker = threading.Thread(
+            target=lambda: seen.append(current_deadline()))
+        worker.start()
+        worker.join()
+    assert seen == [None]
+
+
+def test_search_results_are_marked_truncated():
+    player = VideoPlayer()
+    assert not player.find_videos("cat").truncated
+    with command_deadline(0):
+        result = player.find_videos("cat")
+    assert result.truncated
+    assert result.videos == ()
+
+
+def test_queries_and_library_searches_are_bounded():
+    player = VideoPlayer(video_library=SqliteVideoLibrary(),
+                         search_engine="sqlite")
+    for search in (lambda: player.find_videos("cat"),
+                   lambda: player.find_videos_with_tag("#cat"),
+                   lambda: player.find_videos_matching(["title:cat"])):
+        assert len(search().videos) == 2
+        with command_deadline(0):
+            result = search()
+        assert result.truncated
+        assert result.videos == ()
+
+
+def test_commands_over_budget_show_a_truncation_marker(capfd, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda: "no")
+    parser = CommandParser(VideoPlayer(), {"SHOW_ALL_VIDEOS": 0,
+                                           "SEARCH_VIDEOS": 0})
+    parser.execute_command(["SHOW_ALL_VIDEOS"])
+    parser.execute_command(["SEARCH_VIDEOS", "cat"])
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG", "#dog"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines[:4] == [
+        "Here's a list of all available videos:",
+        "Results truncated: the command ran out of time",
+        "No search results for cat",
+        "Results truncated: the command ran out of time",
+    ]
+    assert lines[4] == "Here are the results for #dog:"
+    assert "Results truncated: the command ran out of time" not in lines[4:]
+
+
+def test_budgets_apply_to_concurrent_commands():
+    parser = CommandParser(VideoPlayer(), {"SHOW_ALL_VIDEOS": 0})
+    with AsyncCommandExecutor(parser) as executor:
+        outputs = list(executor.run([["SHOW_ALL_VIDEOS"],
+                                     ["NUMBER_OF_VIDEOS"]]))
+    assert outputs == [
+        "Here's a list of all available videos:\n"
+        "Results truncated: the command ran out of time\n",
+        "5 videos in the library\n",
+    ]
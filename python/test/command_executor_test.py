@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+from src.command_executor import AsyncCommandExecutor
+from src.command_parser import CommandParser
+from src.sqlite_video_library import SqlitePlaylistStore
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_outputs_are_in_submission_order():
+    player = VideoPlayer()
+    commands = [
+        ["CREATE_PLAYLIST", "my_playlist"],
+        ["SHOW_PLAYLIST", "my_playlist"],
+        ["ADD_TO_PLAYLIST", "my_playlist", "amazing_cats_video_id"],
+        ["SHOW_PLAYLIST", "my_playlist"],
+        ["NUMBER_OF_VIDEOS"],
+        ["PLAY"],
+    ]
+    with AsyncCommandExecutor(CommandParser(player)) as executor:
+        outputs = list(executor.run(commands))
+    assert outputs == [
+        "Successfully created new playlist: my_playlist\n",
+        "Showing playlist: my_playlist\n    No videos here yet\n",
+        "Added video to my_playlist: Amazing Cats\n",
+        "Showing playlist: my_playlist\n"
+        "    Amazing Cats (amazing_cats_video_id) [#cat #animal]\n",
+        "5 videos in the library\n",
+        "Please enter PLAY command followed by video_id.\n",
+    ]
+
+
+def test_read_only_commands_run_concurrently():
+    player = VideoPlayer()
+    barrier = threading.Barrier(2, timeout=5)
+    show_all_videos = player.show_all_videos
+
+    def wait_for_each_other():
+        barrier.wait()
+        show_all_videos()
+
+    player.show_all_videos = wait_for_each_other
+    with AsyncCommandExecutor(CommandParser(player)) as executor:
+        outputs = list(executor.run([["SHOW_ALL_VIDEOS"]] * 2))
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count("\n") == 6
+
+
+def test_execute_for_asyncio():
+    async def play_and_show(executor):
+        await executor.execute(["PLAY", "funny_dogs_video_id"])
+        return await executor.execute(["SHOW_PLAYING"])
+
+    player = VideoPlayer()
+    with AsyncCommandExecutor(CommandParser(player)) as executor:
+        output = asyncio.run(play_and_show(executor))
+    assert output == ("Currently playing: Funny Dogs (funny_dogs_video_id) "
+                      "[#dog #animal]\n")
+
+
+def test_sqlite_library_on_pool_threads():
+    player = VideoPlayer("sqlite", SqliteVideoLibrary(),
+                         SqlitePlaylistStore())
+    commands = [["NUMBER_OF_VIDEOS"], ["CREATE_PLAYLIST", "my_playlist"],
+                ["RELATED", "amazing_cats_video_id"],
+                ["AUTOCOMPLETE", "a"]] * 2
+    with AsyncCommandExecutor(CommandParser(player)) as executor:
+        outputs = list(executor.run(commands))
+    assert outputs[0] == "5 videos in the library\n"
+    assert outputs[1] == "Successfully created new playlist: my_playlist\n"
+    assert outputs[2] == outputs[6]
+    assert outputs[3] == outputs[7]
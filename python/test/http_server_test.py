@@ -0,0 +1,109 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from src.http_server import VideoServer
+from src.video_player import VideoPlayer
+
+
+@pytest.fixture
+def connection():
+    server = VideoServer(("127.0.0.1", 0), VideoPlayer())
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1",
+                                            server.server_address[1])
+    yield connection
+    connection.close()
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def request(connection, method, path, body=None, headers=None):
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    return response, json.loads(data) if data else None
+
+
+def test_get_videos(connection):
+    response, videos = request(connection, "GET", "/videos")
+    assert response.status == 200
+    assert len(videos) == 5
+    assert videos[0] == {"video_id": "amazing_cats_video_id",
+                         "title": "Amazing Cats",
+                         "tags": ["#cat", "#animal"],
+                         "flagged": False,
+                         "flag_reason": ""}
+
+
+def test_search_skips_flagged_videos(connection):
+    response, result = request(connection, "GET", "/videos/search?q=cat")
+    assert result["term"] == "cat"
+    assert [video["video_id"] for video in result["videos"]] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+
+    response, body = request(connection, "POST",
+                             "/videos/amazing_cats_video_id/flag",
+                             json.dumps({"reason": "dont_like_cats"}))
+    assert response.status == 200
+    assert body["flagged"]
+    assert body["flag_reason"] == "dont_like_cats"
+
+    response, result = request(connection, "GET", "/videos/tag?tag=%23cat")
+    assert [video["video_id"] for video in result["videos"]] == [
+        "another_cat_video_id"]
+
+
+def test_unknown_video_and_playlist(connection):
+    response, body = request(connection, "POST", "/videos/nope/allow")
+    assert response.status == 404
+    assert body == {"error": "Cannot remove flag from video: "
+                             "Video does not exist"}
+
+    response, body = request(connection, "POST",
+                             "/videos/amazing_cats_video_id/allow")
+    assert response.status == 409
+    assert body == {"error": "Cannot remove flag from video: "
+                             "Video is not flagged"}
+
+    response, body = request(connection, "GET", "/playlists/nope")
+    assert response.status == 404
+    assert body == {"error": "Cannot show playlist nope: "
+                             "Playlist does not exist"}
+
+
+def test_invalid_bodies_are_bad_requests(connection):
+    for body in ("[]", "not json", json.dumps({"reason": 1})):
+        response, answer = request(connection, "POST",
+                                   "/videos/funny_dogs_video_id/flag", body)
+        assert response.status == 400
+        assert answer == {"error": "Invalid JSON body"}
+
+    connection.putrequest("POST", "/videos/funny_dogs_video_id/flag")
+    connection.putheader("Content-Length", "many")
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length"}
+
+
+def test_conditional_get_until_changed(connection):
+    response, _ = request(connection, "GET", "/videos")
+    etag = response.getheader("ETag")
+    assert etag
+
+    response, body = request(connection, "GET", "/videos",
+                             headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert body is None
+
+    request(connection, "POST", "/videos/funny_dogs_video_id/flag")
+    response, videos = request(connection, "GET", "/videos",
+                               headers={"If-None-Match": etag})
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+    assert videos[2]["flagged"]
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from src.command_parser import CommandParser
+from src.video_player import VideoPlayer
+from src.video_playlist import Playlist
+
+
+def test_playlist_cursor_survives_edits():
+    playlist = Playlist("my_playlist")
+    for video_id in ("a", "b", "c", "d"):
+        playlist.add_video(video_id)
+    assert list(playlist.iter_from(0)) == [(0, "a"), (1, "b"), (2, "c"),
+                                           (3, "d")]
+
+    # The next page starts at "c" (cursor 2); removing videos before and
+    # at the cursor doesn't shift or lose it.
+    playlist.remove_video("b")
+    playlist.remove_video("c")
+    playlist.add_video("e")
+    assert list(playlist.iter_from(2)) == [(3, "d"), (4, "e")]
+
+
+def test_show_playlist_pages(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    player.create_playlist("my_playlist")
+    for video_id in ("amazing_cats_video_id", "funny_dogs_video_id",
+                     "nothing_video_id"):
+        player.add_to_playlist("my_playlist", video_id)
+    capfd.readouterr()
+
+    player.show_playlist("my_playlist", 0, page_size=2)
+    parser.execute_command(["SHOW_PLAYLIST", "my_playlist", "--page", "2"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert "Showing playlist: my_playlist" in lines[0]
+    assert "Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[1]
+    assert "Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[2]
+    assert "More videos, continue with --page 2" in lines[3]
+    assert "Showing playlist: my_playlist" in lines[4]
+    assert "Video about nothing (nothing_video_id) []" in lines[5]
+
+
+@mock.patch('builtins.input', lambda *args: '1')
+def test_search_videos_pages(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    player.flag_video("amazing_cats_video_id")
+    player.search_videos("o", 0, page_size=2)
+    parser.execute_command(["SEARCH_VIDEOS", "o", "--page", "3"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 15
+    assert "Here are the results for o:" in lines[1]
+    assert "1) Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[2]
+    assert "2) Another Cat Video (another_cat_video_id) [#cat #animal]" \
+        in lines[3]
+    assert "More results, continue with --page 3" in lines[4]
+    assert "Playing video: Funny Dogs" in lines[7]
+    assert "Here are the results for o:" in lines[8]
+    assert "1) Life at Google (life_at_google_video_id) [#google #career]" \
+        in lines[9]
+    assert "2) Video about nothing (nothing_video_id) []" in lines[10]
+    assert "Stopping video: Funny Dogs" in lines[13]
+    assert "Playing video: Life at Google" in lines[14]
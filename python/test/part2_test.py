@@ -235,3 +235,22 @@ def test_delete_playlist_nonexistent(capfd):
     lines = out.splitlines()
     assert len(lines) == 1
     assert "Cannot delete playlist my_cool_playlist: Playlist does not exist" in lines[0]
+
+
+def test_playlist_names_are_case_folded(capfd):
+    player = VideoPlayer()
+    player.create_playlist("Straße")
+    player.create_playlist("STRASSE")
+    player.create_playlist("b_playlist")
+    player.create_playlist("A_playlist")
+    player.delete_playlist("b_PLAYLIST")
+    player.show_all_playlists()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 8
+    assert ("Cannot create playlist: A playlist with the same name already "
+            "exists") in lines[1]
+    assert "Deleted playlist: b_PLAYLIST" in lines[4]
+    assert "Showing all playlists:" in lines[5]
+    assert "A_playlist" in lines[6]
+    assert "Straße" in lines[7]
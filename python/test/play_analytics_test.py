@@ -0,0 +1,82 @@
+from src.command_parser import CommandParser
+from src.play_analytics import CountMinSketch
+from src.play_analytics import PlayAnalytics
+from src.play_analytics import SpaceSaving
+from src.video_player import VideoPlayer
+
+
+def test_count_min_sketch_never_undercounts():
+    sketch = CountMinSketch(width=16, depth=3)
+    for n in range(200):
+        sketch.add(f"video_{n % 50}", n % 5 + 1)
+    for n in range(50):
+        assert sketch.estimate(f"video_{n}") >= 4 * (n % 5 + 1)
+    assert sketch.estimate("never_counted") >= 0
+
+
+def test_space_saving_keeps_heavy_hitters():
+    summary = SpaceSaving(capacity=5)
+    for n in range(1000):
+        summary.add("popular" if n % 3 == 0 else f"video_{n}")
+    counts = dict(summary.items())
+    assert len(summary) == 5
+    assert counts["popular"] >= 334
+
+
+def test_trending_decays_old_plays():
+    now = [0.0]
+    analytics = PlayAnalytics(half_life=10.0, clock=lambda: now[0])
+    for _ in range(4):
+        analytics.record_play("old")
+    now[0] = 20.0
+    for _ in range(2):
+        analytics.record_play("new")
+
+    assert analytics.top_played() == [("old", 4.0), ("new", 2.0)]
+    assert analytics.trending() == [("new", 2.0), ("old", 1.0)]
+
+    # Far enough ahead that the weights are rescaled.
+    now[0] = 500.0
+    analytics.record_play("newest")
+    assert analytics.trending()[0] == ("newest", 1.0)
+    assert analytics.top_played()[0] == ("old", 4.0)
+
+
+def test_trending_survives_long_idle_gaps():
+    now = [0.0]
+    analytics = PlayAnalytics(half_life=60.0, clock=lambda: now[0])
+    analytics.record_play("old")
+    # About 17 hours, more than 1024 half-lives.
+    now[0] = 62000.0
+    assert analytics.trending() == []
+    analytics.record_play("new")
+    assert analytics.trending() == [("new", 1.0)]
+
+    now[0] += 60.0 * 100
+    analytics.record_play("newer")
+    assert analytics.trending()[0] == ("newer", 1.0)
+    assert analytics.top_played()[0][1] == 1.0
+
+
+def test_top_played_and_trending_commands(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    parser.execute_command(["TOP_PLAYED"])
+    for video_id in ("funny_dogs_video_id", "amazing_cats_video_id",
+                     "funny_dogs_video_id", "life_at_google_video_id"):
+        parser.execute_command(["PLAY", video_id])
+    parser.execute_command(["FLAG_VIDEO", "life_at_google_video_id"])
+    capfd.readouterr()
+
+    parser.execute_command(["TOP_PLAYED"])
+    parser.execute_command(["TRENDING", "1"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines == [
+        "Top played videos:",
+        "    1) Funny Dogs (funny_dogs_video_id) [#dog #animal] - 2 plays",
+        "    2) Amazing Cats (amazing_cats_video_id) [#cat #animal] - 1 plays",
+        "Trending videos:",
+        "    1) Funny Dogs (funny_dogs_video_id) [#dog #animal] - "
+        "2.0 recent plays",
+    ]
@@ -0,0 +1,59 @@
+from src.command_parser import CommandParser
+from src.playback_queue import PlaybackQueue
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_queue_skips_missing_and_flagged_videos():
+    library = VideoLibrary()
+    queue = PlaybackQueue(
+        "my_playlist",
+        ["amazing_cats_video_id", "does_not_exist", "funny_dogs_video_id",
+         "nothing_video_id"],
+        library, prefetch=2)
+    assert queue.next_video().video_id == "amazing_cats_video_id"
+
+    # Flagged after being prefetched.
+    library.flag_videos(["funny_dogs_video_id"])
+    assert queue.next_video().video_id == "nothing_video_id"
+    assert queue.next_video() is None
+    assert queue.previous_video().video_id == "amazing_cats_video_id"
+    assert queue.previous_video() is None
+    assert queue.next_video().video_id == "nothing_video_id"
+
+
+def test_play_playlist_next_previous(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    player.create_playlist("my_playlist")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    parser.execute_command(["PLAY_PLAYLIST", "MY_playlist"])
+    parser.execute_command(["NEXT"])
+    parser.execute_command(["NEXT"])
+    parser.execute_command(["PREVIOUS"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 10
+    assert "Playing playlist: MY_playlist" in lines[3]
+    assert "Playing video: Amazing Cats" in lines[4]
+    assert "Stopping video: Amazing Cats" in lines[5]
+    assert "Playing video: Funny Dogs" in lines[6]
+    assert "Reached the end of playlist: MY_playlist" in lines[7]
+    assert "Stopping video: Funny Dogs" in lines[8]
+    assert "Playing video: Amazing Cats" in lines[9]
+
+
+def test_play_playlist_errors(capfd):
+    player = VideoPlayer()
+    player.next_video()
+    player.play_playlist("my_playlist")
+    player.create_playlist("my_playlist")
+    player.play_playlist("my_playlist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "Cannot play next video: No playlist is being played" in lines[0]
+    assert "Cannot play playlist my_playlist: Playlist does not exist" \
+        in lines[1]
+    assert "Cannot play playlist my_playlist: No videos to play" in lines[3]
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+from src.command_parser import CommandParser
+from src.random_sampler import ShuffleBagSampler
+from src.random_sampler import UniformSampler
+from src.random_sampler import WeightedSampler
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_uniform_sampler_skips_flagged_videos():
+    library = VideoLibrary()
+    library.flag_videos(["funny_dogs_video_id", "amazing_cats_video_id",
+                         "another_cat_video_id", "life_at_google_video_id"])
+    sampler = UniformSampler(library)
+    assert sampler.sample().video_id == "nothing_video_id"
+
+    library.flag_videos(["nothing_video_id"])
+    assert sampler.sample() is None
+
+
+def test_weighted_sampler_follows_weights():
+    random.seed(1)
+    library = VideoLibrary()
+    sampler = WeightedSampler(library, weights=[0, 0, 0, 0, 1])
+    assert all(sampler.sample().video_id == "nothing_video_id"
+               for _ in range(50))
+
+
+def test_weighted_sampler_records_plays():
+    random.seed(1)
+    library = VideoLibrary()
+    sampler = WeightedSampler(library, weights=[1, 0, 0, 0, 0])
+    for _ in range(3):
+        sampler.record_play("amazing_cats_video_id")
+    assert sampler.get_weight("amazing_cats_video_id") == 3
+
+    counts = Counter(sampler.sample().video_id for _ in range(4000))
+    assert set(counts) == {"funny_dogs_video_id", "amazing_cats_video_id"}
+    assert 2.5 < counts["amazing_cats_video_id"] / \
+        counts["funny_dogs_video_id"] < 3.5
+
+    # Enough plays fold into the weights and rebuild the alias table.
+    sampler.record_play("nothing_video_id")
+    sampler.record_play("nothing_video_id")
+    assert sampler.get_weight("amazing_cats_video_id") == 3
+    assert sampler.get_weight("nothing_video_id") == 2
+
+
+def test_shuffle_bag_has_no_repeats_until_exhausted():
+    library = VideoLibrary()
+    library.flag_videos(["funny_dogs_video_id"])
+    sampler = ShuffleBagSampler(library)
+    first_round = [sampler.sample().video_id for _ in range(4)]
+    assert len(set(first_round)) == 4
+    assert "funny_dogs_video_id" not in first_round
+    assert sampler.sample().video_id in first_round
+
+
+def test_play_random_shuffle_command(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    for _ in range(5):
+        parser.execute_command(["PLAY_RANDOM", "SHUFFLE"])
+    out, err = capfd.readouterr()
+    played = [line for line in out.splitlines()
+              if line.startswith("Playing video:")]
+    assert len(set(played)) == 5
+
+
+def test_weighted_sampler_starts_from_earlier_plays():
+    random.seed(1)
+    player = VideoPlayer()
+    for _ in range(30):
+        player.play("another_cat_video_id")
+    counts = Counter(player.play_random("weighted").video.video_id
+                     for _ in range(100))
+    assert counts.most_common(1)[0][0] == "another_cat_video_id"
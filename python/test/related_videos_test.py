@@ -0,0 +1,57 @@
+from src.command_parser import CommandParser
+from src.related_videos import RelatedVideos
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_related_prefers_rare_shared_tags():
+    library = VideoLibrary()
+    related = RelatedVideos(library)
+    # "#cat" is rarer than "#animal", so the other cat video comes first.
+    assert _ids(related.related("amazing_cats_video_id", 5)) == [
+        "another_cat_video_id", "funny_dogs_video_id"]
+    assert _ids(related.related("amazing_cats_video_id", 1)) == [
+        "another_cat_video_id"]
+    assert related.related("nothing_video_id", 5) == []
+    assert related.related("life_at_google_video_id", 5) == []
+
+
+def test_related_follows_flags():
+    library = VideoLibrary()
+    related = RelatedVideos(library)
+    assert _ids(related.related("funny_dogs_video_id", 5)) == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+
+    library.flag_videos(["amazing_cats_video_id"])
+    related.flagged("amazing_cats_video_id")
+    assert _ids(related.related("funny_dogs_video_id", 5)) == [
+        "another_cat_video_id"]
+
+    library.allow_videos(["amazing_cats_video_id"])
+    related.allowed("amazing_cats_video_id")
+    assert _ids(related.related("funny_dogs_video_id", 5)) == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+
+
+def test_related_command(capfd):
+    player = VideoPlayer()
+    parser = CommandParser(player)
+    parser.execute_command(["RELATED", "amazing_cats_video_id", "1"])
+    player.flag_video("another_cat_video_id")
+    parser.execute_command(["RELATED", "amazing_cats_video_id"])
+    parser.execute_command(["RELATED", "nothing_video_id"])
+    parser.execute_command(["RELATED", "does_not_exist"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert "Here are the videos related to Amazing Cats:" in lines[0]
+    assert "Another Cat Video (another_cat_video_id) [#cat #animal]" \
+        in lines[1]
+    assert "Here are the videos related to Amazing Cats:" in lines[3]
+    assert "Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[4]
+    assert "No related videos for Video about nothing" in lines[5]
+    assert "Cannot show related videos: Video does not exist" in lines[6]
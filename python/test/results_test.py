@@ -0,0 +1,125 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
+from dataclasses import asdict
+
+import pytest
+
+from src.results import CONFLICT
+from src.results import NOT_FOUND
+from src.results import ErrorResult
+from src.results import PlaylistResult
+from src.results import SearchResult
+from src.results import VideoResult
+from src.video_player import VideoPlayer
+from src.video_playlist import PlaylistStore
+
+
+def test_api_returns_results_without_printing(capfd):
+    player = VideoPlayer()
+    result = player.find_videos("cat")
+    assert isinstance(result, SearchResult)
+    assert [video.video_id for video in result.videos] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert player.new_playlist("My_Playlist") == PlaylistResult(
+        "My_Playlist", ())
+    assert player.add_video("my_playlist",
+                            "amazing_cats_video_id").title == "Amazing Cats"
+    assert player.get_playlists() == [
+        PlaylistResult("My_Playlist", ("amazing_cats_video_id",))]
+
+    out, err = capfd.readouterr()
+    assert out == ""
+
+
+def test_errors_render_like_the_commands(capfd):
+    player = VideoPlayer()
+    error = player.add_video("nope", "amazing_cats_video_id")
+    assert error == ErrorResult(NOT_FOUND, "add video to nope",
+                                "Playlist does not exist")
+    assert player.flag("nope").kind == NOT_FOUND
+    assert player.allow("funny_dogs_video_id").kind == CONFLICT
+
+    player.add_to_playlist("nope", "amazing_cats_video_id")
+    out, err = capfd.readouterr()
+    assert out == str(error) + "\n"
+
+
+def test_video_results_are_snapshots():
+    player = VideoPlayer()
+    before = player.get_video("funny_dogs_video_id")
+    flagged = player.flag("funny_dogs_video_id", "dont_like_dogs")
+
+    assert not before.flagged
+    assert flagged.flagged
+    assert asdict(flagged) == {"video_id": "funny_dogs_video_id",
+                               "title": "Funny Dogs",
+                               "tags": ("#dog", "#animal"),
+                               "flagged": True,
+                               "flag_reason": "dont_like_dogs"}
+    assert str(flagged) == ("Funny Dogs (funny_dogs_video_id) "
+                            "[#dog #animal] - FLAGGED "
+                            "(reason: dont_like_dogs)")
+    assert isinstance(player.flag("funny_dogs_video_id"), ErrorResult)
+    assert not hasattr(VideoResult("a", "A", (), False, ""), "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        flagged.flagged = False
+
+
+def test_results_can_be_pickled_and_copied():
+    player = VideoPlayer()
+    video = player.get_video("funny_dogs_video_id")
+    str(video)
+    player.new_playlist("My_Playlist")
+    results = [video, player.flag("nope"), player.get_playlists()[0],
+               player.find_videos("cat"), player.play("amazing_cats_video_id")]
+    for result in results:
+        for clone in (pickle.loads(pickle.dumps(result)), copy.copy(result),
+                      copy.deepcopy(result)):
+            assert clone == result
+            assert str(clone) == str(result)
+    with pytest.raises(FrozenInstanceError):
+        copy.copy(video).title = "Other"
+
+
+def test_playlist_skips_videos_missing_from_the_catalog():
+    store = PlaylistStore()
+    playlist = store.create("my_playlist", "My_Playlist")
+    playlist.add_video("gone_video_id")
+    playlist.add_video("amazing_cats_video_id")
+    store.load = lambda: {"my_playlist": playlist}
+
+    page = VideoPlayer(playlist_store=store).get_playlist("my_playlist")
+    assert [video.video_id for video in page.videos] == [
+        "amazing_cats_video_id"]
+
+
+def test_playback_and_bulk_commands_return_results(capfd):
+    player = VideoPlayer()
+    assert player.get_playing() is None
+    assert player.stop().kind == CONFLICT
+
+    played = player.play("amazing_cats_video_id")
+    assert played.video.title == "Amazing Cats"
+    assert played.stopped is None
+    assert player.play("funny_dogs_video_id").stopped == played.video
+    assert not player.pause().playing
+    assert not player.pause().playing
+    assert player.unpause().playing
+    assert player.stop().video_id == "funny_dogs_video_id"
+
+    assert [entry.video.video_id for entry in player.get_history()] == [
+        "funny_dogs_video_id", "amazing_cats_video_id"]
+    assert [video.title for video in player.complete_titles("a")] == [
+        "Amazing Cats", "Another Cat Video"]
+
+    result = player.flag_many(["funny_dogs_video_id", "nope",
+                               "funny_dogs_video_id"])
+    assert [video.video_id for video in result.changed] == [
+        "funny_dogs_video_id"]
+    assert result.missing == ("nope",)
+    assert player.flag_many(["funny_dogs_video_id"]).skipped == (
+        "funny_dogs_video_id",)
+
+    out, err = capfd.readouterr()
+    assert out == ""
@@ -0,0 +1,57 @@
+import pytest
+
+from src.search_engine import create_search_engine
+from src.video_library import VideoLibrary
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine_name(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_search_title(engine_name):
+    engine = create_search_engine(engine_name, VideoLibrary())
+    assert _ids(engine.search_title("CaT")) == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert engine.search_title("blah") == []
+
+
+def test_search_tag(engine_name):
+    engine = create_search_engine(engine_name, VideoLibrary())
+    assert _ids(engine.search_tag("#animal")) == [
+        "funny_dogs_video_id", "amazing_cats_video_id",
+        "another_cat_video_id"]
+    assert engine.search_tag("#blah") == []
+
+
+def test_flags_are_seen_without_rebuilding(engine_name):
+    library = VideoLibrary()
+    engine = create_search_engine(engine_name, library)
+    library.flag_videos(["amazing_cats_video_id"])
+    assert _ids(engine.search_title("cat")) == ["another_cat_video_id"]
+    assert _ids(engine.search_tag("#cat")) == ["another_cat_video_id"]
+    assert len(engine.allowed_videos()) == 4
+
+    library.allow_videos(["amazing_cats_video_id"])
+    assert len(engine.allowed_videos()) == 5
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        create_search_engine("blah", VideoLibrary())
+
+
+def test_search_title_from_row(engine_name):
+    library = VideoLibrary()
+    engine = create_search_engine(engine_name, library)
+    library.flag_videos(["another_cat_video_id"])
+    assert _ids(engine.search_title("o", 1, 2)) == [
+        "life_at_google_video_id", "nothing_video_id"]
+    assert _ids(engine.search_title("o", 0, 1)) == ["funny_dogs_video_id"]
+    assert engine.search_title("o", 5) == []
@@ -0,0 +1,74 @@
+import io
+from unittest import mock
+
+from src.replay import read_log
+from src.replay import replay
+from src.session_recorder import RecordingCommandParser
+from src.video_player import VideoPlayer
+
+
+@mock.patch('builtins.input', lambda *args: '2')
+def test_records_commands_and_answers(capfd):
+    log = io.StringIO()
+    parser = RecordingCommandParser(VideoPlayer(), log, "session-1", seed=7)
+    parser.execute_command(["SEARCH_VIDEOS", "cat"])
+    parser.execute_command(["PLAY_RANDOM"])
+
+    log.seek(0)
+    records = read_log(log)
+    assert records[0] == {"session": "session-1", "seed": 7}
+    assert records[1]["command"] == ["SEARCH_VIDEOS", "cat"]
+    assert records[1]["answers"] == ["2"]
+    assert records[2]["command"] == ["PLAY_RANDOM"]
+    assert records[2]["answers"] == []
+    assert records[1]["time"] <= records[2]["time"]
+
+
+def test_replay_is_deterministic(capfd):
+    records = [
+        {"session": "a", "seed": 3},
+        {"session": "a", "time": 0.0, "command": ["PLAY_RANDOM"],
+         "answers": []},
+        {"session": "b", "time": 0.0, "command": ["SEARCH_VIDEOS", "cat"],
+         "answers": ["1"]},
+        {"session": "a", "time": 0.01, "command": ["PLAY"], "answers": []},
+    ]
+    players = []
+
+    def player_factory():
+        players.append(VideoPlayer())
+        return players[-1]
+
+    report = replay(records, paced=True, player_factory=player_factory)
+    assert report.commands == 3
+    assert report.percentile(50) <= report.percentile(99)
+    assert "3 commands in" in str(report)
+    assert players[1]._current_video_id == "amazing_cats_video_id"
+
+    first_random = players[0]._current_video_id
+    players.clear()
+    replay(records, player_factory=player_factory)
+    assert players[0]._current_video_id == first_random
+
+
+def test_replay_repeats_the_random_picks_of_every_session(capfd):
+    log = io.StringIO()
+    recorded = []
+    for session, seed in (("session-1", 1), ("session-2", 2)):
+        player = VideoPlayer()
+        parser = RecordingCommandParser(player, log, session, seed=seed)
+        for _ in range(5):
+            parser.execute_command(["PLAY_RANDOM"])
+        recorded.append(player)
+
+    players = []
+
+    def player_factory():
+        players.append(VideoPlayer())
+        return players[-1]
+
+    log.seek(0)
+    replay(read_log(log), player_factory=player_factory)
+    for player, replayed in zip(recorded, players):
+        assert [entry.video.video_id for entry in replayed.get_history()] \
+            == [entry.video.video_id for entry in player.get_history()]
@@ -0,0 +1,49 @@
+import pytest
+
+from src.search_engine import create_search_engine
+from src.sharded_video_library import ShardedVideoLibrary
+from src.sharded_video_library import shard_of
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+@pytest.fixture(params=[1, 3])
+def library(request):
+    with ShardedVideoLibrary(shards=request.param) as library:
+        yield library
+
+
+def test_searches_match_an_unsharded_library(library):
+    plain = create_search_engine("python", VideoLibrary())
+    sharded = create_search_engine("sharded", library)
+    for term in ("a", "CAT", "blah"):
+        assert _ids(sharded.search_title(term)) == _ids(
+            plain.search_title(term))
+    for tag in ("#animal", "#blah"):
+        assert _ids(sharded.search_tag(tag)) == _ids(plain.search_tag(tag))
+    assert _ids(sharded.videos_by_title()) == _ids(plain.videos_by_title())
+    assert _ids(sharded.search_title("o", 1, 2)) == _ids(
+        plain.search_title("o", 1, 2))
+
+    library.flag_videos(["amazing_cats_video_id"])
+    assert _ids(sharded.search_title("cat")) == ["another_cat_video_id"]
+
+
+def test_player_lists_videos_by_title(library, capfd):
+    player = VideoPlayer(search_engine="sharded", video_library=library)
+    player.show_all_videos()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert lines[1] == "    Amazing Cats (amazing_cats_video_id) [#cat #animal]"
+    assert lines[5] == "    Video about nothing (nothing_video_id) []"
+
+
+def test_shard_of_is_stable():
+    assert shard_of("amazing_cats_video_id", 4) == shard_of(
+        "amazing_cats_video_id", 4)
+    assert {shard_of(f"video_{n}_id", 4) for n in range(100)} == {0, 1, 2, 3}
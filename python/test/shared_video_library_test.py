@@ -0,0 +1,79 @@
+import multiprocessing
+
+import pytest
+
+from src.shared_video_library import SharedVideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _count_cat_videos(name, results):
+    library = SharedVideoLibrary.attach(name)
+    results.put(sum("#cat" in video.tags
+                    for video in library.get_all_videos()))
+    library.close()
+
+
+def test_attached_library_reads_catalog():
+    with SharedVideoLibrary.create() as shared:
+        library = SharedVideoLibrary.attach(shared.name)
+        assert len(library.get_all_videos()) == 5
+        video = library.get_video("amazing_cats_video_id")
+        assert video.title == "Amazing Cats"
+        assert video.tags == ("#cat", "#animal")
+        assert library.get_video("nothing_video_id").tags == ()
+        assert library.get_video("does_not_exist") is None
+        library.close()
+
+
+def test_flags_are_per_process_and_seen_by_held_videos():
+    with SharedVideoLibrary.create() as shared:
+        library = SharedVideoLibrary.attach(shared.name)
+        video = library.get_video("funny_dogs_video_id")
+        library.flag_videos(["funny_dogs_video_id"], "dont_like_dogs")
+        assert video.flagged
+        assert video.flag_reason == "dont_like_dogs"
+        assert len(library.get_allowed_videos()) == 4
+        assert not shared.get_video("funny_dogs_video_id").flagged
+        library.close()
+
+
+def test_player_on_shared_library(capfd):
+    with SharedVideoLibrary.create() as shared:
+        player = VideoPlayer(video_library=shared)
+        player.play_video("amazing_cats_video_id")
+        player.show_playing()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 2
+    assert "Playing video: Amazing Cats" in lines[0]
+    assert "Currently playing: Amazing Cats (amazing_cats_video_id) " \
+           "[#cat #animal]" in lines[1]
+
+
+def test_player_builds_videos_on_demand(capfd):
+    with SharedVideoLibrary.create() as shared:
+        library = SharedVideoLibrary.attach(shared.name)
+        loaded = []
+        load_video = library._load_video
+        library._load_video = lambda row: loaded.append(row) or \
+            load_video(row)
+
+        player = VideoPlayer(video_library=library)
+        assert loaded == []
+        for mode in ("uniform", "weighted", "shuffle"):
+            player.play_random_video(mode)
+        assert len(set(loaded)) <= 3
+        library.close()
+
+
+def test_worker_process_attaches():
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs the fork start method")
+    context = multiprocessing.get_context("fork")
+    with SharedVideoLibrary.create() as shared:
+        results = context.Queue()
+        worker = context.Process(target=_count_cat_videos,
+                                 args=(shared.name, results))
+        worker.start()
+        assert results.get(timeout=10) == 2
+        worker.join()
@@ -0,0 +1,85 @@
+from src.search_engine import create_search_engine
+from src.sqlite_video_library import SqlitePlaylistStore
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.sqlite_video_library import connect
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_imports_videos_once(tmp_path):
+    database = tmp_path / "videos.db"
+    library = SqliteVideoLibrary(connect(database))
+    assert len(library.get_all_videos()) == 5
+    library = SqliteVideoLibrary(connect(database))
+    assert len(library.get_all_videos()) == 5
+
+    video = library.get_video("amazing_cats_video_id")
+    assert video.title == "Amazing Cats"
+    assert video.tags == ("#cat", "#animal")
+    assert library.get_video("nothing_video_id").tags == ()
+    assert library.get_video("does_not_exist") is None
+
+
+
+def test_imports_repeated_ids_like_the_memory_library(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("First | a | #x\nSecond | b |\nAgain | a | #y\n")
+    library = SqliteVideoLibrary(video_file_path=video_file)
+    expected = VideoLibrary(video_file)
+    assert [(video.video_id, video.title, video.tags)
+            for video in library.get_all_videos()] == [
+        (video.video_id, video.title, video.tags)
+        for video in expected.get_all_videos()]
+    assert library.get_video("a").title == "Again"
+    assert _ids(library.search_tag("#y")) == ["a"]
+    assert library.search_tag("#x") == []
+
+def test_search_titles_and_tags():
+    library = SqliteVideoLibrary()
+    assert _ids(library.search_titles("CAT")) == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert _ids(library.search_titles("a")) == [
+        "amazing_cats_video_id",
+        "another_cat_video_id", "life_at_google_video_id",
+        "nothing_video_id"]
+    assert _ids(library.search_tag("#animal")) == [
+        "funny_dogs_video_id", "amazing_cats_video_id",
+        "another_cat_video_id"]
+
+    engine = create_search_engine("sqlite", library)
+    library.flag_videos(["amazing_cats_video_id"])
+    assert _ids(engine.search_title("cat")) == ["another_cat_video_id"]
+    assert _ids(engine.search_title("video", 2, 1)) == [
+        "another_cat_video_id"]
+    assert _ids(engine.search_tag("#cat")) == ["another_cat_video_id"]
+
+
+def test_playlists_persist(tmp_path, capfd):
+    connection = connect(tmp_path / "videos.db")
+    library = SqliteVideoLibrary(connection)
+    player = VideoPlayer("sqlite", library, SqlitePlaylistStore(connection))
+    player.create_playlist("My_Playlist")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    player.add_to_playlist("my_playlist", "nothing_video_id")
+    player.remove_from_playlist("my_playlist", "funny_dogs_video_id")
+    player.create_playlist("deleted")
+    player.delete_playlist("deleted")
+    capfd.readouterr()
+
+    connection = connect(tmp_path / "videos.db")
+    player = VideoPlayer("sqlite", SqliteVideoLibrary(connection),
+                         SqlitePlaylistStore(connection))
+    player.show_all_playlists()
+    player.show_playlist("my_playlist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 5
+    assert "Showing all playlists:" in lines[0]
+    assert "My_Playlist" in lines[1]
+    assert "Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[3]
+    assert "Video about nothing (nothing_video_id) []" in lines[4]
@@ -0,0 +1,35 @@
+import pytest
+
+from src.static_id_index import StaticIdIndex
+from src.video_library import VideoLibrary
+
+
+def test_finds_every_id_and_rejects_others():
+    ids = [f"video_{n}_id" for n in range(5000)]
+    index = StaticIdIndex(ids)
+    assert len(index) == 5000
+    assert all(index.find(video_id) == row
+               for row, video_id in enumerate(ids))
+    assert not any(index.find(f"video_{n}_id") is not None
+                   for n in range(5000, 6000))
+
+
+def test_small_indexes():
+    assert StaticIdIndex([]).find("a") is None
+    assert StaticIdIndex(["a"]).find("a") == 0
+    assert StaticIdIndex(["a"]).find("b") is None
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        StaticIdIndex(["a", "b", "a"])
+
+
+def test_library_looks_up_rows(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("First | a | #x\nSecond | b |\nAgain | a | #y\n")
+    library = VideoLibrary(video_file)
+    assert len(library) == 2
+    assert library.get_row("b") == 1
+    assert library.get_video("a").title == "Again"
+    assert library.get_video("c") is None
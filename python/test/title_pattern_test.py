@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from src.command_parser import CommandParser
+from src.search_engine import create_search_engine
+from src.title_pattern import TitlePattern
+from src.title_pattern import TitlePatternError
+from src.title_pattern import TitleSearchTimeout
+from src.video import Video
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_required_trigrams():
+    assert TitlePattern("^amazing.*cats?$").trigrams == {"ama", "maz", "cat"}
+    # Trigrams with "i" or "s" are left out, see _PLAIN_CHARACTERS.
+    assert TitlePattern("(DOG|cat) video").trigrams == {"deo"}
+    assert TitlePattern("(?:funny){2}").trigrams == {"fun", "unn", "nny"}
+    assert TitlePattern("(?!cat)dog").trigrams == {"dog"}
+    assert TitlePattern("a(bcd)?e").trigrams == set()
+    assert TitlePattern("x[yz]w+").trigrams == set()
+
+
+def test_unusable_patterns_are_rejected():
+    with pytest.raises(TitlePatternError):
+        TitlePattern("(cat")
+    with pytest.raises(TitlePatternError):
+        TitlePattern("(a+)+$")
+    with pytest.raises(TitlePatternError):
+        TitlePattern("(?:a|b*)*")
+    with pytest.raises(TitlePatternError):
+        TitlePattern("(a|a)+b")
+    with pytest.raises(TitlePatternError):
+        TitlePattern("(?:cat|c.t)*")
+    TitlePattern("(a{3})+ .* .*")
+    TitlePattern("(cat|dog)+ (a|b)*")
+
+
+def test_filter_stops_at_the_deadline():
+    pattern = TitlePattern("cat")
+    videos = [Video("Cat", f"video_{n}_id", []) for n in range(1000)]
+    assert len(pattern.filter(videos, time.monotonic() + 60)) == 1000
+    with pytest.raises(TitleSearchTimeout):
+        pattern.filter(videos, time.monotonic() - 1)
+
+
+@pytest.mark.parametrize("engine", ["indexed", "numpy"])
+def test_engines_match_the_python_engine(engine):
+    library = VideoLibrary()
+    plain = create_search_engine("python", library)
+    other = create_search_engine(engine, library)
+    if engine == "indexed":
+        other.warm_up.wait(timeout=10)
+    library.flag_videos(["another_cat_video_id"])
+    for pattern in ("^amazing.*cats?$", "CAT", "o.*o", "^(funny|life)",
+                    "blah", "google$"):
+        title_pattern = TitlePattern(pattern)
+        assert _ids(other.search_regex(title_pattern)) == _ids(
+            plain.search_regex(title_pattern))
+
+
+def test_search_videos_regex_command(capfd, monkeypatch):
+    parser = CommandParser(VideoPlayer(search_engine="indexed"))
+    monkeypatch.setattr("builtins.input", lambda: "1")
+    parser.execute_command(["SEARCH_VIDEOS_REGEX", "^amazing.*cats?$"])
+    parser.execute_command(["SEARCH_VIDEOS_REGEX", "(a+)+"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines[0] == "Here are the results for ^amazing.*cats?$:"
+    assert lines[1] == "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]"
+    assert lines[4] == "Playing video: Amazing Cats"
+    assert lines[5] == ("Cannot search videos: Pattern repeats a repeat, "
+                        "which can take exponential time")
@@ -0,0 +1,66 @@
+from unittest import mock
+
+import pytest
+
+from src.command_parser import CommandParser
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from src.video_query import QueryEngine
+from src.video_query import QuerySyntaxError
+from src.video_query import parse_query
+
+
+def _run(engine, query):
+    plan = engine.plan(parse_query(query.split()))
+    return [video.video_id for video in engine.run(plan)]
+
+
+def test_parse_query_errors():
+    for query in ("", "title:", "title:cat tag:#cat", "NOT tag:#cat",
+                  "foo:bar", "title:cat AND", "title:cat NOT NOT tag:#a"):
+        with pytest.raises(QuerySyntaxError):
+            parse_query(query.split())
+
+
+def test_queries():
+    library = VideoLibrary()
+    engine = QueryEngine(library)
+    assert _run(engine, "title:cat AND tag:#animal NOT tag:#dog") == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert _run(engine, "tag:#animal NOT title:cats") == [
+        "funny_dogs_video_id", "another_cat_video_id"]
+    assert _run(engine, "title:o AND NOT tag:#animal") == [
+        "life_at_google_video_id", "nothing_video_id"]
+    assert _run(engine, "tag:#cat and tag:#dog") == []
+
+    library.flag_videos(["amazing_cats_video_id"])
+    assert _run(engine, "tag:#cat") == ["another_cat_video_id"]
+
+
+def test_plan_starts_with_most_selective_tag():
+    engine = QueryEngine(VideoLibrary())
+    plan = engine.plan(parse_query(
+        "title:cat AND tag:#animal NOT tag:#dog AND tag:#cat".split()))
+    assert str(plan).splitlines() == [
+        "1. INDEX tag:#cat (est. 2 rows)",
+        "2. INTERSECT tag:#animal (est. 3 rows)",
+        "3. EXCLUDE NOT tag:#dog (est. 1 rows)",
+        "4. FILTER title:cat (est. 2 rows)",
+    ]
+
+
+@mock.patch('builtins.input', lambda *args: 'No')
+def test_query_command(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["QUERY", "EXPLAIN", "tag:#dog"])
+    parser.execute_command(["QUERY", "tag:#dog"])
+    parser.execute_command(["QUERY", "tag:"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert "Query plan for tag:#dog:" in lines[0]
+    assert "1. INDEX tag:#dog (est. 1 rows)" in lines[1]
+    assert "Here are the results for tag:#dog:" in lines[2]
+    assert "1) Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[3]
+    assert "Cannot run query: Expected title:<term> or tag:<tag>, got tag:" \
+        in lines[6]
@@ -0,0 +1,14 @@
+from src.video import Video
+
+
+def test_str_is_memoized_and_follows_flags():
+    video = Video("Amazing Cats", "amazing_cats_video_id", ["#cat", "#animal"])
+    rendered = str(video)
+    assert rendered == "Amazing Cats (amazing_cats_video_id) [#cat #animal]"
+    assert str(video) is rendered
+
+    video.flag("dont_like_cats")
+    assert str(video) == ("Amazing Cats (amazing_cats_video_id) "
+                          "[#cat #animal] - FLAGGED (reason: dont_like_cats)")
+    video.allow()
+    assert str(video) == rendered
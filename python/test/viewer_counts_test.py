@@ -0,0 +1,62 @@
+import pickle
+
+import pytest
+
+from src.command_parser import CommandParser
+from src.video_player import VideoPlayer
+from src.viewer_counts import HyperLogLog
+from src.viewer_counts import ViewerCounts
+
+
+def test_small_counts_stay_sparse_and_exact():
+    viewers = HyperLogLog()
+    for n in range(100):
+        viewers.add(f"session_{n % 50}")
+    assert viewers.sparse
+    assert abs(viewers.estimate() - 50) <= 1
+
+
+def test_large_counts_are_dense_and_close():
+    viewers = HyperLogLog()
+    for n in range(50_000):
+        viewers.add(f"session_{n}")
+    assert not viewers.sparse
+    assert abs(viewers.estimate() - 50_000) < 50_000 * 0.05
+
+
+def test_merge_counts_each_viewer_once():
+    first, second = HyperLogLog(), HyperLogLog()
+    for n in range(3000):
+        first.add(f"session_{n}")
+        second.add(f"session_{n + 1500}")
+    first.merge(pickle.loads(pickle.dumps(second)))
+    assert abs(first.estimate() - 4500) < 4500 * 0.05
+
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(precision=10))
+
+
+def test_viewer_counts_merge_across_players():
+    counts = ViewerCounts()
+    for session_id in ("a", "b"):
+        player = VideoPlayer(session_id=session_id)
+        player.play_video("amazing_cats_video_id")
+        player.play_video("amazing_cats_video_id")
+        counts.merge(player.viewer_counts)
+    assert counts.estimate("amazing_cats_video_id") == 2
+    assert counts.estimate("funny_dogs_video_id") == 0
+
+
+def test_viewers_command(capfd):
+    parser = CommandParser(VideoPlayer(session_id="a"))
+    parser.execute_command(["PLAY", "amazing_cats_video_id"])
+    parser.execute_command(["VIEWERS", "amazing_cats_video_id"])
+    parser.execute_command(["VIEWERS", "funny_dogs_video_id"])
+    parser.execute_command(["VIEWERS", "nope"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines[1:] == [
+        "Unique viewers of Amazing Cats: 1",
+        "Unique viewers of Funny Dogs: 0",
+        "Cannot count viewers: Video does not exist",
+    ]
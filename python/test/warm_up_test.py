@@ -0,0 +1,79 @@
+import threading
+
+from src.search_engine import create_search_engine
+from src.trigram_index import TrigramIndex
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from src.warm_up import WarmUpScheduler
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_structures_switch_in_when_built():
+    release = threading.Event()
+
+    def build_slowly():
+        release.wait()
+        return "slow"
+
+    def fail():
+        raise RuntimeError("broken")
+
+    scheduler = WarmUpScheduler([("fast", lambda: "fast"),
+                                 ("slow", build_slowly), ("broken", fail)])
+    assert scheduler.get("fast") is None
+    scheduler.start()
+    assert not scheduler.ready("slow")
+    assert scheduler.get("slow") is None
+    release.set()
+    assert scheduler.wait(timeout=10)
+    assert scheduler.get("fast") == "fast"
+    assert scheduler.get("slow") == "slow"
+    assert not scheduler.ready("broken")
+    assert isinstance(scheduler.error("broken"), RuntimeError)
+
+
+def test_trigram_index_finds_substrings():
+    index = TrigramIndex(["amazing cats", "another cat video", "cat"])
+    assert list(index.search("cat")) == [0, 1, 2]
+    assert list(index.search("cat", 1)) == [1, 2]
+    assert list(index.search("at v")) == [1]
+    assert list(index.search("ca")) == [0, 1, 2]
+    assert list(index.search("dog")) == []
+
+
+def test_indexed_engine_matches_the_python_engine():
+    library = VideoLibrary()
+    plain = create_search_engine("python", library)
+    indexed = create_search_engine("indexed", library)
+    library.flag_videos(["another_cat_video_id"])
+
+    def compare():
+        for term in ("a", "CAT", "o", "blah"):
+            assert _ids(indexed.search_title(term)) == _ids(
+                plain.search_title(term))
+            assert _ids(indexed.search_title(term, 1, 2)) == _ids(
+                plain.search_title(term, 1, 2))
+        for tag in ("#animal", "#cat", "#blah"):
+            assert _ids(indexed.search_tag(tag)) == _ids(
+                plain.search_tag(tag))
+        assert _ids(indexed.videos_by_title()) == _ids(
+            plain.videos_by_title())
+
+    compare()
+    assert indexed.warm_up.wait(timeout=10)
+    assert all(indexed.warm_up.ready(name)
+               for name in ("videos_by_title", "tags", "titles"))
+    compare()
+
+
+def test_player_on_indexed_engine(capfd):
+    player = VideoPlayer(search_engine="indexed")
+    player._search_engine.warm_up.wait(timeout=10)
+    player.show_all_videos()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert lines[1] == "    Amazing Cats (amazing_cats_video_id) [#cat #animal]"
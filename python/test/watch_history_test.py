@@ -0,0 +1,84 @@
+from src.command_parser import CommandParser
+from src.video_player import VideoPlayer
+from src.watch_history import WatchHistory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_history_is_a_bounded_ring_buffer():
+    history = WatchHistory(capacity=2, resume_capacity=2)
+    for video_id in ("a", "b", "c"):
+        history.started(video_id)
+        history.stopped()
+    assert history.history() == ["c", "b"]
+    assert history.resume_position("a") is None
+    assert history.last_stopped() == "c"
+
+
+def test_resume_positions_are_lru_and_skip_pauses():
+    clock = FakeClock()
+    history = WatchHistory(resume_capacity=2, clock=clock)
+    history.started("a")
+    clock.now = 10
+    history.paused()
+    clock.now = 50
+    history.continued()
+    clock.now = 55
+    history.stopped()
+    assert history.resume_position("a") == 15
+
+    history.started("b")
+    history.stopped()
+    history.started("a", 15)
+    history.stopped()
+    history.started("c")
+    history.stopped()
+    assert history.resume_position("b") is None
+    assert history.resume_position("a") == 15
+
+
+def test_history_and_resume_commands(capfd):
+    player = VideoPlayer()
+    clock = FakeClock()
+    player._watch_history = WatchHistory(clock=clock)
+    parser = CommandParser(player)
+    parser.execute_command(["RESUME"])
+    player.play_video("amazing_cats_video_id")
+    clock.now = 75
+    player.play_video("funny_dogs_video_id")
+    parser.execute_command(["HISTORY"])
+    parser.execute_command(["RESUME"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 10
+    assert "Cannot resume video: No video to continue watching" in lines[0]
+    assert "Watch history:" in lines[4]
+    assert "Funny Dogs (funny_dogs_video_id) [#dog #animal]" == \
+        lines[5].strip()
+    assert ("Amazing Cats (amazing_cats_video_id) [#cat #animal] - stopped "
+            "at 1:15") in lines[6]
+    assert "Stopping video: Funny Dogs" in lines[7]
+    assert "Playing video: Amazing Cats" in lines[8]
+    assert "Resuming at 1:15" in lines[9]
+
+    # Every RESUME adds the video to the history once, not twice.
+    clock.now = 100
+    parser.execute_command(["STOP"])
+    parser.execute_command(["RESUME"])
+    parser.execute_command(["HISTORY"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert "Resuming at 1:40" in lines[2]
+    cats = "    Amazing Cats (amazing_cats_video_id) [#cat #animal] - " \
+           "stopped at 1:40"
+    assert lines[3:] == [
+        "Watch history:", cats, cats,
+        "    Funny Dogs (funny_dogs_video_id) [#dog #animal] - stopped at 0:00",
+        cats,
+    ]